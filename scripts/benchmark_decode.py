@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Benchmark full-resolution vs reduced-resolution (draft) JPEG decoding.
+
+Times ``load_resized(..., draft=False)`` against ``load_resized(..., draft=True)``
+and reports the decoded buffer size, which bounds per-image decode memory.
+Without real images, ``--synthetic N`` writes N 12 MP JPEGs to a temp dir.
+
+Usage:
+    python scripts/benchmark_decode.py --images-dir data/raw --size 256 256
+    python scripts/benchmark_decode.py --synthetic 10
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from PIL import Image
+
+# Add src to path for development usage
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from franksign.data.manifest import ImageManifest  # noqa: E402
+from franksign.data.preprocess import load_resized  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark draft-mode JPEG decoding")
+    parser.add_argument("--images-dir", "-i", default="data/raw", type=str, help="Directory with raw images")
+    parser.add_argument("--size", nargs=2, type=int, default=[256, 256], metavar=("H", "W"), help="Target size")
+    parser.add_argument("--limit", "-n", default=50, type=int, help="Maximum images to decode")
+    parser.add_argument("--synthetic", default=0, type=int, help="Generate N synthetic 4000x3000 JPEGs instead")
+    return parser
+
+
+def _write_synthetic(root: Path, count: int) -> List[Path]:
+    rng = np.random.default_rng(0)
+    base = np.linspace(0, 255, 4000, dtype=np.float32)
+    paths = []
+    for i in range(count):
+        noise = rng.normal(0, 20, (3000, 4000, 1)).astype(np.float32)
+        pixels = np.clip(base[None, :, None] + noise + i * 7, 0, 255).astype(np.uint8).repeat(3, axis=2)
+        path = root / f"synthetic_{i}.jpg"
+        Image.fromarray(pixels).save(path, quality=92)
+        paths.append(path)
+    return paths
+
+
+def _decoded_pixels(path: Path, size: List[int], draft: bool) -> int:
+    with Image.open(path) as im:
+        if draft:
+            im.draft("RGB", (size[1], size[0]))
+        return im.size[0] * im.size[1]
+
+
+def _time(paths: List[Path], size: List[int], draft: bool) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        load_resized(path, size, draft=draft)
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            paths = _write_synthetic(Path(tmp), args.synthetic)
+        else:
+            manifest = ImageManifest(args.images_dir)
+            manifest.refresh()
+            paths = manifest.paths()[: args.limit]
+        if not paths:
+            print(f"❌ No images found under {args.images_dir} (try --synthetic 10)")
+            return 1
+
+        _time(paths[:1], args.size, draft=True)  # warm up
+        results = {}
+        for draft in (False, True):
+            seconds = _time(paths, args.size, draft)
+            pixels = sum(_decoded_pixels(p, args.size, draft) for p in paths)
+            results[draft] = (seconds, pixels)
+
+    (full_s, full_px), (draft_s, draft_px) = results[False], results[True]
+    n = len(paths)
+    print(f"🖼️  {n} images -> {args.size[0]}x{args.size[1]}")
+    print(f"   full  : {1000 * full_s / n:7.1f} ms/image, {3 * full_px / n / 1e6:6.1f} MB decoded/image")
+    print(f"   draft : {1000 * draft_s / n:7.1f} ms/image, {3 * draft_px / n / 1e6:6.1f} MB decoded/image")
+    print(f"⚡ {full_s / draft_s:.1f}x faster, {full_px / draft_px:.1f}x less decode memory")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
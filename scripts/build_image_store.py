@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Decode and resize a split once into a memory-mapped image store.
+
+Writes ``<output>.npy`` (uint8, N x H x W x 3) and ``<output>.index.json``.
+Datasets read it with ``FrankSignDataset.from_image_store`` or
+``FrankSignSegmentationDataset(..., image_store=ImageStore(output))``.
+
+With ``--roi-margin`` (and ``--xml``) images are cropped to their earlobe ROI
+first; use the store with ``FrankSignSegmentationDataset(..., roi_margin=...)``
+at the same margin.
+
+Usage:
+    python scripts/build_image_store.py --images-dir data/raw --output data/processed/all_256
+    python scripts/build_image_store.py --split-file data/splits/train.txt --output data/processed/train_256
+    python scripts/build_image_store.py --xml data/annotations/annotations.xml --roi-margin 0.15 \\
+        --output data/processed/roi_256
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+# Add src to path for development usage
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from franksign.data.cvat_parser import CVATParser  # noqa: E402
+from franksign.data.image_store import build_image_store  # noqa: E402
+from franksign.data.manifest import ImageManifest  # noqa: E402
+from franksign.data.roi import ROI_SOURCES, earlobe_box  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build a memory-mapped store of resized images")
+    parser.add_argument("--images-dir", "-i", default="data/raw", type=str, help="Directory with raw images")
+    parser.add_argument(
+        "--split-file",
+        type=str,
+        default=None,
+        help="Optional text file with one image name (relative to --images-dir) per line.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="Optional image manifest (scripts/build_manifest.py) to list images instead of walking --images-dir.",
+    )
+    parser.add_argument("--output", "-o", required=True, type=str, help="Output base path (without suffix)")
+    parser.add_argument("--size", nargs=2, type=int, default=[256, 256], metavar=("H", "W"), help="Target size")
+    parser.add_argument("--xml", "-x", default=None, type=str, help="CVAT XML (required for --roi-margin)")
+    parser.add_argument(
+        "--roi-margin", type=float, default=None, help="Crop images to the earlobe ROI with this margin"
+    )
+    parser.add_argument(
+        "--roi-source", default="auto", choices=ROI_SOURCES, help="ROI box source (default: auto)"
+    )
+    parser.add_argument(
+        "--resample",
+        default="bicubic",
+        choices=[f.name.lower() for f in Image.Resampling],
+        help="Resampling filter (default: bicubic, as used when datasets decode on the fly)",
+    )
+    parser.add_argument("--jobs", "-j", default=None, type=int, help="Decode threads (default: automatic)")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    images_dir = Path(args.images_dir)
+
+    if args.split_file:
+        names = [line.strip() for line in Path(args.split_file).read_text(encoding="utf-8").splitlines()]
+        paths = [images_dir / name for name in names if name]
+    elif args.manifest:
+        paths = ImageManifest.load(args.manifest, images_dir).paths()
+    else:
+        manifest = ImageManifest(images_dir)
+        manifest.refresh(n_jobs=args.jobs)
+        paths = manifest.paths()
+    if not paths:
+        print(f"❌ No images found under {images_dir}")
+        return 1
+
+    boxes = None
+    if args.roi_margin is not None:
+        if not args.xml:
+            print("❌ --roi-margin needs --xml for the annotations")
+            return 1
+        annotations = {image.name: image for image in CVATParser(args.xml).iter_images()}
+        paths = [p for p in paths if p.relative_to(images_dir).as_posix() in annotations]
+        boxes = [
+            earlobe_box(annotations[p.relative_to(images_dir).as_posix()], args.roi_margin, args.roi_source)
+            for p in paths
+        ]
+        print(f"✂️  ROI crops for {sum(b is not None for b in boxes)}/{len(paths)} annotated images")
+
+    start = time.perf_counter()
+    store = build_image_store(
+        paths, args.output, image_size=args.size, n_jobs=args.jobs, boxes=boxes,
+        resample=Image.Resampling[args.resample.upper()],
+    )
+    elapsed = time.perf_counter() - start
+
+    size_mb = store.array_path.stat().st_size / 1e6
+    print(f"💾 Stored {len(store)} images at {store.image_size[0]}x{store.image_size[1]} in {elapsed:.1f}s")
+    print(f"📦 {store.array_path} ({size_mb:.1f} MB) + {store.index_path.name}")
+    if store.errors:
+        print(f"⚠️  {len(store.errors)} images failed to decode (zero-filled): {list(store.errors)[:5]}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
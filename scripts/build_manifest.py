@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Build or incrementally refresh the persistent image manifest.
+
+The manifest records path, size, mtime, dimensions and patient_id for every
+image under ``--images-dir``; ``FrankSignDataset.from_config`` and
+``preprocess_images(manifest=...)`` read it instead of walking the tree.
+
+Usage:
+    python scripts/build_manifest.py --images-dir data/raw --output data/processed/image_manifest.json
+    python scripts/build_manifest.py --quick   # only re-list directories whose mtime changed
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add src to path for development usage
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from franksign.data.manifest import ImageManifest  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build or refresh the image manifest")
+    parser.add_argument("--images-dir", "-i", default="data/raw", type=str, help="Directory with raw images")
+    parser.add_argument(
+        "--output", "-o", default="data/processed/image_manifest.json", type=str, help="Manifest file"
+    )
+    parser.add_argument("--jobs", "-j", default=None, type=int, help="Walk/header threads (default: automatic)")
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Skip directories whose mtime is unchanged (misses in-place edits of existing files).",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the existing manifest")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    images_dir = Path(args.images_dir)
+    if not images_dir.is_dir():
+        print(f"❌ Images directory not found: {images_dir}")
+        return 1
+
+    output = Path(args.output)
+    manifest = None
+    if output.exists() and not args.rebuild:
+        try:
+            manifest = ImageManifest.load(output, images_dir)
+        except ValueError as exc:
+            print(f"♻️  Rebuilding: {exc}")
+    if manifest is None or not manifest.entries:
+        manifest = ImageManifest(images_dir, output)
+
+    start = time.perf_counter()
+    stats = manifest.refresh(n_jobs=args.jobs, quick=args.quick)
+    elapsed = time.perf_counter() - start
+    if not manifest.entries:
+        output.unlink(missing_ok=True)
+        print(f"❌ No images found under {images_dir}; no manifest written")
+        return 1
+    manifest.save()
+
+    errors = sum(1 for entry in manifest.entries.values() if entry[-1])
+    print(f"🗂️  {len(manifest)} images in {len(manifest.dirs)} directories ({elapsed:.2f}s) → {output}")
+    print(f"   +{stats['added']} added, ~{stats['updated']} updated, -{stats['removed']} removed, "
+          f"{stats['unchanged']} unchanged")
+    if errors:
+        print(f"⚠️  {errors} images have unreadable headers")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -6,6 +6,7 @@ Outputs Parquet files:
 - clinical_clean.parquet: cleaned clinical data
 - master_features.parquet: joined features + clinical
 - match_report.parquet: match/unmatched summary rows
+- fuzzy_candidates.parquet: scored name/ID match candidates for unlinked images (--fuzzy)
 """
 from __future__ import annotations
 
@@ -27,6 +28,7 @@ from franksign.data.geometric_features import (  # noqa: E402
     extract_features_batch,
     features_to_dataframe,
 )
+from franksign.data.record_linkage import FuzzyLinker  # noqa: E402
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -36,6 +38,9 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--output-dir", "-o", default="data/processed", type=str, help="Directory to write outputs")
     parser.add_argument("--scale", "-s", default=None, type=float, help="Pixels-per-mm scale (optional)")
     parser.add_argument("--report", "-r", default=None, type=str, help="Optional path to save match report (CSV/Parquet)")
+    parser.add_argument("--compact", action="store_true", help="Store clinical data with memory-compact dtypes")
+    parser.add_argument("--fuzzy", action="store_true", help="Suggest fuzzy name/ID matches for unlinked images")
+    parser.add_argument("--jobs", "-j", default=None, type=int, help="Worker processes for fuzzy matching (default: all CPUs)")
     return parser
 
 
@@ -59,22 +64,28 @@ def main(argv: Optional[list[str]] = None) -> int:
 
     print(f"📂 Loading clinical data from {args.clinical}")
     clinical_loader = ClinicalDataLoader(args.clinical)
-    df_clin = clinical_loader.load()
-    df_clin["patient_id"] = df_clin["patient_id"].astype(str)
+    df_clin = clinical_loader.load(compact=args.compact)
+    # Stringify real IDs only; missing ones must not become the ID "nan"
+    ids = df_clin["patient_id"]
+    df_clin["patient_id"] = ids.astype(str).where(ids.notna())
+    linkable = df_clin[df_clin["patient_id"].notna()]
+    if clinical_loader.memory_report:
+        saved_kb = clinical_loader.memory_report["bytes_saved"] / 1024
+        print(f"🗜️ Compacted clinical dtypes: saved {saved_kb:.1f} KiB")
 
     clinical_path = output_dir / "clinical_clean.parquet"
     df_clin.to_parquet(clinical_path, index=False)
     print(f"💾 Saved cleaned clinical data: {clinical_path} ({len(df_clin)} rows)")
 
-    # Join
-    df_master = df_feat.merge(df_clin, on="patient_id", how="left", suffixes=("", "_clin"))
+    # Join (only rows with an ID: merge would pair missing keys with each other)
+    df_master = df_feat.merge(linkable, on="patient_id", how="left", suffixes=("", "_clin"))
     master_path = output_dir / "master_features.parquet"
     df_master.to_parquet(master_path, index=False)
     print(f"💾 Saved joined master features: {master_path} ({len(df_master)} rows)")
 
     # Match report
     unmatched_images = df_master[df_master.isna().any(axis=1)]["image_name"].unique().tolist()
-    unmatched_patients = df_clin[~df_clin["patient_id"].isin(df_master["patient_id"])]
+    unmatched_patients = df_clin[~df_clin["patient_id"].isin(df_master["patient_id"].dropna())]
     match_rate = 1 - (len(unmatched_images) / max(len(df_master), 1))
 
     report_rows = []
@@ -92,6 +103,14 @@ def main(argv: Optional[list[str]] = None) -> int:
         df_report.to_parquet(report_path, index=False)
     print(f"📝 Match report saved to: {report_path}")
 
+    if args.fuzzy:
+        unlinked = df_feat.loc[~df_feat["patient_id"].isin(linkable["patient_id"]), "image_name"]
+        candidates = FuzzyLinker(df_clin).match(unlinked.tolist(), n_jobs=args.jobs)
+        candidates_path = output_dir / "fuzzy_candidates.parquet"
+        candidates.to_parquet(candidates_path, index=False)
+        n_linked = candidates["image_name"].nunique()
+        print(f"🔗 Fuzzy candidates for {n_linked}/{len(unlinked)} unlinked images: {candidates_path}")
+
     if unmatched_images:
         print(f"⚠️ Unmatched images ({len(unmatched_images)}): {unmatched_images[:5]}{'...' if len(unmatched_images) > 5 else ''}")
     if len(unmatched_patients) > 0:
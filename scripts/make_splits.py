@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Build patient-level stratified train/val/test splits from CVAT annotations.
+
+Ratios, seed and paths default to the config (``data.*_ratio``,
+``experiment.seed``, ``data.annotations_path``, ``data.splits_dir``). Writes
+``train.txt``/``val.txt``/``test.txt`` and ``splits.json``; load them with
+``FrankSignDataset.from_config(config, split="train")``.
+
+Usage:
+    python scripts/make_splits.py
+    python scripts/make_splits.py --xml data/annotations/annotations.xml --seed 7 --output data/splits
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+# Add src to path for development usage
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from franksign.data.cvat_parser import CVATParser  # noqa: E402
+from franksign.data.splits import SPLIT_NAMES, assign_patient_splits, write_splits  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build patient-level stratified splits")
+    parser.add_argument("--config", "-c", default="configs/default.yaml", type=str, help="YAML configuration")
+    parser.add_argument("--xml", "-x", default=None, type=str, help="CVAT XML (default: data.annotations_path)")
+    parser.add_argument("--output", "-o", default=None, type=str, help="Splits dir (default: data.splits_dir)")
+    parser.add_argument("--seed", default=None, type=int, help="Random seed (default: experiment.seed)")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    config = yaml.safe_load(Path(args.config).read_text(encoding="utf-8"))
+    data = config["data"]
+    stratify_by = data.get("stratify_by", "has_frank_sign")
+    if stratify_by != "has_frank_sign":
+        print(f"❌ Unsupported stratify_by: {stratify_by} (only has_frank_sign)")
+        return 1
+
+    xml_path = args.xml or data["annotations_path"]
+    output = args.output or data.get("splits_dir", "data/splits")
+    seed = args.seed if args.seed is not None else config.get("experiment", {}).get("seed", 42)
+    ratios = (data["train_ratio"], data["val_ratio"], data["test_ratio"])
+
+    names, labels = [], []
+    for image in CVATParser(xml_path).iter_images():
+        names.append(image.name)
+        labels.append(image.has_frank_sign)
+    if not names:
+        print(f"❌ No images in {xml_path}")
+        return 1
+
+    codes = assign_patient_splits(names, labels, ratios=ratios, seed=seed)
+    summary = write_splits(output, names, codes, labels, seed=seed, ratios=ratios)
+
+    print(f"✂️  {len(names)} images split with seed {seed} → {output}")
+    for split in SPLIT_NAMES:
+        stats = summary["splits"][split]
+        print(f"   {split:5s}: {stats['images']:6d} images, {stats['patients']:6d} patients, "
+              f"{stats['frank_sign']:6d} with Frank Sign")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
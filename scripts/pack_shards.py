@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Pack annotated images, masks and metadata into tar shards.
+
+Writes ``shard-00000.tar``... plus ``index.json`` under ``--output``. Train
+with ``ShardedSegmentationDataset(output, shuffle_buffer=...)`` so each epoch
+reads a few large shard files sequentially.
+
+Usage:
+    python scripts/pack_shards.py --xml data/raw/annotations.xml --output data/processed/shards/all
+    python scripts/pack_shards.py --xml data/raw/annotations.xml --size 256 256 \\
+        --clinical data/demo/clinical_cvat_demo.csv --output data/processed/shards/all_256
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add src to path for development usage
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from franksign.data.clinical_loader import ClinicalDataLoader  # noqa: E402
+from franksign.data.cvat_parser import CVATParser  # noqa: E402
+from franksign.data.shards import pack_shards  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Pack images, masks and metadata into tar shards")
+    parser.add_argument("--xml", "-x", required=True, type=str, help="CVAT annotations XML")
+    parser.add_argument("--images-dir", "-i", default="data/raw", type=str, help="Directory with raw images")
+    parser.add_argument("--output", "-o", required=True, type=str, help="Output shard directory")
+    parser.add_argument("--clinical", "-c", default=None, type=str, help="Optional clinical CSV for metadata")
+    parser.add_argument("--size", nargs=2, type=int, default=None, metavar=("H", "W"), help="Resize to H W")
+    parser.add_argument("--samples-per-shard", "-n", default=1000, type=int, help="Samples per shard")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    annotations = list(CVATParser(args.xml).iter_images())
+    if not annotations:
+        print(f"❌ No annotated images in {args.xml}")
+        return 1
+
+    clinical_df = ClinicalDataLoader(args.clinical).load() if args.clinical else None
+    start = time.perf_counter()
+    index = pack_shards(
+        args.images_dir,
+        annotations,
+        args.output,
+        samples_per_shard=args.samples_per_shard,
+        image_size=args.size,
+        clinical_df=clinical_df,
+    )
+    elapsed = time.perf_counter() - start
+
+    total_mb = sum((Path(args.output) / s["path"]).stat().st_size for s in index["shards"]) / 1e6
+    print(f"📦 Packed {index['samples']} samples into {len(index['shards'])} shards in {elapsed:.1f}s")
+    print(f"💾 {args.output} ({total_mb:.1f} MB)")
+    for name, message in index["errors"].items():
+        print(f"   ⚠️  skipped {name}: {message}")
+    return 2 if index["errors"] else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
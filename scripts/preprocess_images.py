@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Resize raw images into the processed directory.
+
+Images are resized to ``--size`` (``--draft``: JPEGs decoded at reduced
+resolution, faster but not pixel-identical); ``--jobs`` spreads the work
+over worker processes. Files that fail to decode are listed at the end
+instead of aborting the run.
+
+Runs are incremental: ``.preprocess_manifest.json`` in the output directory
+records each output's source size/mtime (``--hash``: content hash) and
+settings, so only new, changed or re-configured images are redone and
+outputs of deleted sources are removed. Only outputs recorded there are
+pruned; files from earlier ``--no-incremental`` runs are left in place.
+
+``--letterbox`` keeps aspect ratios (scale to fit, pad with black); with
+``--xml`` the CVAT geometry is mapped into the output pixel frame and saved
+as ``geometry.npz`` next to the images.
+
+``--packed`` writes one memory-mappable image store (``images.npy`` +
+``images.index.json``, plus ``images.masks.npy`` with ``--xml``) instead of
+loose files; load it with ``ImageStore(output_dir / "images")``.
+
+Usage:
+    python scripts/preprocess_images.py --input data/raw --output data/processed/images --size 256 256 --jobs 8
+    python scripts/preprocess_images.py --config configs/default.yaml --jobs 0   # one worker per CPU
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import yaml
+
+# Add src to path for development usage
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from franksign.data.cvat_parser import CVATParser  # noqa: E402
+from franksign.data.manifest import ImageManifest  # noqa: E402
+from franksign.data.preprocess import PreprocessConfig, preprocess_images, preprocess_packed  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Resize raw images for training")
+    parser.add_argument("--config", "-c", default=None, type=str, help="YAML config (data.* paths and image_size)")
+    parser.add_argument("--input", "-i", default=None, type=str, help="Raw image directory (default: data.images_dir)")
+    parser.add_argument(
+        "--output", "-o", default=None, type=str, help="Output directory (default: {data.processed_dir}/images)"
+    )
+    parser.add_argument("--size", nargs=2, type=int, default=None, metavar=("H", "W"), help="Target height width")
+    parser.add_argument("--jobs", "-j", default=1, type=int, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--manifest", default=None, type=str, help="Image manifest listing the input images")
+    parser.add_argument("--overwrite", action="store_true", help="Reprocess existing outputs")
+    parser.add_argument("--draft", action="store_true", help="Decode JPEGs at reduced resolution (faster)")
+    parser.add_argument("--letterbox", action="store_true", help="Preserve aspect ratios instead of stretching")
+    parser.add_argument("--xml", default=None, type=str, help="CVAT XML; writes transformed geometry.npz")
+    parser.add_argument("--packed", action="store_true", help="Write one memory-mapped image store")
+    parser.add_argument("--hash", action="store_true", help="Compare source content hashes, not just size/mtime")
+    parser.add_argument(
+        "--no-incremental",
+        action="store_true",
+        help="Skip any existing output without tracking sources (no pruning)",
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    data = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f).get("data", {})
+
+    input_dir = Path(args.input or data.get("images_dir", "data/raw"))
+    output_dir = Path(args.output or Path(data.get("processed_dir", "data/processed")) / "images")
+    image_size = tuple(args.size or data.get("image_size", [256, 256]))
+    if not input_dir.is_dir():
+        print(f"❌ Input directory not found: {input_dir}")
+        return 1
+
+    manifest = ImageManifest.open(input_dir, args.manifest) if args.manifest else None
+    annotations = CVATParser(args.xml).parse().images if args.xml else None
+    interactive = sys.stdout.isatty()
+
+    def progress(done: int, total: int, path: Path) -> None:
+        if interactive:
+            print(f"\r   {done}/{total} {path.name[:60]:<60}", end="", flush=True)
+        elif done % 1000 == 0 or done == total:
+            print(f"   {done}/{total}", flush=True)
+
+    errors: List[Tuple[Path, str]] = []
+    removed: List[Path] = []
+    start = time.perf_counter()
+    config = PreprocessConfig(
+        draft=args.draft,
+        letterbox=args.letterbox,
+        incremental=not args.no_incremental,
+        hash_sources=args.hash,
+        n_jobs=args.jobs or None,
+    )
+    processed, skipped = (preprocess_packed if args.packed else preprocess_images)(
+        input_dir,
+        output_dir,
+        image_size=image_size,
+        overwrite=args.overwrite,
+        config=config,
+        manifest=manifest,
+        annotations=annotations,
+        progress=progress,
+        errors=errors,
+        removed=removed,
+    )
+    elapsed = time.perf_counter() - start
+    if interactive:
+        print()
+    print(
+        f"🖼️  {processed} processed, {skipped} skipped, {len(removed)} removed, {len(errors)} failed "
+        f"({elapsed:.1f}s) → {output_dir}"
+    )
+    for path, message in errors:
+        print(f"   ⚠️  {path}: {message}")
+    return 2 if errors else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
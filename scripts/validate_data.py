@@ -24,8 +24,18 @@ except ImportError as exc:  # pragma: no cover - handled at runtime
 # Add src to path for development usage
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from franksign.data.clinical_loader import ClinicalDataLoader  # noqa: E402
-from franksign.data.validation import ClinicalSchema, validate_cvat_project  # noqa: E402
-from franksign.data.cvat_parser import load_annotations  # noqa: E402
+from franksign.data.validation import (  # noqa: E402
+    ClinicalConsistencyChecker,
+    ClinicalSchema,
+    ImageHeaderCache,
+    ImageIntegrityChecker,
+    StreamingCVATValidator,
+    VectorizedClinicalChecker,
+    ValidationCache,
+    ValidationReport,
+    validate_cvat_project,
+)
+from franksign.data.cvat_parser import CVATParser, load_annotations  # noqa: E402
 
 
 def _save_table(df: pd.DataFrame, path: Path, default_name: str) -> None:
@@ -60,12 +70,75 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional path to save validated clinical data (CSV/Parquet).",
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the clinical CSV in chunks and use the vectorized checker.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes for CVAT checks (0 = all CPUs).",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        help="Optional JSON cache of per-image CVAT results for incremental runs.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Validate CVAT while parsing and stop at the first error.",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        help="Validate CVAT while parsing and stop after N errors.",
+    )
+    parser.add_argument(
+        "--errors-only",
+        action="store_true",
+        help="Skip warning-level CVAT checks.",
+    )
+    parser.add_argument(
+        "--cross-check",
+        action="store_true",
+        help="Check annotated Frank sign against clinical fs_right/fs_left per patient.",
+    )
+    parser.add_argument(
+        "--ignore-ear-side",
+        action="store_true",
+        help="Cross-check against either ear instead of the annotated ear_side.",
+    )
+    parser.add_argument(
+        "--images-dir",
+        type=str,
+        default=None,
+        help="Check annotated image files exist and match CVAT width/height (headers only).",
+    )
+    parser.add_argument(
+        "--image-cache",
+        type=str,
+        default=None,
+        help="Optional JSON cache of image headers keyed by mtime and size.",
+    )
+    parser.add_argument(
+        "--show",
+        type=int,
+        default=0,
+        help="Print the first N CVAT issue messages (default: counts only).",
+    )
     parser.add_argument(
         "--report",
         "-r",
         type=str,
         default=None,
-        help="Optional path to save validation issues (CSV/Parquet).",
+        help="Path for validation issues (CSV/Parquet; CVAT issues default to data/processed/cvat_issues.parquet).",
     )
     return parser
 
@@ -74,32 +147,51 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = _build_parser().parse_args(argv)
     csv_path = Path(args.clinical)
 
-    try:
-        loader = ClinicalDataLoader(csv_path)
-        df = loader.load()
-    except FileNotFoundError as exc:
-        print(f"❌ {exc}")
-        return 1
-
-    print(f"📂 Loaded clinical data: {csv_path}")
-    print(f"🧮 Rows: {len(df)} | Columns: {len(df.columns)}")
-
-    try:
-        validated: DataFrame[ClinicalSchema] = ClinicalSchema.validate(df, lazy=True)
-    except pa.errors.SchemaErrors as exc:
-        print("❌ Clinical validation failed. Top issues:")
-        print(exc.failure_cases.head())
-        if args.report:
-            Path(args.report).parent.mkdir(parents=True, exist_ok=True)
-            _save_table(exc.failure_cases, Path(args.report), default_name="clinical_issues.parquet")
-            print(f"📝 Failure cases saved to {args.report}")
-        return 2
-
-    print("✅ Clinical validation passed against ClinicalSchema")
-    if args.summary:
-        Path(args.summary).parent.mkdir(parents=True, exist_ok=True)
-        _save_table(validated, Path(args.summary), default_name="clinical_validated.parquet")
-        print(f"📝 Cleaned data saved to {args.summary}")
+    if args.chunksize:
+        if not csv_path.exists():
+            print(f"❌ Clinical data not found: {csv_path}")
+            return 1
+        checker = VectorizedClinicalChecker()
+        failures = checker.check_chunks(
+            ClinicalDataLoader(csv_path).iter_chunks(chunksize=args.chunksize)
+        )
+        print(f"📂 Streamed clinical data: {csv_path}")
+        print(f"🧮 Rows: {checker.rows_checked} | Chunk size: {args.chunksize}")
+        if not failures.empty:
+            print("❌ Clinical validation failed. Top issues:")
+            print(failures.groupby(["column", "check"]).size().to_string())
+            if args.report:
+                _save_table(failures, Path(args.report), default_name="clinical_issues.parquet")
+                print(f"📝 Failure cases saved to {args.report}")
+            return 2
+        print("✅ Clinical validation passed against ClinicalSchema")
+    else:
+        try:
+            loader = ClinicalDataLoader(csv_path)
+            df = loader.load()
+        except FileNotFoundError as exc:
+            print(f"❌ {exc}")
+            return 1
+
+        print(f"📂 Loaded clinical data: {csv_path}")
+        print(f"🧮 Rows: {len(df)} | Columns: {len(df.columns)}")
+
+        try:
+            validated: DataFrame[ClinicalSchema] = ClinicalSchema.validate(df, lazy=True)
+        except pa.errors.SchemaErrors as exc:
+            print("❌ Clinical validation failed. Top issues:")
+            print(exc.failure_cases.head())
+            if args.report:
+                Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+                _save_table(exc.failure_cases, Path(args.report), default_name="clinical_issues.parquet")
+                print(f"📝 Failure cases saved to {args.report}")
+            return 2
+
+        print("✅ Clinical validation passed against ClinicalSchema")
+        if args.summary:
+            Path(args.summary).parent.mkdir(parents=True, exist_ok=True)
+            _save_table(validated, Path(args.summary), default_name="clinical_validated.parquet")
+            print(f"📝 Cleaned data saved to {args.summary}")
 
     # Optional CVAT validation
     if args.annotations:
@@ -107,18 +199,67 @@ def main(argv: Optional[list[str]] = None) -> int:
         if not ann_path.exists():
             print(f"❌ Annotations file not found: {ann_path}")
             return 3
-        project = load_annotations(ann_path)
-        issues = validate_cvat_project(project)
-        if issues:
-            print("⚠️  CVAT validation reported:")
-            for issue in issues:
-                print(f" - [{issue.level}] {issue.message}")
-            if args.report:
-                issues_path = Path(args.report)
-                issues_df = pd.DataFrame([issue.__dict__ for issue in issues])
-                _save_table(issues_df, issues_path, default_name="cvat_issues.parquet")
+        report = ValidationReport()
+        streaming = args.fail_fast or args.max_errors is not None or args.errors_only
+        if streaming:
+            levels = ("error",) if args.errors_only else ("error", "warning")
+            validator = StreamingCVATValidator(
+                levels=levels, max_errors=args.max_errors, fail_fast=args.fail_fast
+            )
+            with report.timed("cvat_structure") as sink:
+                sink.extend(validator.iter_issues(ann_path))
+            report.set_items("cvat_structure", validator.images_checked)
+            if validator.aborted:
+                print(f"⛔ CVAT validation aborted after {validator.images_checked} images")
+        else:
+            project = load_annotations(ann_path)
+            cache = ValidationCache(args.cache) if args.cache else None
+            with report.timed("cvat_structure", items=len(project.images)) as sink:
+                sink.extend(validate_cvat_project(project, n_jobs=args.jobs or None, cache=cache))
+            if cache is not None:
+                cache.save()
+                print(f"🗂️  Validation cache: {cache.hits} reused, {cache.misses} checked")
+        if args.cross_check:
+            use_ear_side = not args.ignore_ear_side
+            with report.timed("cross_source") as sink:
+                if args.chunksize:
+                    chunks = ClinicalDataLoader(csv_path).iter_chunks(chunksize=args.chunksize)
+                    checker = ClinicalConsistencyChecker.from_chunks(chunks, use_ear_side=use_ear_side)
+                else:
+                    checker = ClinicalConsistencyChecker(df, use_ear_side=use_ear_side)
+                sink.extend(checker.iter_issues(CVATParser(ann_path).iter_images()))
+            report.set_items("cross_source", checker.images_checked)
+            print(
+                f"🔗 Cross-checked {checker.images_checked} images "
+                f"({checker.images_linked} linked to clinical rows)"
+            )
+        if args.images_dir:
+            header_cache = ImageHeaderCache(args.image_cache) if args.image_cache else None
+            integrity = ImageIntegrityChecker(args.images_dir, cache=header_cache)
+            with report.timed("image_files") as sink:
+                sink.extend(integrity.check(CVATParser(ann_path).iter_images()))
+            report.set_items("image_files", integrity.images_checked)
+            if header_cache is not None:
+                header_cache.save()
+                print(f"🗂️  Image header cache: {header_cache.hits} reused, {header_cache.misses} read")
+
+        print("⏱️  Check timings:")
+        print(report.timing_frame().to_string(index=False, float_format="{:.3f}".format))
+        if len(report):
+            print(f"⚠️  CVAT validation reported {len(report)} issues ({report.error_count} errors):")
+            print(report.summary().to_string(index=False))
+            if args.show:
+                for message in report.to_frame()["message"].head(args.show):
+                    print(f" - {message}")
+            issues_path = Path(args.report) if args.report else Path("data/processed")
+            if not issues_path.suffix:
+                issues_path = issues_path / "cvat_issues.parquet"
+            report.save(issues_path)
+            print(f"📝 Full issue table saved to {issues_path}")
         else:
             print("✅ CVAT validation passed basic structural checks")
+        if streaming and validator.aborted:
+            return 4
 
     return 0
 
@@ -2,28 +2,79 @@
 
 from franksign.data.cvat_parser import CVATParser
 from franksign.data.geometric_features import GeometricFeatureExtractor
-from franksign.data.clinical_loader import ClinicalDataLoader, PatientRecord
-from franksign.data.preprocess import preprocess_images
-from franksign.data.validation import ClinicalSchema, ValidationIssue, validate_cvat_project
+from franksign.data.clinical_loader import (
+    ClinicalDataLoader,
+    MultiSiteClinicalLoader,
+    PatientRecord,
+    PatientTable,
+)
+from franksign.data.image_store import ImageStore, ImageStoreWriter, build_image_store
+from franksign.data.letterbox import PackedGeometry, letterbox_matrices, transform_annotations
+from franksign.data.manifest import ImageManifest
+from franksign.data.preprocess import PreprocessConfig, preprocess_images, preprocess_packed
+from franksign.data.risk_scores import recompute_risk_scores
+from franksign.data.roi import crop_annotations, earlobe_box
+from franksign.data.splits import assign_patient_splits, load_split, write_splits
+from franksign.data.validation import (
+    ClinicalSchema,
+    ValidationIssue,
+    ValidationReport,
+    validate_cvat_project,
+)
 
 try:
-    from franksign.data.dataset import FrankSignDataset, Sample
+    from franksign.data.dataset import FrankSignDataset, FrankSignSegmentationDataset, Sample
+    from franksign.data.samplers import BalancedBatchSampler, sample_groups, sampler_from_config
+    from franksign.data.shards import ShardedSegmentationDataset, pack_shards
     _HAS_TORCH = True
 except ImportError:
     FrankSignDataset = None  # type: ignore
+    FrankSignSegmentationDataset = None  # type: ignore
     Sample = None  # type: ignore
+    ShardedSegmentationDataset = None  # type: ignore
+    pack_shards = None  # type: ignore
+    BalancedBatchSampler = None  # type: ignore
+    sample_groups = None  # type: ignore
+    sampler_from_config = None  # type: ignore
     _HAS_TORCH = False
 
 __all__ = [
     "CVATParser",
     "GeometricFeatureExtractor",
     "ClinicalDataLoader",
+    "MultiSiteClinicalLoader",
     "PatientRecord",
+    "PatientTable",
+    "ImageStore",
+    "ImageStoreWriter",
+    "build_image_store",
+    "PackedGeometry",
+    "letterbox_matrices",
+    "transform_annotations",
+    "ImageManifest",
+    "PreprocessConfig",
     "preprocess_images",
+    "preprocess_packed",
+    "recompute_risk_scores",
+    "crop_annotations",
+    "earlobe_box",
+    "assign_patient_splits",
+    "load_split",
+    "write_splits",
     "ClinicalSchema",
     "ValidationIssue",
+    "ValidationReport",
     "validate_cvat_project",
 ]
 
 if _HAS_TORCH:
-    __all__.extend(["FrankSignDataset", "Sample"])
+    __all__.extend([
+        "FrankSignDataset",
+        "FrankSignSegmentationDataset",
+        "Sample",
+        "ShardedSegmentationDataset",
+        "pack_shards",
+        "BalancedBatchSampler",
+        "sample_groups",
+        "sampler_from_config",
+    ])
@@ -11,10 +11,13 @@ Example:
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
+if TYPE_CHECKING:
+    from franksign.data.cvat_parser import ImageAnnotations
+
 try:
     import albumentations as A
     from albumentations.pytorch import ToTensorV2
@@ -343,6 +346,59 @@ def combine_masks(
     return combined
 
 
+def rasterize_annotations(
+    image: "ImageAnnotations",
+    image_size: Optional[Tuple[int, int]] = None,
+    line_thickness: int = 3,
+    line_label: str = "franks_sign_line",
+    region_label: str = "franks_sign_region",
+) -> np.ndarray:
+    """Rasterize an image's Frank Sign annotations into a 3-class mask.
+    
+    Coordinates are scaled from the CVAT image size to ``image_size`` before
+    drawing, so masks are produced directly at the training resolution.
+    Lines marked ``presence="absent"`` are skipped.
+    
+    Args:
+        image: Parsed CVAT annotations for one image
+        image_size: Target (height, width); defaults to the CVAT size
+        line_thickness: Line thickness in pixels at the target size
+        line_label: Polyline label drawn as class 1
+        region_label: Polygon label drawn as class 2
+    
+    Returns:
+        uint8 mask of shape (height, width) with values 0/1/2
+    
+    Raises:
+        ValueError: If the CVAT image size is missing or not positive.
+    """
+    if not image.width or not image.height or image.width <= 0 or image.height <= 0:
+        raise ValueError(
+            f"Image {image.name!r} has invalid size {image.width}x{image.height}; cannot rasterize"
+        )
+    height, width = image_size if image_size is not None else (image.height, image.width)
+    scale = np.array([width / image.width, height / image.height])
+    shape = (height, width)
+    
+    line_mask = np.zeros(shape, dtype=np.uint8)
+    for polyline in image.polylines:
+        if polyline.label != line_label or len(polyline.points) < 2:
+            continue
+        if polyline.attributes.get("presence", "present") == "absent":
+            continue
+        points = np.round(polyline.to_array() * scale)
+        np.maximum(line_mask, create_mask_from_polyline(points, shape, thickness=line_thickness), out=line_mask)
+    
+    region_mask = np.zeros(shape, dtype=np.uint8)
+    for polygon in image.polygons:
+        if polygon.label != region_label or len(polygon.points) < 3:
+            continue
+        points = np.round(polygon.to_array() * scale)
+        np.maximum(region_mask, create_mask_from_polygon(points, shape), out=region_mask)
+    
+    return combine_masks(line_mask, region_mask)
+
+
 if __name__ == "__main__":
     print("Augmentation module loaded.")
     print(f"Albumentations available: {HAS_ALBUMENTATIONS}")
@@ -13,9 +13,10 @@ Example:
     >>> print(f"Loaded {len(df)} patients")
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Any
 import re
 
 import pandas as pd
@@ -67,6 +68,28 @@ TURKISH_DECIMAL_COLUMNS = [
     'creatinine', 'aortic_valve_velocity'
 ]
 
+# Small integer columns (binary flags, counts, age) stored as nullable Int8
+SMALL_INT_COLUMNS = BINARY_COLUMNS + [
+    'has_fs_any', 'has_fs_bilateral', 'cv_risk_count', 'age'
+]
+
+# Identifier columns kept as plain strings (join keys)
+ID_COLUMNS = ['patient_id']
+
+# Text columns with a small fixed set of values, stored as categorical
+CATEGORICAL_COLUMNS = [
+    'gender', 'dominant_coronary', 'cvat_status', 'age_group', 'ef_category', 'source',
+]
+
+# Columns computed by ClinicalDataLoader._add_derived_columns
+DERIVED_COLUMNS = [
+    'has_fs_any', 'has_fs_bilateral', 'cv_risk_count', 'lipid_ratio',
+    'age_group', 'ef_category',
+]
+
+# Duplicate patient_id resolution strategies for multi-site loading
+CONFLICT_STRATEGIES = ('latest', 'first', 'merge', 'keep')
+
 
 # ============================================================
 # PARSING FUNCTIONS
@@ -217,6 +240,68 @@ def normalize_patient_id(value: Any) -> Optional[str]:
     return base_id
 
 
+# ============================================================
+# MEMORY COMPACTION
+# ============================================================
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    downcast_floats: bool = False,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Convert a cleaned clinical frame to memory-compact dtypes.
+    
+    - Binary flags, counts and age become nullable ``Int8``.
+    - Integer columns are downcast to the smallest integer type.
+    - ``CATEGORICAL_COLUMNS`` holding strings become ``category``.
+    
+    Measurements stay float64 unless ``downcast_floats`` is set: float32
+    keeps about 7 significant digits, so e.g. creatinine 0.93 would read
+    back as 0.9300000071525574.
+    
+    Args:
+        df: Cleaned clinical DataFrame (output of ``ClinicalDataLoader.load``).
+        downcast_floats: Also downcast float64 columns to float32.
+            
+    Returns:
+        Tuple of (compacted DataFrame, memory report dict with
+        ``bytes_before``, ``bytes_after``, ``bytes_saved``, ``ratio``).
+    """
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    out = df.copy()
+    
+    for col in out.columns:
+        series = out[col]
+        
+        if col in SMALL_INT_COLUMNS and pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            valid = values[~np.isnan(values)]
+            if np.all(valid == np.round(valid)) and np.all(np.abs(valid) <= 127):
+                out[col] = series.astype('Int8')
+                continue
+        
+        if isinstance(series.dtype, pd.CategoricalDtype) or col in ID_COLUMNS:
+            continue
+        
+        if pd.api.types.is_float_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+            if downcast_floats:
+                out[col] = pd.to_numeric(series, downcast='float')
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+            out[col] = pd.to_numeric(series, downcast='integer')
+        elif col in CATEGORICAL_COLUMNS and (
+            pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+        ):
+            out[col] = series.astype('category')
+    
+    bytes_after = int(out.memory_usage(deep=True).sum())
+    report = {
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'bytes_saved': bytes_before - bytes_after,
+        'ratio': bytes_after / bytes_before if bytes_before else 1.0,
+    }
+    return out, report
+
+
 # ============================================================
 # DATA CLASSES
 # ============================================================
@@ -300,6 +385,213 @@ class PatientRecord:
             return 'reduced'
 
 
+# ============================================================
+# COLUMNAR PATIENT TABLE
+# ============================================================
+
+# PatientRecord fields stored as strings; all others are numeric
+_STRING_FIELDS = ('patient_id', 'patient_name', 'gender', 'troponin')
+
+# Numeric PatientRecord fields returned as int by PatientRow
+_INT_FIELDS = (
+    'fs_right', 'fs_left', 'age', 'hypertension', 'diabetes',
+    'smoking', 'family_history', 'systolic_bp',
+)
+
+PATIENT_FIELDS = tuple(f for f in PatientRecord.__dataclass_fields__)
+
+# Parsers for numeric fields still held as strings (the loader only parses
+# some columns); unlisted fields use parse_turkish_decimal
+_FIELD_PARSERS = {
+    'age': parse_age,
+    'ef': parse_ef,
+    **{name: parse_binary for name in BINARY_COLUMNS},
+}
+
+
+class PatientRow:
+    """Lightweight view of one row of a ``PatientTable``.
+    
+    Values are read from the table's column arrays on attribute access, so
+    creating a row costs nothing beyond the object itself.
+    """
+    __slots__ = ('_table', '_index')
+    
+    def __init__(self, table: "PatientTable", index: int):
+        self._table = table
+        self._index = index
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in PATIENT_FIELDS:
+            return self._table._value(name, self._index)
+        raise AttributeError(f"{type(self).__name__!s} has no attribute {name!r}")
+    
+    def __repr__(self) -> str:
+        return f"PatientRow(patient_id={self.patient_id!r})"
+    
+    @property
+    def has_frank_sign_any(self) -> bool:
+        """True if Frank Sign present on either ear."""
+        return bool(self._table.has_frank_sign_any[self._index])
+    
+    @property
+    def has_frank_sign_bilateral(self) -> bool:
+        """True if Frank Sign present on both ears."""
+        return bool(self._table.has_frank_sign_bilateral[self._index])
+    
+    @property
+    def cv_risk_factor_count(self) -> int:
+        """Count of present cardiovascular risk factors."""
+        return int(self._table.cv_risk_factor_count[self._index])
+    
+    @property
+    def age_group(self) -> Optional[str]:
+        """Age category."""
+        return self._table.age_group[self._index]
+    
+    @property
+    def ef_category(self) -> Optional[str]:
+        """EF category (preserved/mid-range/reduced)."""
+        return self._table.ef_category[self._index]
+    
+    def to_record(self) -> PatientRecord:
+        """Materialize as a ``PatientRecord`` dataclass."""
+        return PatientRecord(**{name: getattr(self, name) for name in PATIENT_FIELDS})
+
+
+class PatientTable:
+    """Columnar view over cleaned clinical data.
+    
+    Stores each ``PatientRecord`` field as a NumPy array (numeric fields as
+    float64 with NaN for missing, string fields as object arrays with None)
+    and exposes the ``PatientRecord`` properties as vectorized arrays.
+    Numeric fields the loader leaves as text (e.g. ``gfr``) are parsed with
+    the loader's parsers, so ``"0,98"`` becomes 0.98 rather than missing.
+    Rows without a ``patient_id`` are dropped.
+    
+    Example:
+        >>> table = PatientTable(df)
+        >>> table.has_frank_sign_any.sum()
+        >>> table.get("1763794").age_group
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        """Build column arrays from a cleaned clinical DataFrame.
+        
+        Args:
+            df: DataFrame with (a subset of) ``PatientRecord`` columns.
+        """
+        if 'patient_id' in df.columns:
+            df = df[df['patient_id'].notna()]
+        else:
+            df = df.iloc[0:0]
+        
+        n = len(df)
+        self._columns: Dict[str, np.ndarray] = {}
+        for name in PATIENT_FIELDS:
+            if name in _STRING_FIELDS:
+                arr = np.full(n, None, dtype=object)
+                if name in df.columns:
+                    series = df[name]
+                    valid = series.notna().to_numpy()
+                    arr[valid] = series[valid].astype(str).to_numpy(dtype=object)
+            elif name in df.columns:
+                series = df[name]
+                if not pd.api.types.is_numeric_dtype(series):
+                    parser = _FIELD_PARSERS.get(name, parse_turkish_decimal)
+                    series = series.map(parser)
+                arr = pd.to_numeric(series).to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                arr = np.full(n, np.nan)
+            self._columns[name] = arr
+        
+        self._id_index: Optional[Dict[str, int]] = None
+    
+    def __len__(self) -> int:
+        return len(self._columns['patient_id'])
+    
+    def __getitem__(self, index: int) -> PatientRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"PatientTable index out of range: {index}")
+        return PatientRow(self, index)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield PatientRow(self, i)
+    
+    def column(self, name: str) -> np.ndarray:
+        """Return the raw column array for a ``PatientRecord`` field."""
+        return self._columns[name]
+    
+    def get(self, patient_id: Any) -> Optional[PatientRow]:
+        """Look up a patient by ID (first occurrence), or None."""
+        if self._id_index is None:
+            ids = self._columns['patient_id']
+            self._id_index = {}
+            for i in range(len(ids) - 1, -1, -1):
+                self._id_index[ids[i]] = i
+        index = self._id_index.get(str(patient_id))
+        return None if index is None else PatientRow(self, index)
+    
+    def to_records(self) -> List[PatientRecord]:
+        """Materialize all rows as ``PatientRecord`` objects."""
+        return [row.to_record() for row in self]
+    
+    def _value(self, name: str, index: int) -> Any:
+        value = self._columns[name][index]
+        if name in _STRING_FIELDS:
+            return value
+        if np.isnan(value):
+            return None
+        if name in _INT_FIELDS:
+            return int(value)
+        return float(value)
+    
+    # Vectorized PatientRecord properties
+    
+    @property
+    def has_frank_sign_any(self) -> np.ndarray:
+        """Boolean array: Frank Sign present on either ear."""
+        return (self._columns['fs_right'] == 1) | (self._columns['fs_left'] == 1)
+    
+    @property
+    def has_frank_sign_bilateral(self) -> np.ndarray:
+        """Boolean array: Frank Sign present on both ears."""
+        return (self._columns['fs_right'] == 1) & (self._columns['fs_left'] == 1)
+    
+    @property
+    def cv_risk_factor_count(self) -> np.ndarray:
+        """Integer array: count of present cardiovascular risk factors."""
+        factors = ['hypertension', 'diabetes', 'smoking', 'family_history']
+        return sum((self._columns[f] == 1).astype(np.int8) for f in factors)
+    
+    @property
+    def age_group(self) -> np.ndarray:
+        """Object array of age categories (None where age is missing)."""
+        age = self._columns['age']
+        groups = np.select(
+            [age < 50, age < 65, age >= 65],
+            ['young', 'middle', 'elderly'],
+            default='',
+        ).astype(object)
+        groups[np.isnan(age)] = None
+        return groups
+    
+    @property
+    def ef_category(self) -> np.ndarray:
+        """Object array of EF categories (None where EF is missing)."""
+        ef = self._columns['ef']
+        categories = np.select(
+            [ef >= 50, ef >= 40, ef < 40],
+            ['preserved', 'mid_range', 'reduced'],
+            default='',
+        ).astype(object)
+        categories[np.isnan(ef)] = None
+        return categories
+
+
 # ============================================================
 # DATA LOADER CLASS
 # ============================================================
@@ -325,12 +617,17 @@ class ClinicalDataLoader:
         self.csv_path = Path(csv_path)
         if not self.csv_path.exists():
             raise FileNotFoundError(f"Clinical data file not found: {self.csv_path}")
+        
+        # Populated by load(compact=True)
+        self.memory_report: Optional[Dict[str, Any]] = None
     
-    def load(self, rename_columns: bool = True) -> pd.DataFrame:
+    def load(self, rename_columns: bool = True, compact: bool = False) -> pd.DataFrame:
         """Load and clean clinical data.
         
         Args:
             rename_columns: If True, rename Turkish columns to English.
+            compact: If True, convert to memory-compact dtypes (see
+                ``compact_dtypes``) and store the savings in ``memory_report``.
             
         Returns:
             Cleaned pandas DataFrame.
@@ -345,31 +642,59 @@ class ClinicalDataLoader:
         # Clean data
         df = self._clean_data(df)
         
+        if compact:
+            df, self.memory_report = compact_dtypes(df)
+        
         return df
     
+    def iter_chunks(
+        self,
+        chunksize: int = 50_000,
+        rename_columns: bool = True,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream cleaned clinical data in fixed-size chunks.
+        
+        The index continues across chunks, so row labels match ``load()``.
+        
+        Args:
+            chunksize: Rows per chunk.
+            rename_columns: If True, rename Turkish columns to English.
+            
+        Yields:
+            Cleaned DataFrame chunks.
+        """
+        for chunk in pd.read_csv(self.csv_path, encoding='utf-8', chunksize=chunksize):
+            if rename_columns:
+                chunk = chunk.rename(columns=COLUMN_MAPPING)
+            yield self._clean_data(chunk)
+    
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Apply all data cleaning transformations."""
+        """Apply all data cleaning transformations.
+        
+        Parsed numeric columns are always numeric, even when every value
+        is missing (e.g. in a small chunk).
+        """
         df = df.copy()
         
         # Parse Turkish decimals
         for col in TURKISH_DECIMAL_COLUMNS:
             if col in df.columns:
-                df[col] = df[col].apply(parse_turkish_decimal)
+                df[col] = pd.to_numeric(df[col].apply(parse_turkish_decimal))
         
         # Parse binary columns
         for col in BINARY_COLUMNS:
             if col in df.columns:
-                df[col] = df[col].apply(parse_binary)
+                df[col] = pd.to_numeric(df[col].apply(parse_binary))
         
         # Parse specific columns
         if 'gender' in df.columns:
             df['gender'] = df['gender'].apply(parse_gender)
         
         if 'age' in df.columns:
-            df['age'] = df['age'].apply(parse_age)
+            df['age'] = pd.to_numeric(df['age'].apply(parse_age))
         
         if 'ef' in df.columns:
-            df['ef'] = df['ef'].apply(parse_ef)
+            df['ef'] = pd.to_numeric(df['ef'].apply(parse_ef))
         
         if 'patient_id' in df.columns:
             df['patient_id'] = df['patient_id'].apply(normalize_patient_id)
@@ -379,7 +704,8 @@ class ClinicalDataLoader:
         
         return df
     
-    def _add_derived_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
         """Add derived/computed columns."""
         # Frank Sign any
         if 'fs_right' in df.columns and 'fs_left' in df.columns:
@@ -423,41 +749,21 @@ class ClinicalDataLoader:
         Returns:
             List of PatientRecord objects.
         """
-        if df is None:
-            df = self.load()
+        return self.to_patient_table(df).to_records()
+    
+    def to_patient_table(self, df: Optional[pd.DataFrame] = None) -> PatientTable:
+        """Convert DataFrame to a columnar PatientTable.
         
-        records = []
-        for _, row in df.iterrows():
-            if pd.isna(row.get('patient_id')):
-                continue
+        Args:
+            df: DataFrame to convert. If None, loads from CSV.
             
-            record = PatientRecord(
-                patient_id=str(row['patient_id']),
-                patient_name=row.get('patient_name'),
-                fs_right=row.get('fs_right'),
-                fs_left=row.get('fs_left'),
-                gender=row.get('gender'),
-                age=row.get('age'),
-                bmi=row.get('bmi'),
-                hypertension=row.get('hypertension'),
-                diabetes=row.get('diabetes'),
-                smoking=row.get('smoking'),
-                family_history=row.get('family_history'),
-                systolic_bp=row.get('systolic_bp'),
-                hdl=row.get('hdl'),
-                ldl=row.get('ldl'),
-                total_cholesterol=row.get('total_cholesterol'),
-                triglycerides=row.get('triglycerides'),
-                ef=row.get('ef'),
-                troponin=str(row.get('troponin')) if pd.notna(row.get('troponin')) else None,
-                creatinine=row.get('creatinine'),
-                gfr=row.get('gfr'),
-                syntax_score=row.get('syntax_score'),
-                framingham=row.get('framingham'),
-            )
-            records.append(record)
+        Returns:
+            PatientTable with vectorized patient properties.
+        """
+        if df is None:
+            df = self.load()
         
-        return records
+        return PatientTable(df)
     
     def get_summary_stats(self, df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Generate summary statistics for the dataset.
@@ -484,6 +790,136 @@ class ClinicalDataLoader:
         return stats
 
 
+# ============================================================
+# MULTI-SITE LOADER
+# ============================================================
+
+def _load_clinical_file(csv_path: Path, rename_columns: bool) -> pd.DataFrame:
+    """Load and clean one site file (module-level so it pickles to workers)."""
+    return ClinicalDataLoader(csv_path).load(rename_columns=rename_columns)
+
+
+class MultiSiteClinicalLoader:
+    """Load clinical CSVs from several hospitals/sites into one frame.
+    
+    Files are parsed and cleaned concurrently on a process pool, tagged with
+    a source column and deduplicated on the normalized ``patient_id``.
+    
+    Conflict strategies:
+        - ``latest``: the row from the last file in ``csv_paths`` wins.
+        - ``first``: the row from the first file wins.
+        - ``merge``: per column, the last non-null value wins; derived
+          columns are recomputed from the merged values.
+        - ``keep``: no deduplication.
+    
+    Attributes:
+        csv_paths: Site CSV files, ordered oldest to newest.
+        duplicate_count: Rows dropped/merged by the last ``load`` call.
+        memory_report: Savings of the last ``load(compact=True)`` call.
+        
+    Example:
+        >>> loader = MultiSiteClinicalLoader(sorted(Path("data/sites").glob("*.csv")))
+        >>> df = loader.load(conflict="merge")
+    """
+    
+    def __init__(
+        self,
+        csv_paths: Sequence[str | Path],
+        n_jobs: Optional[int] = None,
+        source_column: str = 'source',
+    ):
+        """Initialize loader with site CSV paths.
+        
+        Args:
+            csv_paths: Paths to site CSV files, ordered oldest to newest.
+            n_jobs: Worker processes (None = one per CPU, 1 = in-process).
+            source_column: Name of the column holding each row's file name.
+        """
+        self.csv_paths = [Path(p) for p in csv_paths]
+        missing = [str(p) for p in self.csv_paths if not p.exists()]
+        if missing:
+            raise FileNotFoundError(f"Clinical data files not found: {missing}")
+        
+        self.n_jobs = n_jobs
+        self.source_column = source_column
+        self.duplicate_count = 0
+        # Populated by load(compact=True)
+        self.memory_report: Optional[Dict[str, Any]] = None
+    
+    def load(
+        self,
+        rename_columns: bool = True,
+        conflict: str = 'latest',
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """Load, clean, concatenate and deduplicate all site files.
+        
+        Args:
+            rename_columns: If True, rename Turkish columns to English.
+            conflict: Duplicate resolution strategy (see class docstring).
+            compact: If True, convert the result to memory-compact dtypes
+                and store the savings in ``memory_report``.
+            
+        Returns:
+            Combined cleaned DataFrame with a source column.
+            
+        Raises:
+            ValueError: If ``conflict`` is not a known strategy.
+        """
+        if conflict not in CONFLICT_STRATEGIES:
+            raise ValueError(
+                f"Unknown conflict strategy '{conflict}'. Options: {CONFLICT_STRATEGIES}"
+            )
+        
+        frames = self._load_frames(rename_columns)
+        for path, frame in zip(self.csv_paths, frames):
+            frame[self.source_column] = path.name
+        
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=['patient_id', self.source_column])
+        
+        n_rows = len(df)
+        df = self._resolve_conflicts(df, conflict)
+        self.duplicate_count = n_rows - len(df)
+        
+        if compact:
+            df, self.memory_report = compact_dtypes(df)
+        
+        return df
+    
+    def _load_frames(self, rename_columns: bool) -> List[pd.DataFrame]:
+        if self.n_jobs == 1 or len(self.csv_paths) <= 1:
+            return [_load_clinical_file(p, rename_columns) for p in self.csv_paths]
+        
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+            return list(executor.map(
+                _load_clinical_file,
+                self.csv_paths,
+                [rename_columns] * len(self.csv_paths),
+            ))
+    
+    def _resolve_conflicts(self, df: pd.DataFrame, conflict: str) -> pd.DataFrame:
+        if conflict == 'keep' or 'patient_id' not in df.columns:
+            return df
+        
+        has_id = df['patient_id'].notna()
+        with_id = df[has_id]
+        without_id = df[~has_id]
+        
+        if conflict == 'merge':
+            base = with_id.drop(columns=[c for c in DERIVED_COLUMNS if c in with_id.columns])
+            merged = base.groupby('patient_id', sort=False, as_index=False).last()
+            merged = ClinicalDataLoader._add_derived_columns(merged)
+            merged = merged[[c for c in df.columns if c in merged.columns]]
+        else:
+            keep = 'last' if conflict == 'latest' else 'first'
+            merged = with_id.drop_duplicates('patient_id', keep=keep)
+        
+        return pd.concat([merged, without_id], ignore_index=True)
+
+
 # ============================================================
 # IMAGE-CLINICAL LINKER
 # ============================================================
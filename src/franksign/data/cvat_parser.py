@@ -16,7 +16,7 @@ Example:
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import xml.etree.ElementTree as ET
 
 from lxml import etree
@@ -258,33 +258,62 @@ class CVATParser:
     
     def _parse_images(self) -> List[ImageAnnotations]:
         """Parse all image annotations."""
-        images = []
+        return [self._parse_image(image_elem) for image_elem in self._root.findall("image")]
+    
+    def _parse_image(self, image_elem: etree._Element) -> ImageAnnotations:
+        """Parse a single <image> element with its annotations."""
+        img = ImageAnnotations(
+            id=int(image_elem.get("id", 0)),
+            name=image_elem.get("name", ""),
+            width=int(image_elem.get("width", 0)),
+            height=int(image_elem.get("height", 0)),
+            subset=image_elem.get("subset", "default"),
+            task_id=int(image_elem.get("task_id", 0)) if image_elem.get("task_id") else None,
+        )
         
-        for image_elem in self._root.findall("image"):
-            img = ImageAnnotations(
-                id=int(image_elem.get("id", 0)),
-                name=image_elem.get("name", ""),
-                width=int(image_elem.get("width", 0)),
-                height=int(image_elem.get("height", 0)),
-                subset=image_elem.get("subset", "default"),
-                task_id=int(image_elem.get("task_id", 0)) if image_elem.get("task_id") else None,
-            )
-            
-            # Parse points
-            for points_elem in image_elem.findall("points"):
-                img.points.append(self._parse_point(points_elem))
-            
-            # Parse polylines
-            for polyline_elem in image_elem.findall("polyline"):
-                img.polylines.append(self._parse_polyline(polyline_elem))
-            
-            # Parse polygons
-            for polygon_elem in image_elem.findall("polygon"):
-                img.polygons.append(self._parse_polygon(polygon_elem))
-            
-            images.append(img)
+        # Parse points
+        for points_elem in image_elem.findall("points"):
+            img.points.append(self._parse_point(points_elem))
+        
+        # Parse polylines
+        for polyline_elem in image_elem.findall("polyline"):
+            img.polylines.append(self._parse_polyline(polyline_elem))
+        
+        # Parse polygons
+        for polygon_elem in image_elem.findall("polygon"):
+            img.polygons.append(self._parse_polygon(polygon_elem))
         
-        return images
+        return img
+    
+    def iter_images(self) -> Iterator[ImageAnnotations]:
+        """Stream image annotations without building the whole tree.
+        
+        Uses ``iterparse`` and frees each <image> element after it is
+        yielded, so memory stays flat and consumers (e.g. streaming
+        validation) can stop early.
+        
+        Yields:
+            ImageAnnotations in document order.
+        """
+        # Own the file handle so it is closed even if the consumer stops early
+        with open(self.xml_path, "rb") as fh:
+            for _, image_elem in etree.iterparse(fh, events=("end",), tag="image"):
+                yield self._parse_image(image_elem)
+                image_elem.clear(keep_tail=True)
+                while image_elem.getprevious() is not None:
+                    del image_elem.getparent()[0]
+    
+    def read_labels(self) -> List[LabelDefinition]:
+        """Read label definitions only, stopping after the <meta> element.
+        
+        Returns:
+            Label definitions (empty if <meta>/<project> is missing).
+        """
+        with open(self.xml_path, "rb") as fh:
+            for _, meta in etree.iterparse(fh, events=("end",), tag="meta"):
+                project_elem = meta.find("project")
+                return self._parse_labels(project_elem) if project_elem is not None else []
+        return []
     
     def _parse_point(self, elem: etree._Element) -> PointAnnotation:
         """Parse a point annotation element.
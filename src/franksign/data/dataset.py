@@ -4,12 +4,22 @@ This skeleton is intentionally lightweight and future-proof:
 - Uses torch Dataset when available.
 - Provides hooks for transforms/augmentations without enforcing a stack yet.
 - Links images to clinical records via patient ID extraction.
+- Serves image/mask pairs for segmentation with masks rasterized once and
+  cached on disk.
+- Optionally reads pre-resized images from a memory-mapped ``ImageStore``.
+- Optionally crops images and masks to an earlobe ROI.
+- Lists images from a persistent ``ImageManifest`` instead of globbing.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+
+import numpy as np
 
 try:
     import torch
@@ -24,7 +34,14 @@ try:
 except ImportError as exc:  # pragma: no cover - handled at runtime
     raise ImportError("Pillow is required to load images.") from exc
 
+from franksign.data.augmentation import rasterize_annotations
 from franksign.data.clinical_loader import extract_patient_id_from_image
+from franksign.data.cvat_parser import ImageAnnotations
+from franksign.data.image_store import ImageStore, decode_resized
+from franksign.data.manifest import ImageManifest, manifest_paths
+from franksign.data.preprocess import load_resized
+from franksign.data.roi import Box, crop_annotations, earlobe_box
+from franksign.data.splits import load_split
 
 
 @dataclass
@@ -38,11 +55,25 @@ class Sample:
 class FrankSignDataset(Dataset):
     """Minimal torch Dataset for Frank Sign images.
 
+    The image → clinical record join is resolved once in ``__init__``: each
+    image keeps an index into a list of the matched clinical rows (as plain
+    dicts), and the DataFrame itself is not retained, so the dataset pickles
+    cheaply to DataLoader workers.
+
     Args:
         image_paths: Sequence of image file paths.
-        transform: Optional callable applied to PIL images.
+        transform: Optional callable applied to PIL images (or to uint8
+            ``(H, W, 3)`` arrays when reading from an image store).
         clinical_df: Optional pandas DataFrame with clinical data; if provided,
             samples include a matched clinical record when patient IDs align.
+        image_store: Optional ``ImageStore``; images are then read as
+            read-only, zero-copy views of its memory map (looked up by file
+            name) instead of being decoded.
+        image_size: Optional (height, width). Images are then resized to
+            this size before ``transform``; otherwise they are returned at
+            their original size.
+        draft: With ``image_size``, decode JPEGs at reduced resolution
+            (see ``load_resized``).
     """
 
     def __init__(
@@ -50,34 +81,70 @@ class FrankSignDataset(Dataset):
         image_paths: Sequence[Path | str],
         transform: Optional[Callable[[Any], Any]] = None,
         clinical_df: Any | None = None,
+        image_store: Optional[ImageStore] = None,
+        image_size: Optional[Sequence[int]] = None,
+        draft: bool = False,
     ) -> None:
         self.image_paths: List[Path] = [Path(p) for p in image_paths]
         self.transform = transform
-        self.clinical_df = clinical_df
+        self.image_store = image_store
+        self.image_size = tuple(image_size) if image_size is not None else None
+        self.draft = draft
+        self.patient_ids: List[Optional[str]] = [
+            extract_patient_id_from_image(p.name) for p in self.image_paths
+        ]
+        self.clinical_records: List[Dict[str, Any]] = []
+        self.record_index = np.full(len(self.image_paths), -1, dtype=np.int32)
+        if clinical_df is not None and "patient_id" in clinical_df.columns:
+            self._index_clinical(clinical_df)
+
+    def _index_clinical(self, clinical_df: Any) -> None:
+        """Map images to clinical rows by patient ID (first row per ID wins)."""
+        row_by_id: Dict[str, int] = {}
+        for row, pid in enumerate(clinical_df["patient_id"].astype(str).tolist()):
+            row_by_id.setdefault(pid, row)
+
+        matched_rows: Dict[int, int] = {}
+        for i, pid in enumerate(self.patient_ids):
+            row = row_by_id.get(pid) if pid else None
+            if row is not None:
+                self.record_index[i] = matched_rows.setdefault(row, len(matched_rows))
+
+        # Only rows referenced by at least one image are kept
+        self.clinical_records = clinical_df.iloc[list(matched_rows)].to_dict("records")
 
     def __len__(self) -> int:
         return len(self.image_paths)
 
+    def clinical_record(self, idx: int) -> Optional[Dict[str, Any]]:
+        """Clinical record linked to image ``idx`` (None if unmatched)."""
+        pos = self.record_index[idx]
+        return self.clinical_records[pos] if pos >= 0 else None
+
+    def _meta(self, idx: int) -> Dict[str, Any]:
+        meta: Dict[str, Any] = {"image_path": str(self.image_paths[idx])}
+        patient_id = self.patient_ids[idx]
+        if patient_id:
+            meta["patient_id"] = patient_id
+            record = self.clinical_record(idx)
+            if record is not None:
+                meta["clinical_record"] = dict(record)
+        return meta
+
     def __getitem__(self, idx: int) -> Sample:
         image_path = self.image_paths[idx]
-        image = Image.open(image_path).convert("RGB")
+        if self.image_store is not None:
+            image = self.image_store.get(image_path.name)
+        elif self.image_size is not None:
+            image = load_resized(image_path, self.image_size, draft=self.draft)
+        else:
+            with Image.open(image_path) as im:
+                image = im.convert("RGB")
 
         if self.transform:
             image = self.transform(image)
 
-        meta: Dict[str, Any] = {"image_path": str(image_path)}
-
-        patient_id = extract_patient_id_from_image(image_path.name)
-        if patient_id:
-            meta["patient_id"] = patient_id
-            if self.clinical_df is not None and "patient_id" in self.clinical_df.columns:
-                matches = self.clinical_df[
-                    self.clinical_df["patient_id"].astype(str) == str(patient_id)
-                ]
-                if len(matches) > 0:
-                    meta["clinical_record"] = matches.iloc[0].to_dict()
-
-        return Sample(image=image, meta=meta)
+        return Sample(image=image, meta=self._meta(idx))
 
     @classmethod
     def from_config(
@@ -86,26 +153,380 @@ class FrankSignDataset(Dataset):
         split_files: Optional[Sequence[str]] = None,
         transform: Optional[Callable[[Any], Any]] = None,
         clinical_df: Any | None = None,
+        split: Optional[str] = None,
+        refresh_manifest: bool = True,
+        resize: bool = False,
     ) -> "FrankSignDataset":
         """Create dataset from a config dict (mirrors configs/default.yaml).
 
+        Images are listed from the image manifest at ``data.manifest_path``
+        (default ``{processed_dir}/image_manifest.json``) instead of walking
+        ``images_dir`` every time. It is built on first use or when it was
+        built for another ``images_dir``, and quick-refreshed otherwise.
+
         Args:
             config: Parsed YAML configuration.
             split_files: Optional list of image file names to restrict to a split.
             transform: Optional transform callable.
             clinical_df: Optional clinical dataframe for joining records.
+            split: Optional split name ("train", "val", "test") read from
+                ``data.splits_dir`` when ``split_files`` is not given.
+            refresh_manifest: Quick-refresh the manifest (new, removed or
+                renamed images) before listing; False trusts it as saved.
+            resize: Decode images at ``data.image_size`` (with draft JPEG
+                decoding when ``data.draft_decode`` is set) instead of at
+                full size.
+
+        Raises:
+            FileNotFoundError: If ``images_dir`` is missing or holds no
+                (selected) images; nothing is written in that case.
         """
+        data = config["data"]
+        images_dir = Path(data["images_dir"])
+        if not images_dir.is_dir():
+            raise FileNotFoundError(
+                f"Image directory {images_dir} not found. Place sample data or adjust config."
+            )
+        manifest_path = data.get(
+            "manifest_path", Path(data.get("processed_dir", "data/processed")) / "image_manifest.json"
+        )
+        manifest = ImageManifest.open(images_dir, manifest_path, refresh=refresh_manifest)
 
-        images_dir = Path(config["data"]["images_dir"])
+        if split_files is None and split is not None:
+            split_files = load_split(data.get("splits_dir", "data/splits"), split)
         if split_files is None:
-            image_paths = sorted(images_dir.glob("**/*"))
+            image_paths = manifest.paths()
         else:
-            image_paths = [images_dir / name for name in split_files]
+            image_paths = manifest_paths(manifest, split_files)
 
-        image_paths = [p for p in image_paths if p.is_file()]
         if not image_paths:
             raise FileNotFoundError(
                 f"No images found under {images_dir}. Place sample data or adjust config."
             )
 
-        return cls(image_paths=image_paths, transform=transform, clinical_df=clinical_df)
+        return cls(
+            image_paths=image_paths,
+            transform=transform,
+            clinical_df=clinical_df,
+            image_size=data.get("image_size") if resize else None,
+            draft=bool(data.get("draft_decode", False)),
+        )
+
+    @classmethod
+    def from_image_store(
+        cls,
+        store: ImageStore | Path | str,
+        transform: Optional[Callable[[Any], Any]] = None,
+        clinical_df: Any | None = None,
+    ) -> "FrankSignDataset":
+        """Create a dataset over every image in a built store.
+
+        Images that failed to decode when the store was built are skipped.
+
+        Args:
+            store: ``ImageStore`` or its base path.
+            transform: Optional transform applied to uint8 arrays.
+            clinical_df: Optional clinical dataframe for joining records.
+        """
+        if not isinstance(store, ImageStore):
+            store = ImageStore(store)
+        image_paths = [src for name, src in zip(store.names, store.sources) if name not in store.errors]
+        return cls(image_paths=image_paths, transform=transform, clinical_df=clinical_df, image_store=store)
+
+
+# ============================================================
+# SEGMENTATION
+# ============================================================
+
+# Bump when rasterization changes so cached masks are regenerated
+MASK_CACHE_VERSION = "1"
+
+# Mask classes: background, Frank Sign line, Frank Sign region
+NUM_MASK_CLASSES = 3
+
+MASK_STATS_FILE = "mask_stats.json"
+
+
+def mask_cache_key(
+    image: ImageAnnotations,
+    image_size: Tuple[int, int],
+    line_thickness: int,
+) -> str:
+    """Stable key for a rasterized mask (geometry, CVAT size and target size)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((MASK_CACHE_VERSION, image.name, image.width, image.height,
+                   tuple(image_size), line_thickness)).encode())
+    for kind, shapes in (("polyline", image.polylines), ("polygon", image.polygons)):
+        for shape in shapes:
+            presence = shape.attributes.get("presence", "")
+            h.update(f"|{kind}:{shape.label}:{presence}:{len(shape.points)}|".encode())
+            h.update(np.asarray([(p.x, p.y) for p in shape.points], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+class MaskCache:
+    """On-disk cache of rasterized masks stored as PNG files.
+
+    Masks are tiny when PNG-compressed (mostly background). Files are written
+    atomically, so concurrent DataLoader workers can fill the cache safely.
+    """
+
+    def __init__(self, cache_dir: Path | str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached mask for ``key`` or None."""
+        path = self.path(key)
+        if not path.exists():
+            return None
+        with Image.open(path) as im:
+            return np.array(im, dtype=np.uint8)
+
+    def put(self, key: str, mask: np.ndarray) -> None:
+        """Store a uint8 mask."""
+        path = self.path(key)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+        Image.fromarray(mask.astype(np.uint8)).save(tmp, format="PNG")
+        os.replace(tmp, path)
+
+    @property
+    def stats_path(self) -> Path:
+        return self.cache_dir / MASK_STATS_FILE
+
+    def load_stats(self) -> Dict[str, List[int]]:
+        """Per-key class pixel counts saved by ``save_stats``."""
+        if not self.stats_path.exists():
+            return {}
+        data = json.loads(self.stats_path.read_text(encoding="utf-8"))
+        if data.get("version") != MASK_CACHE_VERSION:
+            return {}
+        return data["counts"]
+
+    def save_stats(self, counts: Dict[str, List[int]]) -> None:
+        """Write per-key class pixel counts (atomic)."""
+        tmp = self.stats_path.with_name(f"{self.stats_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": MASK_CACHE_VERSION, "counts": counts}), encoding="utf-8")
+        os.replace(tmp, self.stats_path)
+
+
+def to_segmentation_tensors(
+    image: np.ndarray,
+    mask: np.ndarray,
+    transform: Optional[Callable[..., Dict[str, Any]]] = None,
+) -> Tuple["torch.Tensor", "torch.Tensor"]:
+    """Apply an optional transform and convert to (float CHW image, long HW mask).
+
+    Images in [0, 255] uint8 are scaled to [0, 1]; tensors returned by the
+    transform (e.g. after ``ToTensorV2``) are passed through.
+    """
+    if transform:
+        out = transform(image=image, mask=mask)
+        image, mask = out["image"], out["mask"]
+
+    if not isinstance(image, torch.Tensor):
+        # One copy: uint8 HWC (possibly a read-only memmap view) -> float CHW
+        chw = np.ascontiguousarray(np.transpose(image, (2, 0, 1)), dtype=np.float32)
+        image = torch.from_numpy(chw).div_(255.0)
+    if not isinstance(mask, torch.Tensor):
+        mask = torch.from_numpy(np.ascontiguousarray(mask))
+    return image, mask.long()
+
+
+class FrankSignSegmentationDataset(Dataset):
+    """Image/mask pairs for segmentation training.
+
+    Joins image files with their CVAT ``ImageAnnotations`` and returns
+    ``{"image", "mask", "index"}`` dicts as expected by
+    ``SegmentationTrainer``. Images are resized to ``image_size`` and the
+    3-class mask (0 background, 1 Frank Sign line, 2 Frank Sign region) is
+    rasterized directly at that size, once per image: masks are kept in
+    ``MaskCache`` when ``cache_dir`` is set, otherwise in memory.
+
+    Args:
+        images_dir: Directory CVAT image names are relative to.
+        annotations: Parsed annotations, one per image.
+        image_size: Target (height, width).
+        transform: Optional albumentations-style callable
+            ``transform(image=..., mask=...) -> {"image", "mask"}``.
+        cache_dir: Optional directory for the on-disk mask cache.
+        line_thickness: Frank Sign line thickness in target pixels.
+        image_store: Optional ``ImageStore`` built at ``image_size``; images
+            are then read from its memory map instead of decoded.
+        roi_margin: Enable earlobe ROI mode: images are cropped to
+            ``roi.earlobe_box(margin=roi_margin)`` before resizing and masks
+            are rasterized from the cropped geometry. Images without the
+            needed annotations are used whole.
+        roi_source: Box source for ROI mode ("auto", "landmarks", "region").
+        draft: Decode JPEGs at reduced resolution (see ``load_resized``).
+
+    Raises:
+        ValueError: If ``image_store`` was built at a different size, with
+            different crop boxes or letterboxed.
+    """
+
+    def __init__(
+        self,
+        images_dir: Path | str,
+        annotations: Sequence[ImageAnnotations],
+        image_size: Sequence[int] = (256, 256),
+        transform: Optional[Callable[..., Dict[str, Any]]] = None,
+        cache_dir: Path | str | None = None,
+        line_thickness: int = 3,
+        image_store: Optional[ImageStore] = None,
+        roi_margin: Optional[float] = None,
+        roi_source: str = "auto",
+        draft: bool = False,
+    ) -> None:
+        self.images_dir = Path(images_dir)
+        self.annotations: List[ImageAnnotations] = list(annotations)
+        self.image_size: Tuple[int, int] = (int(image_size[0]), int(image_size[1]))
+        self.boxes: List[Optional[Box]] = [
+            earlobe_box(a, margin=roi_margin, source=roi_source) if roi_margin is not None else None
+            for a in self.annotations
+        ]
+        if image_store is not None:
+            self._check_store(image_store)
+        self.image_store = image_store
+        self.transform = transform
+        self.line_thickness = line_thickness
+        self.draft = draft
+        self.cache = MaskCache(cache_dir) if cache_dir is not None else None
+        # Geometry in crop coordinates (the original annotations when not cropping)
+        self._mask_annotations = [crop_annotations(a, box) for a, box in zip(self.annotations, self.boxes)]
+        self._keys = [mask_cache_key(a, self.image_size, line_thickness) for a in self._mask_annotations]
+        self._memory: Dict[int, np.ndarray] = {}
+
+    def _check_store(self, store: ImageStore) -> None:
+        if tuple(store.image_size) != self.image_size:
+            raise ValueError(
+                f"Image store size {store.image_size} does not match image_size {self.image_size}"
+            )
+        if store.letterbox:
+            raise ValueError("Letterboxed image stores do not match the stretched masks of this dataset")
+        for annotation, box in zip(self.annotations, self.boxes):
+            try:
+                row = store.row(annotation.name)
+            except KeyError:
+                continue
+            stored = store.boxes[row] if store.boxes is not None else None
+            if stored != box:
+                raise ValueError(
+                    f"Image store crop {stored} for {annotation.name} does not match ROI box {box}"
+                )
+
+    def __len__(self) -> int:
+        return len(self.annotations)
+
+    def load_mask(self, idx: int) -> np.ndarray:
+        """Rasterized mask for sample ``idx``, computed at most once."""
+        mask = self._memory.get(idx)
+        if mask is not None:
+            return mask
+        if self.cache is not None:
+            mask = self.cache.get(self._keys[idx])
+        if mask is None:
+            mask = rasterize_annotations(
+                self._mask_annotations[idx], self.image_size, line_thickness=self.line_thickness
+            )
+            if self.cache is not None:
+                self.cache.put(self._keys[idx], mask)
+        if self.cache is None:
+            self._memory[idx] = mask
+        return mask
+
+    def build_masks(self) -> int:
+        """Rasterize every mask missing from the cache; returns how many were built.
+
+        Call before creating DataLoader workers so that they only read.
+        """
+        built = 0
+        for idx in range(len(self)):
+            if self.cache is not None and self.cache.path(self._keys[idx]).exists():
+                continue
+            if self.cache is None and idx in self._memory:
+                continue
+            self.load_mask(idx)
+            built += 1
+        return built
+
+    def mask_stats(self) -> np.ndarray:
+        """Per-sample mask pixel counts (background, line, region), shape (N, 3).
+
+        Counts come from the masks, never the images, and are stored in
+        ``mask_stats.json`` in the mask cache so later calls skip reading
+        masks. Call before creating DataLoader workers.
+        """
+        known = self.cache.load_stats() if self.cache is not None else {}
+        stats = np.zeros((len(self), NUM_MASK_CLASSES), dtype=np.int64)
+        new: Dict[str, List[int]] = {}
+        for idx, key in enumerate(self._keys):
+            counts = known.get(key)
+            if counts is None:
+                counts = np.bincount(self.load_mask(idx).ravel(), minlength=NUM_MASK_CLASSES).tolist()
+                new[key] = counts
+            stats[idx] = counts[:NUM_MASK_CLASSES]
+        if new and self.cache is not None:
+            self.cache.save_stats({**known, **new})
+        return stats
+
+    def load_image(self, idx: int) -> np.ndarray:
+        """RGB image (ROI crop in ROI mode) resized to ``image_size`` as uint8 (H, W, 3).
+
+        Read-only memory-map view when an image store is attached.
+        """
+        name = self.annotations[idx].name
+        if self.image_store is not None:
+            return self.image_store.get(name)
+        return decode_resized(self.images_dir / name, self.image_size, draft=self.draft, box=self.boxes[idx])
+
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        image, mask = to_segmentation_tensors(self.load_image(idx), self.load_mask(idx), self.transform)
+        return {"image": image, "mask": mask, "index": idx}
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        annotations: Sequence[ImageAnnotations],
+        split_files: Optional[Sequence[str]] = None,
+        transform: Optional[Callable[..., Dict[str, Any]]] = None,
+        image_store: Optional[ImageStore] = None,
+        split: Optional[str] = None,
+    ) -> "FrankSignSegmentationDataset":
+        """Create dataset from a config dict (mirrors configs/default.yaml).
+
+        Masks are cached under ``{processed_dir}/masks``. ROI mode is enabled
+        by ``data.roi.enabled`` (with ``margin`` and ``source``), draft JPEG
+        decoding by ``data.draft_decode``.
+
+        Args:
+            config: Parsed YAML configuration.
+            annotations: Parsed CVAT annotations (e.g. ``project.images``).
+            split_files: Optional image file names to restrict to a split.
+            transform: Optional transform callable.
+            image_store: Optional pre-resized image store for this split.
+            split: Optional split name read from ``data.splits_dir`` when
+                ``split_files`` is not given.
+        """
+        data = config["data"]
+        if split_files is None and split is not None:
+            split_files = load_split(data.get("splits_dir", "data/splits"), split)
+        roi = data.get("roi") or {}
+        if split_files is not None:
+            wanted = set(split_files)
+            annotations = [a for a in annotations if a.name in wanted]
+        return cls(
+            images_dir=data["images_dir"],
+            annotations=annotations,
+            image_size=data.get("image_size", (256, 256)),
+            transform=transform,
+            cache_dir=Path(data.get("processed_dir", "data/processed")) / "masks",
+            image_store=image_store,
+            roi_margin=roi.get("margin", 0.15) if roi.get("enabled") else None,
+            roi_source=roi.get("source", "auto"),
+            draft=bool(data.get("draft_decode", False)),
+        )
@@ -0,0 +1,53 @@
+"""Image header reading without pixel decoding.
+
+Kept free of validation dependencies (pandera) so the image manifest and
+datasets can read headers cheaply.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Union
+import os
+
+try:
+    from PIL import Image, UnidentifiedImageError
+except ImportError as exc:  # pragma: no cover - handled at runtime
+    raise ImportError("Pillow is required to read image headers.") from exc
+
+
+# EXIF orientations that swap width and height (90/270 degree rotations)
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+_EXIF_ORIENTATION_TAG = 0x0112
+
+
+def read_image_header(path: Union[str, Path]) -> Dict[str, object]:
+    """Read size and format from an image header without decoding pixels.
+
+    Returns:
+        Dict with ``size``/``mtime_ns`` (file stat), ``width``/``height``
+        (as stored, before EXIF rotation), ``format``, ``transposed`` (EXIF
+        orientation swaps the axes) and ``error`` (None, "missing" or the
+        reason the header could not be read).
+    """
+    record: Dict[str, object] = {
+        "size": None, "mtime_ns": None, "width": None, "height": None,
+        "format": None, "transposed": False, "error": None,
+    }
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        record["error"] = "missing"
+        return record
+    record["size"] = stat.st_size
+    record["mtime_ns"] = stat.st_mtime_ns
+
+    try:
+        # Image.open only parses the header; pixel data is read on load()
+        with Image.open(path) as im:
+            record["width"], record["height"] = im.size
+            record["format"] = im.format
+            orientation = im.getexif().get(_EXIF_ORIENTATION_TAG)
+            record["transposed"] = orientation in _TRANSPOSED_ORIENTATIONS
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError) as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    return record
@@ -0,0 +1,338 @@
+"""Memory-mapped store of decoded, resized images.
+
+A split is decoded and resized once into a single ``(N, H, W, 3)`` uint8
+``.npy`` file plus a JSON index (names, source paths, target size). Datasets
+then read images as zero-copy views of the memory map, so DataLoader workers
+share the OS page cache instead of each decoding JPEGs.
+
+Stores may also carry ``(N, H, W)`` uint8 masks in ``<base>.masks.npy``
+(``preprocess_packed(annotations=...)``). The index records the
+array shape and the byte offset of the pixel data, so row ``i`` starts at
+``data_offset + i * H * W * 3`` for readers that map the file without NumPy.
+
+Example:
+    >>> store = build_image_store(paths, "data/processed/train_256", image_size=(256, 256))
+    >>> dataset = FrankSignDataset.from_image_store("data/processed/train_256")
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import json
+import os
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError as exc:  # pragma: no cover - handled at runtime
+    raise ImportError("Pillow is required to build image stores.") from exc
+
+from franksign.data.preprocess import load_resized
+
+
+# Bump when the on-disk layout changes
+IMAGE_STORE_VERSION = "1"
+
+
+def store_paths(base: Union[str, Path]) -> Tuple[Path, Path]:
+    """Array and index paths for a store base path.
+
+    ``base`` may also be either of the two files themselves.
+    """
+    base = Path(base)
+    for suffix in (".index.json", ".npy"):
+        if base.name.endswith(suffix):
+            base = base.with_name(base.name[: -len(suffix)])
+    return base.with_name(base.name + ".npy"), base.with_name(base.name + ".index.json")
+
+
+def mask_path(base: Union[str, Path]) -> Path:
+    """Mask array path for a store base path."""
+    array_path, _ = store_paths(base)
+    return array_path.with_name(array_path.stem + ".masks.npy")
+
+
+def _data_offset(path: Path) -> int:
+    """Byte offset of the array data in a ``.npy`` file."""
+    with open(path, "rb") as f:
+        major, _ = np.lib.format.read_magic(f)
+        if major == 1:
+            np.lib.format.read_array_header_1_0(f)
+        else:
+            np.lib.format.read_array_header_2_0(f)
+        return f.tell()
+
+
+def decode_resized(
+    path: Union[str, Path],
+    image_size: Sequence[int],
+    draft: bool = False,
+    box: Optional[Sequence[int]] = None,
+    resample: Image.Resampling = Image.Resampling.BICUBIC,
+) -> np.ndarray:
+    """Decode an image (or its ``box`` crop) as RGB resized to (height, width) uint8.
+
+    With ``draft`` JPEGs are decoded at the smallest DCT scale covering
+    ``image_size`` (see ``load_resized``). ``resample`` defaults to the
+    ``load_resized`` filter, so stores match images decoded on the fly.
+    """
+    image = load_resized(path, image_size, draft=draft, resample=resample, box=box)
+    return np.array(image, dtype=np.uint8)
+
+
+class ImageStore:
+    """Read-only view of a built image store.
+
+    The memory map is opened lazily and dropped when pickled, so each
+    DataLoader worker maps the file itself instead of receiving a copy.
+
+    Attributes:
+        names: Image file names, one per row.
+        sources: Source image paths, one per row.
+        image_size: (height, width) of every stored image.
+        errors: Names that failed to decode (their rows are zero-filled).
+        boxes: Per-row crop boxes (x0, y0, x1, y1) or None for uncropped
+            rows; None if the store was built without crops.
+        letterbox: Whether images were letterboxed rather than stretched.
+        resample: Name of the resampling filter (e.g. "bicubic"); None for
+            stores written before it was recorded.
+        annotated: Per-row flags for rows with a rasterized mask; None if
+            the store has no masks.
+    """
+
+    def __init__(self, base: Union[str, Path]):
+        self.array_path, self.index_path = store_paths(base)
+        index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        if index.get("version") != IMAGE_STORE_VERSION:
+            raise ValueError(f"Unsupported image store version in {self.index_path}")
+        self.names: List[str] = index["names"]
+        self.sources: List[str] = index["sources"]
+        self.image_size: Tuple[int, int] = tuple(index["image_size"])
+        self.errors: Dict[str, str] = index.get("errors", {})
+        boxes = index.get("boxes")
+        self.boxes: Optional[List[Optional[Tuple[int, int, int, int]]]] = (
+            [tuple(b) if b is not None else None for b in boxes] if boxes is not None else None
+        )
+        self.letterbox: bool = index.get("letterbox", False)
+        self.resample: Optional[str] = index.get("resample")
+        self.annotated: Optional[List[bool]] = index.get("annotated")
+        self.data_offset: Optional[int] = index.get("data_offset")
+        self.mask_path = mask_path(self.array_path)
+        self._rows = {name: i for i, name in enumerate(self.names)}
+        self._array: Optional[np.ndarray] = None
+        self._masks: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_array"] = None
+        state["_masks"] = None
+        return state
+
+    @property
+    def array(self) -> np.ndarray:
+        """The ``(N, H, W, 3)`` uint8 memory map."""
+        if self._array is None:
+            self._array = np.load(self.array_path, mmap_mode="r")
+        return self._array
+
+    @property
+    def masks(self) -> Optional[np.ndarray]:
+        """The ``(N, H, W)`` uint8 mask memory map, or None without masks."""
+        if self._masks is None and self.annotated is not None:
+            self._masks = np.load(self.mask_path, mmap_mode="r")
+        return self._masks
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        """Read-only (H, W, 3) view of row ``idx`` (no copy)."""
+        return self.array[idx]
+
+    def row(self, name: str) -> int:
+        """Row index of an image name.
+
+        Raises:
+            KeyError: If the image is not in the store.
+        """
+        return self._rows[name]
+
+    def get(self, name: str) -> np.ndarray:
+        """Read-only view of the image called ``name``."""
+        return self.array[self._rows[name]]
+
+    def get_mask(self, name: str) -> Optional[np.ndarray]:
+        """Read-only mask view for ``name``; None if the row has no mask."""
+        row = self._rows[name]
+        if self.annotated is None or not self.annotated[row]:
+            return None
+        return self.masks[row]
+
+
+class ImageStoreWriter:
+    """Writes rows of a new image store into temporary memory maps.
+
+    Rows may be written from several threads. ``close`` renames the arrays
+    into place and writes the index, so readers never see a partial store.
+
+    Args:
+        output: Base path of the store.
+        names: Image names, one per row; must be unique.
+        sources: Source paths, one per row.
+        image_size: Target (height, width).
+        boxes: Optional per-row crop boxes recorded in the index.
+        masks: Also allocate an ``(N, H, W)`` mask array.
+        letterbox: Recorded in the index.
+        resample: Resampling filter the rows are written with; recorded in
+            the index.
+
+    Raises:
+        ValueError: If names are not unique or ``boxes`` has the wrong length.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path],
+        names: Sequence[str],
+        sources: Sequence[Union[str, Path]],
+        image_size: Sequence[int],
+        boxes: Optional[Sequence[Optional[Sequence[int]]]] = None,
+        masks: bool = False,
+        letterbox: bool = False,
+        resample: Image.Resampling = Image.Resampling.BICUBIC,
+    ) -> None:
+        if len(set(names)) != len(names):
+            raise ValueError("Image file names must be unique within a store")
+        if boxes is not None and len(boxes) != len(names):
+            raise ValueError("boxes must have one entry per image")
+        self.names = list(names)
+        self.sources = [str(p) for p in sources]
+        self.image_size = (int(image_size[0]), int(image_size[1]))
+        self.boxes = [list(map(int, b)) if b is not None else None for b in boxes] if boxes is not None else None
+        self.letterbox = letterbox
+        self.resample = Image.Resampling(resample)
+        self.errors: Dict[str, str] = {}
+        self.annotated: Optional[List[bool]] = [False] * len(self.names) if masks else None
+
+        self.array_path, self.index_path = store_paths(output)
+        self.mask_path = mask_path(output)
+        self.array_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_array = self.array_path.with_name(self.array_path.stem + ".tmp.npy")
+        self._tmp_masks = self.mask_path.with_name(self.mask_path.stem + ".tmp.npy")
+        height, width = self.image_size
+        self.images = np.lib.format.open_memmap(
+            self._tmp_array, mode="w+", dtype=np.uint8, shape=(len(self.names), height, width, 3)
+        )
+        self.masks = (
+            np.lib.format.open_memmap(self._tmp_masks, mode="w+", dtype=np.uint8, shape=(len(self.names), height, width))
+            if masks else None
+        )
+
+    def write(self, row: int, image: np.ndarray) -> None:
+        """Store the (H, W, 3) image of row ``row``."""
+        self.images[row] = image
+
+    def write_mask(self, row: int, mask: np.ndarray) -> None:
+        """Store the (H, W) mask of row ``row``.
+
+        Raises:
+            ValueError: If the store was created without masks.
+        """
+        if self.masks is None:
+            raise ValueError("Store was created without masks")
+        self.masks[row] = mask
+        self.annotated[row] = True
+
+    def fail(self, row: int, error: str) -> None:
+        """Record that row ``row`` could not be decoded (it stays zero-filled)."""
+        self.errors[self.names[row]] = error
+
+    def close(self) -> ImageStore:
+        """Flush, move the arrays into place, write the index and open the store."""
+        shape = list(self.images.shape)
+        self.images.flush()
+        del self.images
+        os.replace(self._tmp_array, self.array_path)
+        if self.masks is not None:
+            self.masks.flush()
+            del self.masks
+            os.replace(self._tmp_masks, self.mask_path)
+        elif self.mask_path.exists():
+            self.mask_path.unlink()
+
+        index = {
+            "version": IMAGE_STORE_VERSION,
+            "image_size": list(self.image_size),
+            "names": self.names,
+            "sources": self.sources,
+            "errors": {name: self.errors[name] for name in self.names if name in self.errors},
+            "boxes": self.boxes,
+            "letterbox": self.letterbox,
+            "resample": self.resample.name.lower(),
+            "annotated": self.annotated,
+            "shape": shape,
+            "data_offset": _data_offset(self.array_path),
+        }
+        tmp_index = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp_index.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_index, self.index_path)
+        return ImageStore(self.array_path)
+
+
+def build_image_store(
+    image_paths: Sequence[Union[str, Path]],
+    output: Union[str, Path],
+    image_size: Sequence[int] = (256, 256),
+    n_jobs: Optional[int] = None,
+    boxes: Optional[Sequence[Optional[Sequence[int]]]] = None,
+    resample: Image.Resampling = Image.Resampling.BICUBIC,
+) -> ImageStore:
+    """Decode and resize images into a memory-mappable ``.npy`` plus index.
+
+    Decoding runs on a thread pool (Pillow releases the GIL while decoding)
+    and each worker writes straight into its row of the output memory map.
+    Images that fail to decode are left zero-filled and listed in the
+    index's ``errors``.
+
+    Args:
+        image_paths: Images to store, in row order. File names must be unique.
+        output: Base path; writes ``<output>.npy`` and ``<output>.index.json``.
+        image_size: Target (height, width).
+        n_jobs: Decode threads (None = ThreadPoolExecutor default, 1 = serial).
+        boxes: Optional crop box (x0, y0, x1, y1) per image (None = whole
+            image), e.g. from ``roi.earlobe_box``; recorded in the index.
+        resample: Resampling filter (recorded in the index).
+
+    Returns:
+        The opened ``ImageStore``.
+
+    Raises:
+        ValueError: If two images share a file name or ``boxes`` has the
+            wrong length.
+    """
+    paths = [Path(p) for p in image_paths]
+    height, width = int(image_size[0]), int(image_size[1])
+    writer = ImageStoreWriter(
+        output, [p.name for p in paths], paths, (height, width), boxes=boxes, resample=resample
+    )
+
+    def fill(row: int) -> None:
+        try:
+            box = writer.boxes[row] if writer.boxes is not None else None
+            writer.write(row, decode_resized(paths[row], (height, width), box=box, resample=writer.resample))
+        except (OSError, ValueError, SyntaxError) as exc:
+            writer.fail(row, f"{type(exc).__name__}: {exc}")
+
+    rows = range(len(paths))
+    if n_jobs == 1:
+        for row in rows:
+            fill(row)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(fill, rows))
+    return writer.close()
@@ -0,0 +1,274 @@
+"""Letterbox resizing and packed annotation geometry.
+
+Stretching every image to ``image_size`` distorts the ear's aspect ratio,
+and CVAT coordinates no longer match the processed pixels. Letterboxing
+scales the image (or a crop box) uniformly to fit ``image_size`` and pads
+the rest, so the mapping from CVAT to output pixels is one affine transform
+per image::
+
+    x' = sx * (x - x0) + ox        y' = sy * (y - y0) + oy
+
+``letterbox_matrices`` computes these as an (N, 2, 3) array from image sizes
+alone. ``PackedGeometry`` stores the coordinates of every shape of every
+image in a single (P, 2) array with offsets, so the transforms are applied
+to a whole project in one vectorized step; ``to_annotations`` turns the
+result back into ``ImageAnnotations`` whose width/height are the target
+size, ready for ``rasterize_annotations`` and feature extraction without
+full-resolution rasterization.
+
+Example:
+    >>> packed = PackedGeometry.from_annotations(project.images)
+    >>> matrices, content = letterbox_matrices(packed.sizes, (256, 256))
+    >>> resized = packed.transform(matrices, (256, 256)).to_annotations()
+    >>> mask = rasterize_annotations(resized[0])
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+import json
+
+import numpy as np
+
+from franksign.data.cvat_parser import (
+    ImageAnnotations,
+    Point,
+    PointAnnotation,
+    PolygonAnnotation,
+    PolylineAnnotation,
+)
+
+
+# Shape kinds in PackedGeometry.kinds
+SHAPE_KINDS = ("point", "polyline", "polygon")
+
+GEOMETRY_FILE = "geometry.npz"
+
+
+def letterbox_matrices(
+    sizes: np.ndarray,
+    image_size: Sequence[int],
+    boxes: Optional[np.ndarray] = None,
+    letterbox: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Affine transforms from source pixels to ``image_size`` outputs.
+
+    The scaled content is rounded to whole pixels and centred, and each
+    axis' scale is the exact ratio of content to source size, so the
+    transform matches ``load_resized(letterbox=True)`` pixel for pixel.
+
+    Args:
+        sizes: (N, 2) source (width, height).
+        image_size: Target (height, width).
+        boxes: Optional (N, 4) crop boxes (x0, y0, x1, y1) in source pixels.
+        letterbox: Preserve the aspect ratio; False stretches to fill.
+
+    Returns:
+        (matrices, content): (N, 2, 3) float64 transforms and (N, 4) int64
+        content rectangles (x0, y0, x1, y1) in the output.
+    """
+    height, width = int(image_size[0]), int(image_size[1])
+    sizes = np.asarray(sizes, dtype=np.float64).reshape(-1, 2)
+    if boxes is None:
+        boxes = np.concatenate([np.zeros_like(sizes), sizes], axis=1)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    box_w = np.maximum(boxes[:, 2] - boxes[:, 0], 1.0)
+    box_h = np.maximum(boxes[:, 3] - boxes[:, 1], 1.0)
+
+    if letterbox:
+        scale = np.minimum(width / box_w, height / box_h)
+        content_w = np.clip(np.round(box_w * scale), 1, width).astype(np.int64)
+        content_h = np.clip(np.round(box_h * scale), 1, height).astype(np.int64)
+    else:
+        content_w = np.full(len(boxes), width, dtype=np.int64)
+        content_h = np.full(len(boxes), height, dtype=np.int64)
+    off_x = (width - content_w) // 2
+    off_y = (height - content_h) // 2
+    sx, sy = content_w / box_w, content_h / box_h
+
+    matrices = np.zeros((len(boxes), 2, 3))
+    matrices[:, 0, 0] = sx
+    matrices[:, 0, 2] = off_x - boxes[:, 0] * sx
+    matrices[:, 1, 1] = sy
+    matrices[:, 1, 2] = off_y - boxes[:, 1] * sy
+    content = np.stack([off_x, off_y, off_x + content_w, off_y + content_h], axis=1)
+    return matrices, content
+
+
+@dataclass
+class PackedGeometry:
+    """Annotation geometry of many images in flat arrays.
+
+    Shape ``k`` belongs to image ``image_index[k]`` and owns
+    ``coords[offsets[k]:offsets[k + 1]]``. Shapes are packed per image as
+    points, then polylines, then polygons, in annotation order.
+
+    Attributes:
+        names: Image names.
+        ids: CVAT image IDs.
+        sizes: (N, 2) coordinate frame (width, height) per image.
+        coords: (P, 2) float64 x, y.
+        offsets: (S + 1,) int64 shape start offsets into ``coords``.
+        image_index: (S,) int64 image of each shape.
+        kinds: (S,) int8 index into ``SHAPE_KINDS``.
+        labels: (S,) label strings.
+        attributes: (S,) JSON-encoded attribute dicts.
+    """
+
+    names: List[str]
+    ids: np.ndarray
+    sizes: np.ndarray
+    coords: np.ndarray
+    offsets: np.ndarray
+    image_index: np.ndarray
+    kinds: np.ndarray
+    labels: np.ndarray
+    attributes: np.ndarray
+
+    @classmethod
+    def from_annotations(cls, images: Sequence[ImageAnnotations]) -> "PackedGeometry":
+        """Pack the geometry of ``images``."""
+        coords: List[Tuple[float, float]] = []
+        offsets = [0]
+        image_index: List[int] = []
+        kinds: List[int] = []
+        labels: List[str] = []
+        attributes: List[str] = []
+        for i, image in enumerate(images):
+            shapes = [
+                *((0, a, [a.point]) for a in image.points),
+                *((1, a, a.points) for a in image.polylines),
+                *((2, a, a.points) for a in image.polygons),
+            ]
+            for kind, annotation, points in shapes:
+                coords.extend((p.x, p.y) for p in points)
+                offsets.append(len(coords))
+                image_index.append(i)
+                kinds.append(kind)
+                labels.append(annotation.label)
+                attributes.append(json.dumps(annotation.attributes, ensure_ascii=False))
+        return cls(
+            names=[image.name for image in images],
+            ids=np.array([image.id for image in images], dtype=np.int64),
+            sizes=np.array([(image.width, image.height) for image in images], dtype=np.int64).reshape(-1, 2),
+            coords=np.array(coords, dtype=np.float64).reshape(-1, 2),
+            offsets=np.array(offsets, dtype=np.int64),
+            image_index=np.array(image_index, dtype=np.int64),
+            kinds=np.array(kinds, dtype=np.int8),
+            labels=np.array(labels, dtype=str),
+            attributes=np.array(attributes, dtype=str),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def point_image_index(self) -> np.ndarray:
+        """(P,) image index of every coordinate."""
+        return np.repeat(self.image_index, np.diff(self.offsets))
+
+    def transform(self, matrices: np.ndarray, image_size: Sequence[int]) -> "PackedGeometry":
+        """Copy with every image's coordinates mapped by its affine transform.
+
+        Args:
+            matrices: (N, 2, 3) transforms, one per image.
+            image_size: Target (height, width); the new coordinate frame.
+        """
+        matrices = np.asarray(matrices, dtype=np.float64)
+        if matrices.shape != (len(self), 2, 3):
+            raise ValueError(f"Expected matrices of shape ({len(self)}, 2, 3), got {matrices.shape}")
+        per_point = matrices[self.point_image_index()]
+        coords = np.einsum("pij,pj->pi", per_point[:, :, :2], self.coords) + per_point[:, :, 2]
+        sizes = np.tile(np.array([image_size[1], image_size[0]], dtype=np.int64), (len(self), 1))
+        return PackedGeometry(
+            names=list(self.names),
+            ids=self.ids.copy(),
+            sizes=sizes,
+            coords=coords,
+            offsets=self.offsets,
+            image_index=self.image_index,
+            kinds=self.kinds,
+            labels=self.labels,
+            attributes=self.attributes,
+        )
+
+    def to_annotations(self) -> List[ImageAnnotations]:
+        """Rebuild ``ImageAnnotations`` in the packed coordinate frames."""
+        images = [
+            ImageAnnotations(id=int(image_id), name=name, width=int(w), height=int(h))
+            for image_id, name, (w, h) in zip(self.ids, self.names, self.sizes)
+        ]
+        coords = self.coords.tolist()
+        for k, (i, kind, label, attrs) in enumerate(
+            zip(self.image_index.tolist(), self.kinds.tolist(), self.labels.tolist(), self.attributes.tolist())
+        ):
+            points = [Point(x, y) for x, y in coords[self.offsets[k]:self.offsets[k + 1]]]
+            attributes = json.loads(attrs)
+            if kind == 0:
+                images[i].points.append(PointAnnotation(label=label, point=points[0], attributes=attributes))
+            elif kind == 1:
+                images[i].polylines.append(PolylineAnnotation(label=label, points=points, attributes=attributes))
+            else:
+                images[i].polygons.append(PolygonAnnotation(label=label, points=points, attributes=attributes))
+        return images
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the arrays to an ``.npz`` file (no pickled objects)."""
+        path = Path(path)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                names=np.array(self.names, dtype=str),
+                ids=self.ids,
+                sizes=self.sizes,
+                coords=self.coords,
+                offsets=self.offsets,
+                image_index=self.image_index,
+                kinds=self.kinds,
+                labels=self.labels,
+                attributes=self.attributes,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PackedGeometry":
+        """Read a file written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                names=data["names"].tolist(),
+                ids=data["ids"],
+                sizes=data["sizes"].reshape(-1, 2),
+                coords=data["coords"].reshape(-1, 2),
+                offsets=data["offsets"],
+                image_index=data["image_index"],
+                kinds=data["kinds"],
+                labels=data["labels"],
+                attributes=data["attributes"],
+            )
+
+
+def transform_annotations(
+    images: Sequence[ImageAnnotations],
+    image_size: Sequence[int],
+    boxes: Optional[Sequence[Optional[Sequence[float]]]] = None,
+    letterbox: bool = True,
+) -> PackedGeometry:
+    """Pack ``images`` and map them into ``image_size`` outputs.
+
+    Uses each image's CVAT width/height as the source size, which must match
+    the image file (see ``validate_data.py --images-dir``).
+
+    Args:
+        images: Parsed annotations.
+        image_size: Target (height, width).
+        boxes: Optional crop box per image (None entries = whole image).
+        letterbox: Preserve the aspect ratio; False stretches to fill.
+    """
+    packed = PackedGeometry.from_annotations(images)
+    crop = None
+    if boxes is not None:
+        crop = np.array([
+            box if box is not None else (0, 0, w, h) for box, (w, h) in zip(boxes, packed.sizes.tolist())
+        ], dtype=np.float64).reshape(-1, 4)
+    matrices, _ = letterbox_matrices(packed.sizes, image_size, boxes=crop, letterbox=letterbox)
+    return packed.transform(matrices, image_size)
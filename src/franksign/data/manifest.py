@@ -0,0 +1,325 @@
+"""Persistent manifest of the raw image tree.
+
+Walking a large image tree (``rglob`` plus a ``stat`` per file) is slow,
+especially on network file systems. The manifest records every image once —
+relative path, file size, mtime, pixel dimensions and extracted patient_id —
+in a columnar JSON file that datasets and preprocessing read instead of
+re-walking the tree.
+
+``refresh`` walks directories in parallel and only re-reads image headers for
+files whose size or mtime changed. With ``quick=True`` it also skips listing
+and stat-ing files in directories whose own mtime is unchanged (files were
+neither added, removed nor renamed there), so a refresh of an unchanged tree
+costs one ``stat`` per directory. ``open`` runs such a quick refresh by
+default and rebuilds the manifest when it was built for another root.
+
+Example:
+    >>> manifest = ImageManifest.open("data/raw", "data/processed/image_manifest.json")
+    >>> stats = manifest.refresh()
+    >>> manifest.save()
+    >>> dataset = FrankSignDataset(manifest.paths())
+"""
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import json
+import logging
+import os
+
+from franksign.data.clinical_loader import extract_patient_id_from_image
+from franksign.data.preprocess import IMAGE_EXTENSIONS
+from franksign.data.image_header import read_image_header
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+MANIFEST_VERSION = "1"
+
+MANIFEST_COLUMNS = ("path", "size", "mtime_ns", "width", "height", "patient_id", "error")
+
+# (size, mtime_ns, width, height, patient_id, error)
+Entry = List[Any]
+
+# (directory mtime_ns, files as (rel_path, size, mtime_ns), subdirectories)
+_Listing = Tuple[int, List[Tuple[str, int, int]], List[str]]
+
+
+def same_root(a: Union[str, Path], b: Union[str, Path]) -> bool:
+    """True if two image roots name the same directory."""
+    return Path(a).resolve() == Path(b).resolve()
+
+
+def _parent(rel_path: str) -> str:
+    head, _, _ = rel_path.rpartition("/")
+    return head
+
+
+def _scan_dir(root: Path, rel_dir: str) -> _Listing:
+    """List one directory: its mtime, image files (with stat) and subdirectories."""
+    path = root / rel_dir if rel_dir else root
+    files: List[Tuple[str, int, int]] = []
+    subdirs: List[str] = []
+    prefix = f"{rel_dir}/" if rel_dir else ""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(prefix + entry.name)
+            elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file():
+                stat = entry.stat()
+                files.append((prefix + entry.name, stat.st_size, stat.st_mtime_ns))
+    return os.stat(path).st_mtime_ns, files, subdirs
+
+
+class ImageManifest:
+    """Image records for one root directory, keyed by relative POSIX path.
+
+    Attributes:
+        root: Image root directory.
+        path: Manifest file (None = in-memory only).
+        entries: Relative path -> [size, mtime_ns, width, height, patient_id, error].
+        dirs: Relative directory -> mtime_ns at the last refresh.
+    """
+
+    def __init__(self, root: Union[str, Path], path: Optional[Union[str, Path]] = None):
+        self.root = Path(root)
+        self.path = Path(path) if path is not None else None
+        self.entries: Dict[str, Entry] = {}
+        self.dirs: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path], root: Optional[Union[str, Path]] = None) -> "ImageManifest":
+        """Load a saved manifest.
+
+        Args:
+            path: Manifest file.
+            root: Expected image root; replaces the stored spelling of it
+                (e.g. relative vs absolute).
+
+        Raises:
+            ValueError: If the manifest has an unsupported version or was
+                built for a different root than ``root``.
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported image manifest version in {path}")
+        if root is not None and not same_root(root, data["root"]):
+            raise ValueError(f"Image manifest {path} was built for {data['root']}, not {root}")
+        manifest = cls(root if root is not None else data["root"], path)
+        columns = data["columns"]
+        manifest.entries = {
+            rel: list(values) for rel, *values in zip(*(columns[name] for name in MANIFEST_COLUMNS))
+        }
+        manifest.dirs = data.get("dirs", {})
+        return manifest
+
+    @classmethod
+    def open(
+        cls,
+        root: Union[str, Path],
+        path: Union[str, Path],
+        refresh: bool = True,
+        n_jobs: Optional[int] = None,
+    ) -> "ImageManifest":
+        """Load the manifest at ``path``, building (and saving) it if missing.
+
+        A manifest built for another root (e.g. after ``images_dir`` changed
+        with a fixed ``manifest_path``) or without entries is rebuilt for
+        ``root``. A manifest with no images is never written, and a saved
+        one whose images are all gone is deleted.
+
+        Args:
+            root: Image root directory.
+            path: Manifest file.
+            refresh: Quick-refresh an existing manifest (one ``stat`` per
+                unchanged directory) so new, removed and renamed images are
+                seen; it is saved only if something changed. False trusts
+                the file as is.
+            n_jobs: Worker threads for walking and header reads.
+
+        Raises:
+            FileNotFoundError: If ``root`` is not a directory.
+        """
+        if not Path(root).is_dir():
+            raise FileNotFoundError(f"Image directory {root} not found")
+        if Path(path).exists():
+            try:
+                manifest = cls.load(path, root)
+            except ValueError as exc:
+                logger.info("Rebuilding image manifest: %s", exc)
+            else:
+                if not manifest.entries:
+                    logger.info("Rebuilding empty image manifest %s", path)
+                elif not refresh:
+                    return manifest
+                else:
+                    dirs = dict(manifest.dirs)
+                    stats = manifest.refresh(n_jobs=n_jobs, quick=True)
+                    if not manifest.entries:
+                        Path(path).unlink()
+                    elif stats["added"] or stats["updated"] or stats["removed"] or manifest.dirs != dirs:
+                        manifest.save()
+                    return manifest
+        manifest = cls(root, path)
+        manifest.refresh(n_jobs=n_jobs)
+        if manifest.entries:
+            manifest.save()
+        return manifest
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, rel_path: object) -> bool:
+        return rel_path in self.entries
+
+    def relative_paths(self) -> List[str]:
+        """Sorted relative paths of all images."""
+        return sorted(self.entries)
+
+    def paths(self) -> List[Path]:
+        """Sorted absolute paths of all images."""
+        return [self.root / rel for rel in self.relative_paths()]
+
+    def get(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        """Record of one image as a dict (None if not in the manifest)."""
+        values = self.entries.get(rel_path)
+        if values is None:
+            return None
+        return dict(zip(MANIFEST_COLUMNS, [rel_path, *values]))
+
+    def to_frame(self) -> Any:
+        """Manifest as a pandas DataFrame (one row per image)."""
+        import pandas as pd
+
+        rels = self.relative_paths()
+        rows = [[rel, *self.entries[rel]] for rel in rels]
+        frame = pd.DataFrame(rows, columns=list(MANIFEST_COLUMNS))
+        for column in ("width", "height"):
+            frame[column] = frame[column].astype("Int64")
+        return frame
+
+    # --------------------------------------------------------
+    # Walking
+    # --------------------------------------------------------
+
+    def _walk(self, executor: ThreadPoolExecutor, quick: bool) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, int]]:
+        """Parallel breadth-first walk returning files (size, mtime) and dir mtimes."""
+        files_by_dir: Dict[str, List[str]] = {}
+        subdirs_by_dir: Dict[str, List[str]] = {}
+        if quick:
+            for rel in self.entries:
+                files_by_dir.setdefault(_parent(rel), []).append(rel)
+            for rel in self.dirs:
+                if rel:
+                    subdirs_by_dir.setdefault(_parent(rel), []).append(rel)
+
+        def visit(rel_dir: str) -> Tuple[bool, Any]:
+            if quick and rel_dir in self.dirs:
+                path = self.root / rel_dir if rel_dir else self.root
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    return False, None
+                if mtime == self.dirs[rel_dir]:
+                    return True, mtime
+            try:
+                return False, _scan_dir(self.root, rel_dir)
+            except (FileNotFoundError, NotADirectoryError):
+                return False, None
+
+        found: Dict[str, Tuple[int, int]] = {}
+        dirs: Dict[str, int] = {}
+        pending = {executor.submit(visit, ""): ""}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rel_dir = pending.pop(future)
+                unchanged, result = future.result()
+                if result is None:
+                    continue
+                if unchanged:
+                    dirs[rel_dir] = result
+                    for rel in files_by_dir.get(rel_dir, []):
+                        entry = self.entries[rel]
+                        found[rel] = (entry[0], entry[1])
+                    subdirs = subdirs_by_dir.get(rel_dir, [])
+                else:
+                    dirs[rel_dir], listed, subdirs = result
+                    for rel, size, mtime in listed:
+                        found[rel] = (size, mtime)
+                for sub in subdirs:
+                    pending[executor.submit(visit, sub)] = sub
+        return found, dirs
+
+    def refresh(self, n_jobs: Optional[int] = None, quick: bool = False) -> Dict[str, int]:
+        """Re-walk the tree and update changed entries.
+
+        Headers are read only for new files and files whose size or mtime
+        changed; entries for deleted files are dropped.
+
+        Args:
+            n_jobs: Worker threads (None = ThreadPoolExecutor default).
+            quick: Trust directories whose mtime is unchanged instead of
+                re-listing them. Misses in-place edits of existing files.
+
+        Returns:
+            Counts of ``added``, ``updated``, ``removed`` and ``unchanged`` images.
+        """
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            found, dirs = self._walk(executor, quick)
+
+            stale = [
+                rel for rel, (size, mtime) in found.items()
+                if rel not in self.entries or self.entries[rel][0] != size or self.entries[rel][1] != mtime
+            ]
+            headers = list(executor.map(lambda rel: read_image_header(self.root / rel), stale))
+
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": len(found) - len(stale)}
+        for rel in stale:
+            stats["updated" if rel in self.entries else "added"] += 1
+        removed = [rel for rel in self.entries if rel not in found]
+        stats["removed"] = len(removed)
+        for rel in removed:
+            del self.entries[rel]
+
+        for rel, header in zip(stale, headers):
+            size, mtime = found[rel]
+            self.entries[rel] = [
+                size,
+                mtime,
+                header["width"],
+                header["height"],
+                extract_patient_id_from_image(rel.rpartition("/")[2]),
+                header["error"],
+            ]
+        self.dirs = dirs
+        return stats
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Write the manifest atomically as columnar JSON.
+
+        Raises:
+            ValueError: If no path was given here or at construction.
+        """
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("No manifest path given")
+        rels = self.relative_paths()
+        columns: Dict[str, List[Any]] = {"path": rels}
+        for i, name in enumerate(MANIFEST_COLUMNS[1:]):
+            columns[name] = [self.entries[rel][i] for rel in rels]
+        data = {"version": MANIFEST_VERSION, "root": str(self.root), "columns": columns, "dirs": self.dirs}
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, target)
+        self.path = target
+        return target
+
+
+def manifest_paths(manifest: ImageManifest, names: Iterable[str]) -> List[Path]:
+    """Absolute paths of ``names`` (relative to the root) present in the manifest."""
+    return [manifest.root / name for name in names if name in manifest]
@@ -5,59 +5,561 @@ for future augmentation/normalization work.
 """
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+import math
+import os
+
+import numpy as np
 
 try:
     from PIL import Image
 except ImportError as exc:  # pragma: no cover - handled at runtime
     raise ImportError("Pillow is required for preprocessing.") from exc
 
+from franksign.data.letterbox import GEOMETRY_FILE, PackedGeometry, letterbox_matrices, transform_annotations
+
+if TYPE_CHECKING:
+    from franksign.data.cvat_parser import ImageAnnotations
+    from franksign.data.manifest import ImageManifest
+
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"})
+
+
+def load_resized(
+    path: str | Path,
+    image_size: Sequence[int],
+    draft: bool = False,
+    resample: Image.Resampling = Image.Resampling.BICUBIC,
+    box: Optional[Sequence[float]] = None,
+    letterbox: bool = False,
+    fill: Tuple[int, int, int] = (0, 0, 0),
+) -> Image.Image:
+    """Decode an image as RGB and resize it (or a crop of it) to (height, width).
+
+    With ``draft`` the JPEG decoder is asked for the smallest DCT scale
+    (1/2, 1/4 or 1/8) that is still at least ``image_size`` — over the crop
+    when ``box`` is given — so large photos are never decoded at full
+    resolution. Pixels then differ slightly from a full decode, so it is
+    opt-in. Other formats decode normally.
+
+    Args:
+        path: Image file.
+        image_size: Target (height, width).
+        draft: Use reduced-resolution JPEG decoding (faster, not
+            pixel-identical to a full decode).
+        resample: Resampling filter for the final resize.
+        box: Optional crop (x0, y0, x1, y1) in full-resolution pixels.
+        letterbox: Keep the aspect ratio: scale to fit and centre on a
+            ``fill`` canvas, as described by ``letterbox.letterbox_matrices``.
+        fill: Padding colour for ``letterbox``.
+
+    Returns:
+        RGB image of exactly ``image_size``.
+    """
+    height, width = int(image_size[0]), int(image_size[1])
+    content: Optional[List[int]] = None
+    with Image.open(path) as im:
+        full_width, full_height = im.size
+        if letterbox:
+            _, rects = letterbox_matrices(
+                [(full_width, full_height)], image_size, boxes=None if box is None else [box]
+            )
+            content = rects[0].tolist()
+            width, height = content[2] - content[0], content[3] - content[1]
+        if draft:
+            if box is None:
+                im.draft("RGB", (width, height))
+            else:
+                # Full-image size at which the crop is still >= the target
+                im.draft("RGB", (
+                    math.ceil(width * full_width / max(box[2] - box[0], 1)),
+                    math.ceil(height * full_height / max(box[3] - box[1], 1)),
+                ))
+        if box is not None:
+            sx, sy = im.size[0] / full_width, im.size[1] / full_height
+            box = (box[0] * sx, box[1] * sy, box[2] * sx, box[3] * sy)
+        resized = im.convert("RGB").resize((width, height), resample, box=box)
+    if content is None:
+        return resized
+    canvas = Image.new("RGB", (int(image_size[1]), int(image_size[0])), fill)
+    canvas.paste(resized, (content[0], content[1]))
+    return canvas
+
+
+# Bump when output encoding changes so incremental runs redo every image
+PREPROCESS_MANIFEST_VERSION = "1"
+
+PREPROCESS_MANIFEST = ".preprocess_manifest.json"
+
+# Store base name (``images.npy`` + ``images.index.json``) of packed output
+PACKED_STORE = "images"
+
+PREPROCESS_COLUMNS = ("path", "size", "mtime_ns", "content_hash", "settings")
+
+# Incremental runs checkpoint their manifest every this many images
+_SAVE_EVERY = 1000
+
+# (size, mtime_ns, content_hash or None, settings)
+_Record = List[Any]
+
+
+def preprocess_settings(
+    image_size: Sequence[int],
+    resample: Image.Resampling = Image.Resampling.BICUBIC,
+    draft: bool = False,
+    letterbox: bool = False,
+) -> str:
+    """Settings key recorded per output, e.g. ``"256x256/bicubic/full"``."""
+    mode = "draft" if draft else "full"
+    key = f"{int(image_size[0])}x{int(image_size[1])}/{Image.Resampling(resample).name.lower()}/{mode}"
+    return f"{key}/letterbox" if letterbox else key
+
+
+def file_hash(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """BLAKE2b-128 hex digest of a file's content."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PreprocessManifest:
+    """Provenance of preprocessed outputs, keyed by relative path.
+
+    Each output records its source's size, mtime, optional content hash and
+    the ``preprocess_settings`` it was produced with, so incremental runs
+    redo only new, changed or differently-configured images.
+
+    Attributes:
+        path: Manifest file.
+        entries: Relative path -> [size, mtime_ns, content_hash, settings].
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries: Dict[str, _Record] = {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PreprocessManifest":
+        """Load ``path``; a missing file or another version gives an empty manifest."""
+        manifest = cls(path)
+        if manifest.path.exists():
+            data = json.loads(manifest.path.read_text(encoding="utf-8"))
+            if data.get("version") == PREPROCESS_MANIFEST_VERSION:
+                columns = data["columns"]
+                manifest.entries = {
+                    rel: list(values)
+                    for rel, *values in zip(*(columns[name] for name in PREPROCESS_COLUMNS))
+                }
+        return manifest
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def save(self) -> None:
+        """Write the manifest atomically as columnar JSON."""
+        rels = sorted(self.entries)
+        columns: Dict[str, List[Any]] = {"path": rels}
+        for i, name in enumerate(PREPROCESS_COLUMNS[1:]):
+            columns[name] = [self.entries[rel][i] for rel in rels]
+        data = {"version": PREPROCESS_MANIFEST_VERSION, "columns": columns}
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class PreprocessConfig:
+    """Decoding and bookkeeping options of ``preprocess_images``/``preprocess_packed``."""
+    # Decoding
+    resample: Image.Resampling = Image.Resampling.BICUBIC
+    draft: bool = False
+    letterbox: bool = False
+
+    # Incremental runs
+    incremental: bool = False
+    hash_sources: bool = False
+
+    # Hardware
+    n_jobs: Optional[int] = 1
+
 
 def preprocess_images(
     input_dir: str | Path,
     output_dir: str | Path,
     image_size: Sequence[int] = (256, 256),
     overwrite: bool = False,
+    config: Optional[PreprocessConfig] = None,
+    manifest: Optional["ImageManifest"] = None,
+    annotations: Optional[Sequence["ImageAnnotations"]] = None,
+    progress: Optional[Callable[[int, int, Path], None]] = None,
+    errors: Optional[List[Tuple[Path, str]]] = None,
+    removed: Optional[List[Path]] = None,
 ) -> Tuple[int, int]:
     """Resize/copy images from ``input_dir`` to ``output_dir``.
 
+    Files that fail to decode or save are logged and reported through
+    ``errors`` instead of aborting the run; they count as neither processed
+    nor skipped, and an earlier output of theirs is deleted rather than left
+    stale. Outputs are written atomically, so an interrupted run never
+    leaves a truncated file that a later run would skip.
+
+    By default an existing output is skipped whatever its source. With
+    ``config.incremental`` a ``PreprocessManifest`` in ``output_dir``
+    records each output's source size/mtime and settings: only new, changed
+    or re-configured images are processed, and outputs whose source is gone
+    are deleted. Only outputs recorded in the manifest are pruned; other
+    files in ``output_dir`` (e.g. from earlier non-incremental runs) are
+    left alone. With ``manifest`` the source size/mtime come from the image
+    manifest, so no source is stat-ed.
+
+    With ``annotations`` the CVAT geometry is mapped into the output pixel
+    frame (letterboxed or stretched to match the images) and written as a
+    ``PackedGeometry`` to ``GEOMETRY_FILE`` in ``output_dir``, so masks and
+    features can be computed at the target size.
+
     Args:
         input_dir: Directory containing raw images.
         output_dir: Destination for processed images.
         image_size: Target (height, width) for resizing.
         overwrite: Overwrite existing files when True.
+        config: Decoding, incremental and worker options (defaults:
+            ``PreprocessConfig()``).
+        manifest: Optional ``ImageManifest`` of ``input_dir``; its images are
+            processed instead of walking the directory tree.
+        annotations: Optional CVAT annotations of the input images.
+        progress: Optional ``progress(done, total, path)`` callback, called
+            once per image in input order.
+        errors: Optional list that receives ``(path, message)`` per failed file.
+        removed: Optional list that receives deleted output paths (pruned or
+            stale after a failure).
 
     Returns:
         Tuple of (processed_count, skipped_count).
+
+    Raises:
+        FileNotFoundError: In incremental mode, if ``input_dir`` is missing
+            (which would otherwise prune every output).
     """
+    job, _ = _start(
+        input_dir, output_dir, image_size, overwrite, config, manifest, annotations, progress, errors, removed
+    )
+    return _preprocess_files(job)
 
+
+def preprocess_packed(
+    input_dir: str | Path,
+    output_dir: str | Path,
+    image_size: Sequence[int] = (256, 256),
+    overwrite: bool = False,
+    config: Optional[PreprocessConfig] = None,
+    manifest: Optional["ImageManifest"] = None,
+    annotations: Optional[Sequence["ImageAnnotations"]] = None,
+    line_thickness: int = 3,
+    progress: Optional[Callable[[int, int, Path], None]] = None,
+    errors: Optional[List[Tuple[Path, str]]] = None,
+    removed: Optional[List[Path]] = None,
+) -> Tuple[int, int]:
+    """Like ``preprocess_images``, but into one memory-mappable ``ImageStore``.
+
+    The store lives at ``{output_dir}/images`` with rows keyed by file name
+    and failed rows zero-filled. With ``annotations`` it also holds masks
+    rasterized from the transformed geometry (also saved to
+    ``GEOMETRY_FILE``); annotations are matched to rows by file name too,
+    and those matching no image are logged. Each run writes a new store;
+    incremental runs copy unchanged rows from the previous one.
+
+    Args:
+        input_dir, output_dir, image_size, overwrite, config, manifest,
+            annotations, progress, errors: As for ``preprocess_images``.
+        line_thickness: Frank Sign line thickness of the masks.
+        removed: Optional list that receives the paths (relative to
+            ``input_dir``) dropped from the store because their source is gone.
+
+    Returns:
+        Tuple of (processed_count, skipped_count).
+
+    Raises:
+        FileNotFoundError: In incremental mode, if ``input_dir`` is missing.
+        ValueError: If two images share a file name.
+    """
+    job, geometry = _start(
+        input_dir, output_dir, image_size, overwrite, config, manifest, annotations, progress, errors, removed
+    )
+    return _preprocess_packed(job, geometry, line_thickness)
+
+
+def _start(
+    input_dir: str | Path,
+    output_dir: str | Path,
+    image_size: Sequence[int],
+    overwrite: bool,
+    config: Optional[PreprocessConfig],
+    manifest: Optional["ImageManifest"],
+    annotations: Optional[Sequence["ImageAnnotations"]],
+    progress: Optional[Callable[[int, int, Path], None]],
+    errors: Optional[List[Tuple[Path, str]]],
+    removed: Optional[List[Path]],
+) -> Tuple["_PreprocessJob", Optional[PackedGeometry]]:
+    """List the sources, load the incremental record and write the geometry."""
+    config = config or PreprocessConfig()
     src = Path(input_dir)
+    if config.incremental and not src.is_dir():
+        raise FileNotFoundError(f"Input directory {src} not found")
     dst = Path(output_dir)
     dst.mkdir(parents=True, exist_ok=True)
 
-    processed = 0
-    skipped = 0
+    if manifest is not None:
+        image_paths: List[Path] = [src / rel for rel in manifest.relative_paths()]
+    else:
+        image_paths = list(_iter_images(src))
+    job = _PreprocessJob(
+        dst=dst,
+        paths=image_paths,
+        rels=[img_path.relative_to(src).as_posix() for img_path in image_paths],
+        size=(int(image_size[0]), int(image_size[1])),
+        settings=preprocess_settings(image_size, config.resample, config.draft, config.letterbox),
+        config=config,
+        overwrite=overwrite,
+        manifest=manifest,
+        record=PreprocessManifest.load(dst / PREPROCESS_MANIFEST) if config.incremental else None,
+        progress=progress,
+        errors=errors,
+        removed=removed,
+    )
 
-    for img_path in _iter_images(src):
-        rel_path = img_path.relative_to(src)
-        out_path = dst / rel_path
-        out_path.parent.mkdir(parents=True, exist_ok=True)
+    geometry = None
+    if annotations is not None:
+        geometry = transform_annotations(annotations, job.size, letterbox=config.letterbox)
+        geometry.save(dst / GEOMETRY_FILE)
+    return job, geometry
+
+
+@dataclass
+class _PreprocessJob:
+    """Settings and bookkeeping shared by the loose-file and packed modes."""
+
+    dst: Path
+    paths: List[Path]
+    rels: List[str]
+    size: Tuple[int, int]
+    settings: str
+    config: PreprocessConfig
+    overwrite: bool
+    manifest: Optional["ImageManifest"]
+    record: Optional[PreprocessManifest]
+    progress: Optional[Callable[[int, int, Path], None]]
+    errors: Optional[List[Tuple[Path, str]]]
+    removed: Optional[List[Path]]
+
+    def check(self, i: int, exists: bool) -> Tuple[bool, Optional[_Record]]:
+        """Whether image ``i``'s existing output can be kept, and its new record entry."""
+        if self.record is None:
+            return exists and not self.overwrite, None
+        rel = self.rels[i]
+        if self.manifest is not None:
+            size, mtime = self.manifest.entries[rel][:2]
+        else:
+            stat = self.paths[i].stat()
+            size, mtime = stat.st_size, stat.st_mtime_ns
+        entry: _Record = [size, mtime, None, self.settings]
+        old = self.record.entries.get(rel)
+        current = not self.overwrite and old is not None and old[3] == self.settings and exists
+        reuse = current and old[:2] == [size, mtime]
+        if not reuse and self.config.hash_sources:
+            entry[2] = file_hash(self.paths[i])
+            if current and old[2] == entry[2]:
+                self.record.entries[rel] = entry
+                reuse = True
+        return reuse, entry
+
+    def prune(self) -> List[str]:
+        """Drop record entries of sources that are gone; returns their relative paths."""
+        if self.record is None:
+            return []
+        listed = set(self.rels)
+        gone = [rel for rel in self.record.entries if rel not in listed]
+        for rel in gone:
+            del self.record.entries[rel]
+        return gone
+
+    @contextmanager
+    def decode(
+        self, todo: Sequence[Tuple[int, Optional[Path]]]
+    ) -> Iterator[Iterable[Tuple[Optional[np.ndarray], Optional[str]]]]:
+        """Results of ``_process_one`` for ``(image, output)`` pairs, in order."""
+        tasks = [
+            (self.paths[i], out_path, self.size, self.config.draft, self.config.resample, self.config.letterbox)
+            for i, out_path in todo
+        ]
+        if self.config.n_jobs == 1 or len(tasks) < 2:
+            yield map(_process_one, tasks)
+            return
+        workers = self.config.n_jobs or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            yield executor.map(_process_one, tasks, chunksize=max(1, min(len(tasks) // (workers * 4), 64)))
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def finish(self, i: int, entry: Optional[_Record], error: Optional[str]) -> bool:
+        """Record the outcome for image ``i``; True if it succeeded."""
+        rel = self.rels[i]
+        if error is None:
+            if self.record is not None:
+                self.record.entries[rel] = entry
+            return True
+        logger.warning("Failed to preprocess %s: %s", self.paths[i], error)
+        if self.errors is not None:
+            self.errors.append((self.paths[i], error))
+        if self.record is not None:
+            self.record.entries.pop(rel, None)
+        return False
 
-        if out_path.exists() and not overwrite:
+
+def _preprocess_files(job: _PreprocessJob) -> Tuple[int, int]:
+    """Write one resized image per source under ``job.dst`` (same relative path)."""
+    todo: List[Tuple[int, Path, Optional[_Record]]] = []
+    skipped = 0
+    for i, rel in enumerate(job.rels):
+        out_path = job.dst / rel
+        reuse, entry = job.check(i, out_path.exists())
+        if reuse:
             skipped += 1
             continue
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        todo.append((i, out_path, entry))
 
-        image = Image.open(img_path).convert("RGB")
-        image = image.resize((image_size[1], image_size[0]))
-        image.save(out_path)
-        processed += 1
+    for rel in job.prune():
+        (job.dst / rel).unlink(missing_ok=True)
+        if job.removed is not None:
+            job.removed.append(job.dst / rel)
 
+    processed = 0
+    try:
+        with job.decode([(i, out_path) for i, out_path, _ in todo]) as results:
+            for done, ((i, out_path, entry), (_, error)) in enumerate(zip(todo, results), start=1):
+                if job.finish(i, entry, error):
+                    processed += 1
+                elif out_path.exists():
+                    # A previous output of this source is stale now
+                    out_path.unlink()
+                    if job.removed is not None:
+                        job.removed.append(out_path)
+                if job.record is not None and done % _SAVE_EVERY == 0:
+                    job.record.save()
+                if job.progress is not None:
+                    job.progress(done, len(todo), job.paths[i])
+    finally:
+        if job.record is not None:
+            job.record.save()
     return processed, skipped
 
 
+def _preprocess_packed(
+    job: _PreprocessJob,
+    geometry: Optional[PackedGeometry],
+    line_thickness: int,
+) -> Tuple[int, int]:
+    """Write all images (and masks from ``geometry``) into one ``ImageStore``.
+
+    Rows and masks are both keyed by file name: CVAT names are matched on
+    their last path component, and annotations matching no row are logged.
+    """
+    from franksign.data.image_store import ImageStore, ImageStoreWriter, store_paths
+
+    names = [img_path.name for img_path in job.paths]
+    previous = None
+    if job.record is not None and store_paths(job.dst / PACKED_STORE)[1].exists():
+        previous = ImageStore(job.dst / PACKED_STORE)
+    writer = ImageStoreWriter(
+        job.dst / PACKED_STORE, names, job.paths, job.size, masks=geometry is not None, letterbox=job.config.letterbox,
+        resample=job.config.resample,
+    )
+
+    todo: List[Tuple[int, Optional[_Record]]] = []
+    skipped = 0
+    for i, name in enumerate(names):
+        exists = previous is not None and name in previous and name not in previous.errors
+        reuse, entry = job.check(i, exists)
+        if reuse:
+            writer.write(i, previous.get(name))
+            skipped += 1
+        else:
+            todo.append((i, entry))
+    previous = None
+
+    for rel in job.prune():
+        if job.removed is not None:
+            job.removed.append(Path(rel))
+
+    if geometry is not None:
+        from franksign.data.augmentation import rasterize_annotations
+
+        rows = {name: i for i, name in enumerate(names)}
+        unmatched = []
+        for image in geometry.to_annotations():
+            row = rows.get(PurePosixPath(image.name).name)
+            if row is None:
+                unmatched.append(image.name)
+            else:
+                writer.write_mask(row, rasterize_annotations(image, line_thickness=line_thickness))
+        if unmatched:
+            logger.warning(
+                "%d annotated images match no input image, e.g. %s", len(unmatched), ", ".join(unmatched[:5])
+            )
+
+    processed = 0
+    with job.decode([(i, None) for i, _ in todo]) as results:
+        for done, ((i, entry), (pixels, error)) in enumerate(zip(todo, results), start=1):
+            if job.finish(i, entry, error):
+                writer.write(i, pixels)
+                processed += 1
+            else:
+                writer.fail(i, error)
+            if job.progress is not None:
+                job.progress(done, len(todo), job.paths[i])
+    writer.close()
+    # The record describes the store, so it is saved only once the store is in place
+    if job.record is not None:
+        job.record.save()
+    return processed, skipped
+
+
+def _process_one(
+    task: Tuple[Path, Optional[Path], Tuple[int, int], bool, Image.Resampling, bool],
+) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """Resize one image to its output path, or return its pixels when packing.
+
+    Returns ``(pixels or None, error message or None)``.
+    """
+    img_path, out_path, image_size, draft, resample, letterbox = task
+    tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp") if out_path is not None else None
+    try:
+        image = load_resized(img_path, image_size, draft=draft, resample=resample, letterbox=letterbox)
+        if out_path is None:
+            return np.asarray(image, dtype=np.uint8), None
+        image.save(tmp, format=Image.registered_extensions().get(out_path.suffix.lower()))
+        os.replace(tmp, out_path)
+    except Exception as exc:  # noqa: BLE001 - any failure is reported per file
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+        return None, f"{type(exc).__name__}: {exc}"
+    return None, None
+
+
 def _iter_images(root: Path) -> Iterable[Path]:
-    exts = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"}
-    for path in root.rglob("*"):
-        if path.suffix.lower() in exts and path.is_file():
+    for path in sorted(root.rglob("*")):
+        if path.suffix.lower() in IMAGE_EXTENSIONS and path.is_file():
             yield path
@@ -0,0 +1,266 @@
+"""Fuzzy linking of image file names to clinical records.
+
+Images whose names don't fit the ``extract_patient_id_from_image`` patterns
+(e.g. "Doğukan Özkan.jpeg", "Bahri Tosun 1877674.jpeg") or whose ID is
+mistyped are linked by patient name and ID similarity.
+
+A blocking index keyed by normalized name tokens and ID prefixes restricts
+scoring to records that share at least one key with the image, so the cost
+grows with block sizes instead of images × patients.
+
+Example:
+    >>> linker = FuzzyLinker(clinical_df)
+    >>> candidates = linker.match(unmatched_images, n_jobs=4)
+    >>> candidates[candidates["rank"] == 1]
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+
+# ============================================================
+# CONSTANTS
+# ============================================================
+
+# Turkish letters that NFKD decomposition does not map to ASCII
+_TURKISH_MAP = str.maketrans({"ı": "i", "İ": "I"})
+
+# Minimum digits for a number in a file name to count as a patient ID
+MIN_ID_DIGITS = 4
+
+# Name tokens shorter than this are ignored (initials, suffix noise)
+MIN_TOKEN_LENGTH = 2
+
+# Output columns of FuzzyLinker.match
+CANDIDATE_COLUMNS = [
+    "image_name", "patient_id", "patient_name",
+    "name_score", "id_score", "score", "rank",
+]
+
+
+# ============================================================
+# NORMALIZATION
+# ============================================================
+
+def normalize_name(text: Any) -> List[str]:
+    """Normalize a person name into ASCII lowercase tokens.
+
+    Examples:
+        >>> normalize_name("ALİ KEMAL KARATAŞ")
+        ['ali', 'kemal', 'karatas']
+    """
+    if text is None or (isinstance(text, float) and pd.isna(text)):
+        return []
+
+    text = str(text).translate(_TURKISH_MAP)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return [tok for tok in re.split(r"[^a-z]+", text) if len(tok) >= MIN_TOKEN_LENGTH]
+
+
+def parse_image_name(image_name: str) -> Tuple[List[str], List[str]]:
+    """Split an image file name into name tokens and candidate IDs.
+
+    Returns:
+        Tuple of (normalized name tokens, digit runs of at least
+        ``MIN_ID_DIGITS`` digits).
+    """
+    stem = Path(image_name).stem
+    # Drop protocol suffixes like "_2" before collecting IDs
+    ids = [run for run in re.findall(r"\d+", re.sub(r"_\d{1,2}\b", "", stem))
+           if len(run) >= MIN_ID_DIGITS]
+    return normalize_name(re.sub(r"\d+", " ", stem)), ids
+
+
+def name_similarity(a: Sequence[str], b: Sequence[str]) -> float:
+    """Order-insensitive similarity of two token lists (0..1)."""
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, " ".join(sorted(a)), " ".join(sorted(b))).ratio()
+
+
+def id_similarity(image_ids: Sequence[str], patient_id: Optional[str]) -> float:
+    """Best similarity between any image ID and a patient ID (0..1)."""
+    if not image_ids or not patient_id:
+        return 0.0
+    return max(SequenceMatcher(None, i, patient_id).ratio() for i in image_ids)
+
+
+# ============================================================
+# LINKER
+# ============================================================
+
+class FuzzyLinker:
+    """Blocked fuzzy matcher between image names and clinical records.
+
+    Attributes:
+        id_prefix_len: Number of leading ID digits used as a blocking key.
+        max_block_size: Blocks larger than this (very common first names)
+            are not used for candidate generation.
+        name_weight: Weight of name similarity when both name and ID
+            scores are available (ID weight is ``1 - name_weight``).
+    """
+
+    def __init__(
+        self,
+        clinical_df: pd.DataFrame,
+        id_column: str = "patient_id",
+        name_column: str = "patient_name",
+        id_prefix_len: int = 4,
+        max_block_size: int = 200,
+        name_weight: float = 0.6,
+    ):
+        """Build the blocking index from clinical records.
+
+        Args:
+            clinical_df: Cleaned clinical data.
+            id_column: Column with normalized patient IDs.
+            name_column: Column with patient names (optional in the frame).
+            id_prefix_len: Leading ID digits used as a blocking key.
+            max_block_size: Skip blocking keys shared by more records.
+            name_weight: Weight of the name score in the combined score.
+        """
+        self.id_prefix_len = id_prefix_len
+        self.max_block_size = max_block_size
+        self.name_weight = name_weight
+
+        ids = clinical_df[id_column] if id_column in clinical_df.columns else None
+        names = clinical_df[name_column] if name_column in clinical_df.columns else None
+        n = len(clinical_df)
+
+        self._ids: List[Optional[str]] = [
+            None if ids is None or pd.isna(v) else str(v)
+            for v in (ids if ids is not None else [None] * n)
+        ]
+        self._raw_names: List[Optional[str]] = [
+            None if names is None or pd.isna(v) else str(v)
+            for v in (names if names is not None else [None] * n)
+        ]
+        self._names: List[List[str]] = [normalize_name(v) for v in self._raw_names]
+
+        self._index: Dict[str, List[int]] = {}
+        for i in range(n):
+            for key in self._blocking_keys(self._names[i], [self._ids[i]] if self._ids[i] else []):
+                self._index.setdefault(key, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _blocking_keys(self, tokens: Sequence[str], ids: Sequence[str]) -> Set[str]:
+        keys = {f"n:{tok}" for tok in tokens}
+        keys.update(f"i:{i[:self.id_prefix_len]}" for i in ids if len(i) >= self.id_prefix_len)
+        return keys
+
+    def candidates(self, image_name: str) -> Set[int]:
+        """Record indices sharing at least one usable blocking key."""
+        tokens, ids = parse_image_name(image_name)
+        found: Set[int] = set()
+        for key in self._blocking_keys(tokens, ids):
+            block = self._index.get(key)
+            if block and len(block) <= self.max_block_size:
+                found.update(block)
+        return found
+
+    def score_image(
+        self,
+        image_name: str,
+        top_k: int = 3,
+        min_score: float = 0.7,
+    ) -> List[Dict[str, Any]]:
+        """Score the blocked candidates of one image.
+
+        Returns:
+            Up to ``top_k`` candidate rows (dicts with ``CANDIDATE_COLUMNS``)
+            with ``score >= min_score``, best first.
+        """
+        tokens, ids = parse_image_name(image_name)
+        scored = []
+        for i in self.candidates(image_name):
+            name_score = name_similarity(tokens, self._names[i])
+            id_score = id_similarity(ids, self._ids[i])
+            if tokens and self._names[i] and ids and self._ids[i]:
+                score = self.name_weight * name_score + (1 - self.name_weight) * id_score
+            else:
+                score = max(name_score, id_score)
+            if score >= min_score:
+                scored.append((score, name_score, id_score, i))
+
+        scored.sort(key=lambda item: (-item[0], item[3]))
+        return [
+            {
+                "image_name": image_name,
+                "patient_id": self._ids[i],
+                "patient_name": self._raw_names[i],
+                "name_score": name_score,
+                "id_score": id_score,
+                "score": score,
+                "rank": rank,
+            }
+            for rank, (score, name_score, id_score, i) in enumerate(scored[:top_k], start=1)
+        ]
+
+    def match(
+        self,
+        image_names: Sequence[str],
+        top_k: int = 3,
+        min_score: float = 0.7,
+        n_jobs: Optional[int] = 1,
+    ) -> pd.DataFrame:
+        """Emit scored candidate matches for many images.
+
+        Args:
+            image_names: Image file names to link.
+            top_k: Candidates kept per image.
+            min_score: Minimum combined score for a candidate.
+            n_jobs: Worker processes (None = one per CPU, 1 = in-process).
+
+        Returns:
+            DataFrame with ``CANDIDATE_COLUMNS``, ordered by input image
+            then rank. Images without candidates are omitted.
+        """
+        names = list(dict.fromkeys(image_names))
+        if n_jobs == 1 or len(names) < 2:
+            rows = [row for name in names for row in self.score_image(name, top_k, min_score)]
+            return pd.DataFrame(rows, columns=CANDIDATE_COLUMNS)
+
+        n_workers = n_jobs or os.cpu_count() or 1
+        n_chunks = min(len(names), n_workers * 4)
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            chunks = [names[i::n_chunks] for i in range(n_chunks)]
+            results = list(executor.map(
+                _score_chunk, chunks, [top_k] * n_chunks, [min_score] * n_chunks
+            ))
+
+        by_image: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk_rows in results:
+            for row in chunk_rows:
+                by_image.setdefault(row["image_name"], []).append(row)
+        rows = [row for name in names for row in by_image.get(name, [])]
+        return pd.DataFrame(rows, columns=CANDIDATE_COLUMNS)
+
+
+# ============================================================
+# PROCESS POOL HELPERS
+# ============================================================
+
+_WORKER_LINKER: Optional[FuzzyLinker] = None
+
+
+def _init_worker(linker: FuzzyLinker) -> None:
+    global _WORKER_LINKER
+    _WORKER_LINKER = linker
+
+
+def _score_chunk(names: List[str], top_k: int, min_score: float) -> List[Dict[str, Any]]:
+    assert _WORKER_LINKER is not None
+    return [row for name in names for row in _WORKER_LINKER.score_image(name, top_k, min_score)]
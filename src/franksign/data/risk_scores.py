@@ -0,0 +1,271 @@
+"""Vectorized cardiovascular risk scores for the clinical cohort.
+
+Recomputes the spreadsheet ``framingham`` and ``ascvd`` values from raw
+fields for the whole cleaned frame in one pass over NumPy arrays:
+
+- Framingham general CVD 10-year risk (D'Agostino et al., 2008)
+- Pooled Cohort Equations 10-year ASCVD risk (Goff et al., 2013; white
+  equations, as the cohort has no race field)
+
+Scores are returned as percentages (0-100). ``hypertension`` is used as the
+treated-blood-pressure indicator. Rows with any missing input, an unknown
+gender or an age outside the equation's validated range get NaN.
+
+Example:
+    >>> df = ClinicalDataLoader("FS - AI - Sayfa1.csv").load()
+    >>> df = recompute_risk_scores(df)
+    >>> df[["framingham", "ascvd"]].describe()
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONSTANTS
+# ============================================================
+
+# Raw clinical columns required by both equations
+RISK_INPUT_COLUMNS = [
+    'age', 'gender', 'total_cholesterol', 'hdl', 'systolic_bp',
+    'smoking', 'diabetes', 'hypertension',
+]
+
+# Validated age ranges (inclusive)
+FRAMINGHAM_AGE_RANGE = (30, 74)
+ASCVD_AGE_RANGE = (40, 79)
+
+# Framingham 2008 general CVD coefficients per sex
+FRAMINGHAM_COEFFICIENTS: Dict[str, Dict[str, float]] = {
+    'M': {
+        'ln_age': 3.06117, 'ln_tc': 1.12370, 'ln_hdl': -0.93263,
+        'ln_sbp_untreated': 1.93303, 'ln_sbp_treated': 1.99881,
+        'smoker': 0.65451, 'diabetes': 0.57367,
+        'baseline_survival': 0.88936, 'mean_sum': 23.9802,
+    },
+    'F': {
+        'ln_age': 2.32888, 'ln_tc': 1.20904, 'ln_hdl': -0.70833,
+        'ln_sbp_untreated': 2.76157, 'ln_sbp_treated': 2.82263,
+        'smoker': 0.52873, 'diabetes': 0.69154,
+        'baseline_survival': 0.95012, 'mean_sum': 26.1931,
+    },
+}
+
+# Pooled Cohort Equations (white) coefficients per sex
+ASCVD_COEFFICIENTS: Dict[str, Dict[str, float]] = {
+    'M': {
+        'ln_age': 12.344, 'ln_age_sq': 0.0, 'ln_tc': 11.853, 'ln_age_ln_tc': -2.664,
+        'ln_hdl': -7.990, 'ln_age_ln_hdl': 1.769,
+        'ln_sbp_treated': 1.797, 'ln_sbp_untreated': 1.764,
+        'smoker': 7.837, 'ln_age_smoker': -1.795, 'diabetes': 0.658,
+        'baseline_survival': 0.9144, 'mean_sum': 61.18,
+    },
+    'F': {
+        'ln_age': -29.799, 'ln_age_sq': 4.884, 'ln_tc': 13.540, 'ln_age_ln_tc': -3.114,
+        'ln_hdl': -13.578, 'ln_age_ln_hdl': 3.149,
+        'ln_sbp_treated': 2.019, 'ln_sbp_untreated': 1.957,
+        'smoker': 7.574, 'ln_age_smoker': -1.665, 'diabetes': 0.661,
+        'baseline_survival': 0.9665, 'mean_sum': -29.18,
+    },
+}
+
+
+# ============================================================
+# INPUT ARRAYS
+# ============================================================
+
+@dataclass
+class RiskInputs:
+    """Risk equation inputs as float arrays plus a missing-value mask."""
+    age: np.ndarray
+    male: np.ndarray
+    female: np.ndarray
+    total_cholesterol: np.ndarray
+    hdl: np.ndarray
+    systolic_bp: np.ndarray
+    smoker: np.ndarray
+    diabetes: np.ndarray
+    bp_treated: np.ndarray
+    valid: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "RiskInputs":
+        """Extract arrays from a cleaned clinical frame.
+
+        Missing columns are treated as all-missing. ``valid`` is True where
+        every input is present, positive where a logarithm is taken, and
+        gender is 'M' or 'F'.
+        """
+        n = len(df)
+
+        def numeric(col: str) -> np.ndarray:
+            if col not in df.columns:
+                return np.full(n, np.nan)
+            return pd.to_numeric(df[col], errors='coerce').to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+
+        gender = (
+            df['gender'].astype(object).to_numpy()
+            if 'gender' in df.columns else np.full(n, None, dtype=object)
+        )
+        male = gender == 'M'
+        female = gender == 'F'
+
+        inputs = {
+            col: numeric(col)
+            for col in ['age', 'total_cholesterol', 'hdl', 'systolic_bp',
+                        'smoking', 'diabetes', 'hypertension']
+        }
+        valid = male | female
+        for values in inputs.values():
+            valid &= ~np.isnan(values)
+        for col in ['age', 'total_cholesterol', 'hdl', 'systolic_bp']:
+            valid &= np.nan_to_num(inputs[col]) > 0
+
+        return cls(
+            age=inputs['age'],
+            male=male,
+            female=female,
+            total_cholesterol=inputs['total_cholesterol'],
+            hdl=inputs['hdl'],
+            systolic_bp=inputs['systolic_bp'],
+            smoker=(inputs['smoking'] == 1).astype(np.float64),
+            diabetes=(inputs['diabetes'] == 1).astype(np.float64),
+            bp_treated=inputs['hypertension'] == 1,
+            valid=valid,
+        )
+
+    def log_terms(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Natural logs of age, TC, HDL and SBP (NaN where invalid)."""
+        def safe_log(values: np.ndarray) -> np.ndarray:
+            out = np.full(values.shape, np.nan)
+            np.log(values, out=out, where=self.valid)
+            return out
+
+        return (
+            safe_log(self.age),
+            safe_log(self.total_cholesterol),
+            safe_log(self.hdl),
+            safe_log(self.systolic_bp),
+        )
+
+
+def _sex_coefficients(inputs: RiskInputs, table: Dict[str, Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """Broadcast per-sex coefficients to per-row arrays."""
+    return {
+        key: np.where(inputs.male, table['M'][key], table['F'][key])
+        for key in table['M']
+    }
+
+
+def _survival_to_percent(linear_sum: np.ndarray, coef: Dict[str, np.ndarray]) -> np.ndarray:
+    return 100.0 * (1.0 - coef['baseline_survival'] ** np.exp(linear_sum - coef['mean_sum']))
+
+
+def _age_mask(inputs: RiskInputs, age_range: Tuple[int, int]) -> np.ndarray:
+    age = np.nan_to_num(inputs.age)
+    return inputs.valid & (age >= age_range[0]) & (age <= age_range[1])
+
+
+# ============================================================
+# RISK EQUATIONS
+# ============================================================
+
+def framingham_risk(inputs: RiskInputs, enforce_age_range: bool = True) -> np.ndarray:
+    """Framingham general CVD 10-year risk (%) for every row.
+
+    Args:
+        inputs: Extracted risk inputs.
+        enforce_age_range: Return NaN outside ``FRAMINGHAM_AGE_RANGE``.
+
+    Returns:
+        Float array of risks in percent, NaN where inputs are missing.
+    """
+    coef = _sex_coefficients(inputs, FRAMINGHAM_COEFFICIENTS)
+    ln_age, ln_tc, ln_hdl, ln_sbp = inputs.log_terms()
+
+    sbp_coef = np.where(inputs.bp_treated, coef['ln_sbp_treated'], coef['ln_sbp_untreated'])
+    linear_sum = (
+        coef['ln_age'] * ln_age
+        + coef['ln_tc'] * ln_tc
+        + coef['ln_hdl'] * ln_hdl
+        + sbp_coef * ln_sbp
+        + coef['smoker'] * inputs.smoker
+        + coef['diabetes'] * inputs.diabetes
+    )
+
+    mask = _age_mask(inputs, FRAMINGHAM_AGE_RANGE) if enforce_age_range else inputs.valid
+    return np.where(mask, _survival_to_percent(linear_sum, coef), np.nan)
+
+
+def ascvd_risk(inputs: RiskInputs, enforce_age_range: bool = True) -> np.ndarray:
+    """Pooled Cohort Equations 10-year ASCVD risk (%) for every row.
+
+    Args:
+        inputs: Extracted risk inputs.
+        enforce_age_range: Return NaN outside ``ASCVD_AGE_RANGE``.
+
+    Returns:
+        Float array of risks in percent, NaN where inputs are missing.
+    """
+    coef = _sex_coefficients(inputs, ASCVD_COEFFICIENTS)
+    ln_age, ln_tc, ln_hdl, ln_sbp = inputs.log_terms()
+
+    sbp_coef = np.where(inputs.bp_treated, coef['ln_sbp_treated'], coef['ln_sbp_untreated'])
+    linear_sum = (
+        coef['ln_age'] * ln_age
+        + coef['ln_age_sq'] * ln_age ** 2
+        + coef['ln_tc'] * ln_tc
+        + coef['ln_age_ln_tc'] * ln_age * ln_tc
+        + coef['ln_hdl'] * ln_hdl
+        + coef['ln_age_ln_hdl'] * ln_age * ln_hdl
+        + sbp_coef * ln_sbp
+        + coef['smoker'] * inputs.smoker
+        + coef['ln_age_smoker'] * ln_age * inputs.smoker
+        + coef['diabetes'] * inputs.diabetes
+    )
+
+    mask = _age_mask(inputs, ASCVD_AGE_RANGE) if enforce_age_range else inputs.valid
+    return np.where(mask, _survival_to_percent(linear_sum, coef), np.nan)
+
+
+# ============================================================
+# DATAFRAME API
+# ============================================================
+
+def recompute_risk_scores(
+    df: pd.DataFrame,
+    fill_only: bool = False,
+    enforce_age_range: bool = True,
+) -> pd.DataFrame:
+    """Recompute ``framingham`` and ``ascvd`` columns for the whole frame.
+
+    Args:
+        df: Cleaned clinical DataFrame.
+        fill_only: If True, keep existing non-null spreadsheet values and
+            only fill missing ones.
+        enforce_age_range: Return NaN outside each equation's age range.
+
+    Returns:
+        Copy of ``df`` with updated ``framingham`` and ``ascvd`` columns.
+    """
+    inputs = RiskInputs.from_dataframe(df)
+    scores = {
+        'framingham': framingham_risk(inputs, enforce_age_range),
+        'ascvd': ascvd_risk(inputs, enforce_age_range),
+    }
+
+    out = df.copy()
+    for col, values in scores.items():
+        if fill_only and col in out.columns:
+            existing = pd.to_numeric(out[col], errors='coerce').to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+            values = np.where(np.isnan(existing), values, existing)
+        out[col] = values
+    return out
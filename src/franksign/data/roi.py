@@ -0,0 +1,153 @@
+"""Earlobe region-of-interest crops.
+
+The Frank Sign lives on the earlobe, so training on a crop around it gives
+thin lines more pixels at the same input size. Crop boxes are derived from
+CVAT geometry:
+
+- ``landmarks``: ``earlobe_tip`` and the ``ear_outer_contour`` points below
+  the level of ``earlobe_attachment_point`` along the ear's long axis
+- ``region``: the ``franks_sign_region`` bounding box
+
+Any Frank Sign region or line is always inside the box, which is then padded
+by a margin, optionally squared, and clipped to the image. ``crop_annotations``
+shifts the geometry into crop coordinates so rasterized masks stay aligned.
+
+Example:
+    >>> box = earlobe_box(image, margin=0.15)
+    >>> cropped = crop_annotations(image, box)
+    >>> mask = rasterize_annotations(cropped, (256, 256))
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import List, Optional, Sequence, Tuple
+import math
+
+import numpy as np
+
+from franksign.data.cvat_parser import ImageAnnotations, Point
+
+
+# (x0, y0, x1, y1) in CVAT pixel coordinates, x1/y1 exclusive
+Box = Tuple[int, int, int, int]
+
+ROI_SOURCES = ("auto", "landmarks", "region")
+
+FRANK_SIGN_LABELS = ("franks_sign_region", "franks_sign_line")
+
+
+
+def _point(image: ImageAnnotations, label: str) -> Optional[np.ndarray]:
+    for annotation in image.points:
+        if annotation.label == label:
+            return annotation.point.to_array()
+    return None
+
+
+def _shape_points(image: ImageAnnotations, labels: Sequence[str]) -> List[np.ndarray]:
+    return [
+        shape.to_array()
+        for shape in (*image.polygons, *image.polylines)
+        if shape.label in labels and shape.points
+    ]
+
+
+def _landmark_points(image: ImageAnnotations) -> Optional[np.ndarray]:
+    """Earlobe outline: contour points below the attachment level, plus the tip.
+
+    "Below" is measured along the ear's long axis (``ear_top`` → tip, or the
+    image's vertical axis without ``ear_top``), since the attachment point is
+    often placed on the cheek rather than on the contour.
+    """
+    tip = _point(image, "earlobe_tip")
+    attachment = _point(image, "earlobe_attachment_point")
+    if tip is None or attachment is None:
+        return None
+    top = _point(image, "ear_top")
+    axis = tip - top if top is not None else np.array([0.0, 1.0])
+    if not np.any(axis):
+        axis = np.array([0.0, 1.0])
+    level = attachment @ axis
+
+    points = [tip[None, :]]
+    contours = _shape_points(image, ("ear_outer_contour",))
+    for contour in contours:
+        points.append(contour[contour @ axis >= level])
+    if not contours:
+        points.append(attachment[None, :])
+    return np.concatenate(points)
+
+
+def _fit(start: float, end: float, limit: int) -> Tuple[int, int]:
+    """Integer span covering [start, end], shifted (then clipped) into [0, limit]."""
+    size = min(end - start, limit)
+    start = min(max(start, 0.0), limit - size)
+    lo = max(int(math.floor(start)), 0)
+    hi = min(int(math.ceil(start + size)), limit)
+    return lo, max(hi, lo + 1)
+
+
+def earlobe_box(
+    image: ImageAnnotations,
+    margin: float = 0.15,
+    source: str = "auto",
+    square: bool = True,
+) -> Optional[Box]:
+    """Crop box around the earlobe.
+
+    Args:
+        image: Parsed CVAT annotations.
+        margin: Padding on every side as a fraction of the box's longer side.
+        source: "landmarks", "region", or "auto" (landmarks, else region).
+        square: Grow the shorter side to make a square box (no distortion
+            when resizing to a square input).
+
+    Returns:
+        (x0, y0, x1, y1) within the CVAT image, or None if the image lacks
+        the required annotations.
+
+    Raises:
+        ValueError: If ``source`` is unknown.
+    """
+    if source not in ROI_SOURCES:
+        raise ValueError(f"Unknown ROI source {source!r}; expected one of {ROI_SOURCES}")
+
+    frank_sign = _shape_points(image, FRANK_SIGN_LABELS)
+    lobe = _landmark_points(image) if source in ("auto", "landmarks") else None
+    if lobe is None and source in ("auto", "region"):
+        regions = _shape_points(image, ("franks_sign_region",))
+        lobe = np.concatenate(regions) if regions else None
+    if lobe is None:
+        return None
+
+    points = np.concatenate([lobe, *frank_sign])
+    (x_min, y_min), (x_max, y_max) = points.min(axis=0), points.max(axis=0)
+    pad = margin * max(x_max - x_min, y_max - y_min, 1.0)
+    x_min, y_min, x_max, y_max = x_min - pad, y_min - pad, x_max + pad, y_max + pad
+    if square:
+        side = max(x_max - x_min, y_max - y_min)
+        cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x_min, x_max, y_min, y_max = cx - side / 2, cx + side / 2, cy - side / 2, cy + side / 2
+
+    x0, x1 = _fit(x_min, x_max, image.width)
+    y0, y1 = _fit(y_min, y_max, image.height)
+    return x0, y0, x1, y1
+
+
+def crop_annotations(image: ImageAnnotations, box: Optional[Box]) -> ImageAnnotations:
+    """Copy of ``image`` in the coordinates of ``box`` (unchanged if None)."""
+    if box is None:
+        return image
+    x0, y0, x1, y1 = box
+
+    def shift(points: Sequence[Point]) -> List[Point]:
+        return [Point(p.x - x0, p.y - y0) for p in points]
+
+    return replace(
+        image,
+        width=x1 - x0,
+        height=y1 - y0,
+        points=[replace(a, point=shift([a.point])[0]) for a in image.points],
+        polylines=[replace(a, points=shift(a.points)) for a in image.polylines],
+        polygons=[replace(a, points=shift(a.points)) for a in image.polygons],
+    )
@@ -0,0 +1,256 @@
+"""Class-balanced sampling for segmentation training.
+
+Frank Sign positives are a minority of the images, so uniformly shuffled
+batches are dominated by negatives. Each sample is assigned to a group from
+its annotation label (``ImageAnnotations.has_frank_sign``) and its cached
+mask pixel counts (``FrankSignSegmentationDataset.mask_stats``), so no image
+is decoded:
+
+- ``frank_sign``: Frank Sign marked present, or any line pixels in the mask
+- ``no_frank_sign``: annotated earlobe region without a Frank Sign line
+- ``background``: empty mask
+
+Groups are then drawn with configurable shares, either independently per
+sample (``weighted_sampler``) or with a fixed per-batch composition
+(``BalancedBatchSampler``).
+
+Example:
+    >>> groups = sample_groups(dataset.annotations, dataset.mask_stats())
+    >>> sampler = BalancedBatchSampler(groups, batch_size=8, group_weights={"frank_sign": 0.5})
+    >>> loader = DataLoader(dataset, batch_sampler=sampler)
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+from torch.utils.data import Sampler, WeightedRandomSampler
+
+from franksign.data.cvat_parser import ImageAnnotations
+
+
+SAMPLE_GROUPS = ("frank_sign", "no_frank_sign", "background")
+
+DEFAULT_GROUP_WEIGHTS = {"frank_sign": 0.5, "no_frank_sign": 0.4, "background": 0.1}
+
+SAMPLER_TYPES = ("none", "weighted", "balanced")
+
+GroupWeights = Union[Mapping[str, float], Sequence[float]]
+
+
+def sample_groups(
+    annotations: Sequence[Union[ImageAnnotations, bool]],
+    mask_stats: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Group index (into ``SAMPLE_GROUPS``) per sample.
+
+    Args:
+        annotations: ``ImageAnnotations`` or plain Frank Sign flags.
+        mask_stats: Optional (N, 3) pixel counts (background, line, region).
+            Without them no sample is classed as background.
+
+    Returns:
+        int8 array of group indices.
+
+    Raises:
+        ValueError: If ``mask_stats`` does not have one row per sample.
+    """
+    positive = np.fromiter(
+        (a.has_frank_sign if isinstance(a, ImageAnnotations) else bool(a) for a in annotations),
+        dtype=bool,
+        count=len(annotations),
+    )
+    background = np.zeros_like(positive)
+    if mask_stats is not None:
+        stats = np.asarray(mask_stats)
+        if stats.shape != (len(positive), 3):
+            raise ValueError(f"mask_stats must have shape ({len(positive)}, 3), got {stats.shape}")
+        positive |= stats[:, 1] > 0
+        background = ~positive & (stats[:, 1:].sum(axis=1) == 0)
+    return np.where(positive, 0, np.where(background, 2, 1)).astype(np.int8)
+
+
+def group_shares(groups: np.ndarray, group_weights: Optional[GroupWeights] = None) -> np.ndarray:
+    """Normalized share per group; groups with no samples get 0.
+
+    Args:
+        groups: Group index per sample.
+        group_weights: Mapping from group name to weight (missing groups get
+            0) or one weight per ``SAMPLE_GROUPS`` entry. Defaults to
+            ``DEFAULT_GROUP_WEIGHTS``.
+
+    Raises:
+        ValueError: On unknown group names, negative weights, or if no
+            non-empty group has a positive weight.
+    """
+    if group_weights is None:
+        group_weights = DEFAULT_GROUP_WEIGHTS
+    if isinstance(group_weights, Mapping):
+        unknown = set(group_weights) - set(SAMPLE_GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown sample groups {sorted(unknown)}; expected {SAMPLE_GROUPS}")
+        weights = np.array([float(group_weights.get(g, 0.0)) for g in SAMPLE_GROUPS])
+    else:
+        weights = np.asarray(group_weights, dtype=np.float64)
+    if weights.shape != (len(SAMPLE_GROUPS),) or (weights < 0).any():
+        raise ValueError(f"group_weights must be {len(SAMPLE_GROUPS)} non-negative numbers")
+
+    weights = np.where(np.bincount(groups, minlength=len(SAMPLE_GROUPS)) > 0, weights, 0.0)
+    if weights.sum() <= 0:
+        raise ValueError("No sample group with a positive weight has any samples")
+    return weights / weights.sum()
+
+
+def sample_weights(groups: np.ndarray, group_weights: Optional[GroupWeights] = None) -> np.ndarray:
+    """Per-sample weights so that each group is drawn with its share.
+
+    A sample's weight is its group's share divided by the group size, so the
+    weights sum to 1.
+    """
+    groups = np.asarray(groups)
+    counts = np.bincount(groups, minlength=len(SAMPLE_GROUPS))
+    per_group = group_shares(groups, group_weights) / np.maximum(counts, 1)
+    return per_group[groups]
+
+
+def weighted_sampler(
+    groups: np.ndarray,
+    group_weights: Optional[GroupWeights] = None,
+    num_samples: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> WeightedRandomSampler:
+    """``WeightedRandomSampler`` drawing groups with the given shares.
+
+    Args:
+        groups: Group index per sample.
+        group_weights: See ``group_shares``.
+        num_samples: Samples per epoch (default: dataset size).
+        seed: Optional generator seed.
+    """
+    generator = None
+    if seed is not None:
+        import torch
+
+        generator = torch.Generator().manual_seed(seed)
+    return WeightedRandomSampler(
+        sample_weights(groups, group_weights).tolist(),
+        num_samples=num_samples if num_samples is not None else len(groups),
+        replacement=True,
+        generator=generator,
+    )
+
+
+class BalancedBatchSampler(Sampler[List[int]]):
+    """Batches with a fixed expected share of each group.
+
+    Each batch takes ``floor(batch_size * share)`` samples per group; the
+    remaining slots are drawn at random in proportion to the fractional
+    parts. Within a group, samples are taken from a shuffled permutation
+    that is reshuffled when exhausted, so every member is seen before any
+    repeats.
+
+    Args:
+        groups: Group index per sample (from ``sample_groups``).
+        batch_size: Samples per batch.
+        group_weights: See ``group_shares``.
+        num_batches: Batches per epoch (default: ``ceil(N / batch_size)``).
+        seed: Random seed; combined with the epoch set by ``set_epoch``.
+
+    Raises:
+        ValueError: If ``batch_size`` or ``num_batches`` is not positive.
+    """
+
+    def __init__(
+        self,
+        groups: np.ndarray,
+        batch_size: int,
+        group_weights: Optional[GroupWeights] = None,
+        num_batches: Optional[int] = None,
+        seed: int = 0,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.groups = np.asarray(groups)
+        self.batch_size = batch_size
+        self.shares = group_shares(self.groups, group_weights)
+        self.num_batches = num_batches if num_batches is not None else -(-len(self.groups) // batch_size)
+        if self.num_batches < 1:
+            raise ValueError("num_batches must be positive")
+        self.seed = seed
+        self.epoch = 0
+        self.members = [np.flatnonzero(self.groups == g) for g in range(len(SAMPLE_GROUPS))]
+
+    def set_epoch(self, epoch: int) -> None:
+        """Use a different draw for each epoch."""
+        self.epoch = epoch
+
+    def __len__(self) -> int:
+        return self.num_batches
+
+    def batch_counts(self, rng: np.random.Generator) -> np.ndarray:
+        """Samples per group for one batch."""
+        exact = self.batch_size * self.shares
+        counts = np.floor(exact).astype(np.int64)
+        left = self.batch_size - int(counts.sum())
+        if left:
+            fraction = exact - counts
+            counts += rng.multinomial(left, fraction / fraction.sum())
+        return counts
+
+    def __iter__(self) -> Iterator[List[int]]:
+        rng = np.random.default_rng((self.seed, self.epoch))
+        orders = [rng.permutation(m) for m in self.members]
+        positions = [0] * len(orders)
+
+        def take(group: int, count: int) -> List[int]:
+            taken: List[int] = []
+            while len(taken) < count:
+                if positions[group] == len(orders[group]):
+                    orders[group] = rng.permutation(self.members[group])
+                    positions[group] = 0
+                end = min(positions[group] + count - len(taken), len(orders[group]))
+                taken.extend(orders[group][positions[group]:end].tolist())
+                positions[group] = end
+            return taken
+
+        for _ in range(self.num_batches):
+            batch: List[int] = []
+            for group, count in enumerate(self.batch_counts(rng)):
+                batch.extend(take(group, int(count)))
+            rng.shuffle(batch)
+            yield batch
+
+
+def sampler_from_config(
+    config: Dict[str, Any],
+    annotations: Sequence[ImageAnnotations],
+    mask_stats: Optional[np.ndarray] = None,
+) -> Optional[Sampler]:
+    """Build the sampler configured under ``training.sampler``.
+
+    Returns a ``BalancedBatchSampler`` (pass as ``batch_sampler``), a
+    ``WeightedRandomSampler`` (pass as ``sampler``) or None for type "none".
+
+    Raises:
+        ValueError: If the sampler type is unknown.
+    """
+    training = config.get("training", {})
+    settings = training.get("sampler") or {}
+    kind = settings.get("type", "none")
+    if kind not in SAMPLER_TYPES:
+        raise ValueError(f"Unknown sampler type {kind!r}; expected one of {SAMPLER_TYPES}")
+    if kind == "none":
+        return None
+
+    groups = sample_groups(annotations, mask_stats)
+    group_weights = settings.get("group_weights")
+    seed = config.get("experiment", {}).get("seed", 0)
+    if kind == "weighted":
+        return weighted_sampler(groups, group_weights, num_samples=settings.get("num_samples"), seed=seed)
+    return BalancedBatchSampler(
+        groups,
+        batch_size=training.get("batch_size", 8),
+        group_weights=group_weights,
+        num_batches=settings.get("num_batches"),
+        seed=seed,
+    )
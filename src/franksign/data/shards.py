@@ -0,0 +1,349 @@
+"""Sharded sequential-read dataset format.
+
+Samples are packed into fixed-size tar shards. Each sample is three
+consecutive members sharing a key:
+
+- ``<key>.jpg`` / ``.png`` / ...: the image (original bytes, or a resized
+  JPEG when ``image_size`` is given)
+- ``<key>.mask.png``: the 3-class mask from ``rasterize_annotations``
+- ``<key>.json``: metadata (image name, patient_id, labels, has_frank_sign,
+  clinical record)
+
+The key is the sample's position in the packed annotations. An
+``index.json`` lists the shards with their keys and sample counts, and the
+images that could not be read (skipped, with the error message).
+``ShardedSegmentationDataset`` streams shards with one sequential read each,
+assigning whole shards to DataLoader workers and mixing samples through a
+shuffle buffer, so an epoch is a few large reads instead of one small file
+open per sample.
+
+Example:
+    >>> pack_shards("data/raw", project.images, "data/processed/shards/train",
+    ...             image_size=(256, 256), clinical_df=clinical_df)
+    >>> dataset = ShardedSegmentationDataset("data/processed/shards/train", shuffle_buffer=512)
+    >>> loader = DataLoader(dataset, batch_size=8, num_workers=4)
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import io
+import json
+import math
+import os
+import random
+import tarfile
+
+import numpy as np
+
+try:
+    from torch.utils.data import IterableDataset, get_worker_info
+except ImportError as exc:  # pragma: no cover - handled at runtime
+    raise ImportError(
+        "torch is required for sharded datasets. Install dependencies from pyproject.toml."
+    ) from exc
+
+try:
+    from PIL import Image
+except ImportError as exc:  # pragma: no cover - handled at runtime
+    raise ImportError("Pillow is required for sharded datasets.") from exc
+
+from franksign.data.augmentation import rasterize_annotations
+from franksign.data.clinical_loader import extract_patient_id_from_image
+from franksign.data.cvat_parser import ImageAnnotations
+from franksign.data.dataset import to_segmentation_tensors
+from franksign.data.image_store import decode_resized
+
+
+# Bump when the shard layout changes
+SHARD_FORMAT_VERSION = "1"
+
+SHARD_INDEX_NAME = "index.json"
+
+# JPEG quality for images re-encoded at a target size
+RESIZED_JPEG_QUALITY = 95
+
+
+# ============================================================
+# PACKING
+# ============================================================
+
+def _jsonable(value: Any) -> Any:
+    """Convert pandas/NumPy scalars to JSON-safe Python values (NaN -> None)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    try:
+        import pandas as pd
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _clinical_lookup(clinical_df: Any) -> Dict[str, Dict[str, Any]]:
+    """Patient ID -> JSON-safe clinical record (first row per ID wins)."""
+    lookup: Dict[str, Dict[str, Any]] = {}
+    if clinical_df is None or "patient_id" not in clinical_df.columns:
+        return lookup
+    ids = clinical_df["patient_id"].astype(str).tolist()
+    for pid, record in zip(ids, clinical_df.to_dict("records")):
+        if pid not in lookup:
+            lookup[pid] = {k: _jsonable(v) for k, v in record.items()}
+    return lookup
+
+
+def _add_member(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _encode_png(mask: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(mask.astype(np.uint8)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _image_member(path: Path, image_size: Optional[Tuple[int, int]]) -> Tuple[str, bytes]:
+    """(extension, bytes) for a sample image."""
+    if image_size is None:
+        return path.suffix.lower().lstrip(".") or "jpg", path.read_bytes()
+    buffer = io.BytesIO()
+    Image.fromarray(decode_resized(path, image_size)).save(buffer, format="JPEG", quality=RESIZED_JPEG_QUALITY)
+    return "jpg", buffer.getvalue()
+
+
+def pack_shards(
+    images_dir: Union[str, Path],
+    annotations: Sequence[ImageAnnotations],
+    output_dir: Union[str, Path],
+    samples_per_shard: int = 1000,
+    image_size: Optional[Sequence[int]] = None,
+    clinical_df: Any | None = None,
+    line_thickness: int = 3,
+    prefix: str = "shard",
+) -> Dict[str, Any]:
+    """Pack images, masks and metadata into tar shards plus ``index.json``.
+
+    Args:
+        images_dir: Directory CVAT image names are relative to.
+        annotations: Parsed annotations, one per sample (shard order).
+        output_dir: Directory for ``{prefix}-00000.tar``... and the index.
+        samples_per_shard: Samples per shard (the last one may be smaller).
+        image_size: Optional target (height, width). Images are then resized
+            and re-encoded as JPEG and masks rasterized at this size;
+            otherwise original image bytes and CVAT-size masks are stored.
+        clinical_df: Optional clinical data; linked records go in metadata.
+        line_thickness: Frank Sign line thickness for the masks.
+        prefix: Shard file name prefix.
+
+    Images that fail to decode (or whose annotations cannot be rasterized)
+    are skipped and listed in the index's ``errors``. Each shard is written
+    to a temporary file and renamed, so no partial shard is left behind.
+
+    Returns:
+        The index dict that was written.
+
+    Raises:
+        ValueError: If ``samples_per_shard`` is not positive.
+    """
+    if samples_per_shard < 1:
+        raise ValueError("samples_per_shard must be positive")
+
+    images_dir = Path(images_dir)
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    size = (int(image_size[0]), int(image_size[1])) if image_size is not None else None
+    clinical = _clinical_lookup(clinical_df)
+
+    shards: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    for start in range(0, len(annotations), samples_per_shard):
+        shard_name = f"{prefix}-{len(shards):05d}.tar"
+        tmp_path = out / f"{shard_name}.tmp"
+        keys: List[str] = []
+        try:
+            with tarfile.open(tmp_path, "w") as tar:
+                for offset, image in enumerate(annotations[start:start + samples_per_shard]):
+                    key = f"{start + offset:08d}"
+                    try:
+                        ext, image_bytes = _image_member(images_dir / image.name, size)
+                        mask = rasterize_annotations(image, size, line_thickness=line_thickness)
+                    except (OSError, ValueError, SyntaxError) as exc:
+                        errors[image.name] = str(exc)
+                        continue
+                    patient_id = extract_patient_id_from_image(image.name)
+                    meta = {
+                        "image_name": image.name,
+                        "patient_id": patient_id,
+                        "labels": sorted({shape.label for shape in image.all_annotations}),
+                        "has_frank_sign": image.has_frank_sign,
+                        "clinical_record": clinical.get(patient_id) if patient_id else None,
+                    }
+                    _add_member(tar, f"{key}.{ext}", image_bytes)
+                    _add_member(tar, f"{key}.mask.png", _encode_png(mask))
+                    _add_member(tar, f"{key}.json", json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+                    keys.append(key)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        if not keys:
+            tmp_path.unlink()
+            continue
+        os.replace(tmp_path, out / shard_name)
+        shards.append({"path": shard_name, "samples": len(keys), "keys": keys})
+
+    index = {
+        "version": SHARD_FORMAT_VERSION,
+        "image_size": list(size) if size is not None else None,
+        "samples": sum(shard["samples"] for shard in shards),
+        "shards": shards,
+        "errors": errors,
+    }
+    tmp_index = out / f"{SHARD_INDEX_NAME}.tmp"
+    tmp_index.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_index, out / SHARD_INDEX_NAME)
+    return index
+
+
+def read_shard_index(shard_dir: Union[str, Path]) -> Dict[str, Any]:
+    """Load and version-check ``index.json`` of a shard directory.
+
+    Raises:
+        ValueError: If the index has an unsupported version.
+    """
+    index = json.loads((Path(shard_dir) / SHARD_INDEX_NAME).read_text(encoding="utf-8"))
+    if index.get("version") != SHARD_FORMAT_VERSION:
+        raise ValueError(f"Unsupported shard format version in {shard_dir}")
+    return index
+
+
+# ============================================================
+# STREAMING
+# ============================================================
+
+def iter_shard_samples(shard_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Stream raw samples from one shard with a single sequential read.
+
+    Yields:
+        Dicts mapping member suffix ("jpg", "mask.png", "json") to bytes,
+        plus the sample key under ``"__key__"``.
+    """
+    with tarfile.open(shard_path, "r|") as tar:
+        current_key: Optional[str] = None
+        sample: Dict[str, Any] = {}
+        for member in tar:
+            if not member.isfile():
+                continue
+            key, _, suffix = member.name.partition(".")
+            if key != current_key and sample:
+                yield sample
+                sample = {}
+            current_key = key
+            sample["__key__"] = key
+            sample[suffix] = tar.extractfile(member).read()
+        if sample:
+            yield sample
+
+
+def shuffle_buffer(samples: Iterator[Any], size: int, rng: random.Random) -> Iterator[Any]:
+    """Approximately shuffle a stream using a fixed-size buffer."""
+    if size <= 1:
+        yield from samples
+        return
+    buffer: List[Any] = []
+    for sample in samples:
+        if len(buffer) < size:
+            buffer.append(sample)
+            continue
+        i = rng.randrange(size)
+        yield buffer[i]
+        buffer[i] = sample
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+class ShardedSegmentationDataset(IterableDataset):
+    """Stream image/mask samples from tar shards.
+
+    Each DataLoader worker reads a disjoint subset of shards (whole shards,
+    sequentially). With ``shuffle_buffer > 1`` the shard order is reshuffled
+    every epoch (call ``set_epoch``) and samples are mixed through a buffer of
+    that many decoded-on-demand samples.
+
+    Yields ``{"image", "mask", "index"}`` dicts like
+    ``FrankSignSegmentationDataset``, where ``index`` is the sample's
+    position in the annotations given to ``pack_shards``; ``"meta"`` (with
+    the image name) is added when ``include_meta`` is set (metadata may
+    contain None, so use a custom ``collate_fn``).
+
+    Args:
+        shard_dir: Directory written by ``pack_shards``.
+        shuffle_buffer: Shuffle buffer size (0 or 1 = read in order).
+        seed: Base seed for shard order and buffer shuffling.
+        transform: Optional albumentations-style ``transform(image=, mask=)``.
+        include_meta: Also yield the decoded metadata dict.
+    """
+
+    def __init__(
+        self,
+        shard_dir: Union[str, Path],
+        shuffle_buffer: int = 0,
+        seed: int = 0,
+        transform: Optional[Callable[..., Dict[str, Any]]] = None,
+        include_meta: bool = False,
+    ) -> None:
+        super().__init__()
+        self.shard_dir = Path(shard_dir)
+        self.index = read_shard_index(self.shard_dir)
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.transform = transform
+        self.include_meta = include_meta
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        return int(self.index["samples"])
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch used to reshuffle shard order."""
+        self.epoch = epoch
+
+    def worker_shards(self, worker_id: int = 0, num_workers: int = 1) -> List[Path]:
+        """Shards read by one worker this epoch."""
+        shards = [self.shard_dir / shard["path"] for shard in self.index["shards"]]
+        if self.shuffle_buffer > 1:
+            random.Random(self.seed + self.epoch).shuffle(shards)
+        return shards[worker_id::num_workers]
+
+    def _decode(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        image_suffix = next(s for s in raw if s not in ("__key__", "mask.png", "json"))
+        with Image.open(io.BytesIO(raw[image_suffix])) as im:
+            image = np.array(im.convert("RGB"), dtype=np.uint8)
+        with Image.open(io.BytesIO(raw["mask.png"])) as im:
+            mask = np.array(im, dtype=np.uint8)
+        meta = json.loads(raw["json"])
+
+        image_t, mask_t = to_segmentation_tensors(image, mask, self.transform)
+        sample: Dict[str, Any] = {"image": image_t, "mask": mask_t, "index": int(raw["__key__"])}
+        if self.include_meta:
+            sample["meta"] = meta
+        return sample
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        info = get_worker_info()
+        worker_id, num_workers = (info.id, info.num_workers) if info is not None else (0, 1)
+        rng = random.Random(hash((self.seed, self.epoch, worker_id)))
+
+        def raw_samples() -> Iterator[Dict[str, Any]]:
+            for shard in self.worker_shards(worker_id, num_workers):
+                yield from iter_shard_samples(shard)
+
+        # Buffer raw bytes so only samples actually yielded get decoded
+        for raw in shuffle_buffer(raw_samples(), self.shuffle_buffer, rng):
+            yield self._decode(raw)
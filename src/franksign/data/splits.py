@@ -0,0 +1,147 @@
+"""Patient-level stratified train/val/test splits.
+
+Images are grouped by the patient ID extracted from their file name, so all
+images of a patient land in the same split, and patients are stratified on
+Frank Sign presence (a patient is positive if any of their images is).
+Assignment is vectorized with NumPy and depends only on the seed and the set
+of images, not on their order.
+
+Splits are written as ``{splits_dir}/{train,val,test}.txt`` (one image name
+per line) plus a ``splits.json`` summary; datasets read them with
+``from_config(config, split="train")``.
+
+Example:
+    >>> codes = assign_patient_splits(names, has_frank_sign, ratios=(0.7, 0.15, 0.15), seed=42)
+    >>> write_splits("data/splits", names, codes, has_frank_sign, seed=42)
+    >>> train_names = load_split("data/splits", "train")
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+import json
+
+import numpy as np
+
+from franksign.data.clinical_loader import extract_patient_id_from_image
+
+
+SPLIT_NAMES = ("train", "val", "test")
+
+SPLIT_MANIFEST = "splits.json"
+
+
+def patient_groups(image_names: Sequence[str]) -> np.ndarray:
+    """Patient key per image; images without a parseable ID form their own group."""
+    keys = []
+    for name in image_names:
+        patient_id = extract_patient_id_from_image(name)
+        keys.append(f"id:{patient_id}" if patient_id else f"image:{name}")
+    return np.asarray(keys, dtype=object)
+
+
+def assign_patient_splits(
+    image_names: Sequence[str],
+    has_frank_sign: Sequence[bool],
+    ratios: Sequence[float] = (0.70, 0.15, 0.15),
+    seed: int = 42,
+) -> np.ndarray:
+    """Assign each image to a split, keeping patients together.
+
+    Within each stratum (patients with / without Frank Sign) patients are
+    shuffled and laid out end to end by image count; a patient goes to the
+    split whose share of the stratum's images contains the patient's
+    midpoint, so image-level ratios are matched as closely as whole patients
+    allow.
+
+    Args:
+        image_names: Image file names.
+        has_frank_sign: Frank Sign presence per image.
+        ratios: (train, val, test) ratios; normalized to sum to 1.
+        seed: Random seed.
+
+    Returns:
+        int8 array of indices into ``SPLIT_NAMES``, one per image.
+
+    Raises:
+        ValueError: If lengths differ or ratios are negative or all zero.
+    """
+    if len(image_names) != len(has_frank_sign):
+        raise ValueError("image_names and has_frank_sign must have the same length")
+    weights = np.asarray(ratios, dtype=np.float64)
+    if weights.shape != (len(SPLIT_NAMES),) or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError(f"ratios must be {len(SPLIT_NAMES)} non-negative numbers with a positive sum")
+    bounds = np.cumsum(weights / weights.sum())[:-1]
+
+    # Sorted unique keys make the result independent of input order
+    _, group = np.unique(patient_groups(image_names), return_inverse=True)
+    group = group.ravel()
+    sizes = np.bincount(group)
+    positive = np.bincount(group, weights=np.asarray(has_frank_sign, dtype=np.float64), minlength=len(sizes)) > 0
+
+    rng = np.random.default_rng(seed)
+    group_split = np.empty(len(sizes), dtype=np.int8)
+    for stratum in (False, True):
+        members = rng.permutation(np.flatnonzero(positive == stratum))
+        if not len(members):
+            continue
+        counts = sizes[members]
+        midpoints = (np.cumsum(counts) - counts / 2) / counts.sum()
+        group_split[members] = np.searchsorted(bounds, midpoints, side="right")
+    return group_split[group]
+
+
+def write_splits(
+    splits_dir: Union[str, Path],
+    image_names: Sequence[str],
+    codes: np.ndarray,
+    has_frank_sign: Optional[Sequence[bool]] = None,
+    seed: Optional[int] = None,
+    ratios: Optional[Sequence[float]] = None,
+) -> Dict[str, Any]:
+    """Write ``{split}.txt`` index files and a ``splits.json`` summary.
+
+    Args:
+        splits_dir: Output directory.
+        image_names: Image file names.
+        codes: Split index per image (from ``assign_patient_splits``).
+        has_frank_sign: Optional Frank Sign presence per image for the summary.
+        seed: Seed recorded in the summary.
+        ratios: Ratios recorded in the summary.
+
+    Returns:
+        The summary that was written.
+    """
+    out = Path(splits_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    names = np.asarray(image_names, dtype=object)
+    groups = patient_groups(image_names)
+    positive = np.asarray(has_frank_sign, dtype=bool) if has_frank_sign is not None else None
+
+    summary: Dict[str, Any] = {
+        "seed": seed,
+        "ratios": list(ratios) if ratios is not None else None,
+        "splits": {},
+    }
+    for code, split in enumerate(SPLIT_NAMES):
+        mask = codes == code
+        selected = sorted(names[mask].tolist())
+        (out / f"{split}.txt").write_text("".join(f"{name}\n" for name in selected), encoding="utf-8")
+        stats = {"images": len(selected), "patients": len(set(groups[mask].tolist()))}
+        if positive is not None:
+            stats["frank_sign"] = int(positive[mask].sum())
+        summary["splits"][split] = stats
+    (out / SPLIT_MANIFEST).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return summary
+
+
+def load_split(splits_dir: Union[str, Path], split: str) -> List[str]:
+    """Image names of one split.
+
+    Raises:
+        FileNotFoundError: If the split file does not exist.
+    """
+    path = Path(splits_dir) / f"{split}.txt"
+    if not path.exists():
+        raise FileNotFoundError(f"Split file {path} not found. Run scripts/make_splits.py first.")
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if line]
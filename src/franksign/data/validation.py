@@ -2,17 +2,31 @@
 
 - Clinical validation uses Pandera to enforce basic schema checks.
 - CVAT validation performs lightweight structural checks (labels and geometry).
+- Cross-source checks compare CVAT annotations with the linked clinical rows.
+- Image integrity checks read only file headers to catch missing/corrupt files.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+import hashlib
+import json
+import os
+import time
 
+import numpy as np
+import pandas as pd
 import pandera as pa
 from pandera.typing import DataFrame, Series
 
-from franksign.data.cvat_parser import CVATProject, ImageAnnotations
+from franksign.data.clinical_loader import extract_patient_id_from_image
+from franksign.data.cvat_parser import CVATParser, CVATProject, ImageAnnotations
 from franksign.data.geometric_features import calculate_arc_length, calculate_polygon_area
+from franksign.data.image_header import read_image_header
 
 
 # Expected labels from docs/data_schema.md
@@ -41,6 +55,15 @@ REQUIRED_LABELS = {
 MIN_POLYLINE_LENGTH_PX = 5.0
 MIN_POLYGON_AREA_PX2 = 10.0
 
+# Polygons with at most this many edges are checked with all-pairs NumPy
+SMALL_POLYGON_EDGES = 64
+
+# Max intersecting edge pairs listed in a validation message
+MAX_REPORTED_EDGE_PAIRS = 5
+
+# Bump when per-image checks change so cached results are invalidated
+IMAGE_CHECKS_VERSION = "2"
+
 
 class ClinicalSchema(pa.DataFrameModel):
     """Minimal clinical schema (extend as production data grows)."""
@@ -65,6 +88,84 @@ class ClinicalSchema(pa.DataFrameModel):
 class ValidationIssue:
     level: str  # e.g., "warning" or "error"
     message: str
+    code: str = ""  # machine-readable issue type, e.g. "fs_mismatch"
+    image_name: str = ""
+    image_id: Optional[int] = None
+    label: str = ""  # annotation label the issue refers to
+    value: Optional[float] = None  # measured metric (length, area, count, ...)
+    threshold: Optional[float] = None  # limit the metric was compared with
+
+
+def image_geometry_hash(image: ImageAnnotations) -> str:
+    """Stable hash of everything the per-image checks look at.
+
+    Covers the image ID and name (both are copied into reported issues),
+    annotation labels and coordinates, plus the check thresholds, so a
+    cached result stays valid until any of them change.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    settings = (IMAGE_CHECKS_VERSION, MIN_POLYLINE_LENGTH_PX, MIN_POLYGON_AREA_PX2, MAX_REPORTED_EDGE_PAIRS)
+    h.update(repr(settings).encode())
+    h.update(f"{image.id}|{image.name}".encode())
+    for kind, shapes in (("polyline", image.polylines), ("polygon", image.polygons)):
+        for shape in shapes:
+            h.update(f"|{kind}:{shape.label}:{len(shape.points)}|".encode())
+            h.update(np.asarray([(p.x, p.y) for p in shape.points], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+class ValidationCache:
+    """Per-image validation results keyed by ``image_geometry_hash``.
+
+    Revalidating an updated export only reruns checks for images whose
+    geometry changed. Results persist as JSON when a path is given.
+
+    Example:
+        >>> cache = ValidationCache("data/processed/validation_cache.json")
+        >>> issues = validate_cvat_project(project, cache=cache, n_jobs=8)
+        >>> cache.save()
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        """Initialize cache, loading existing entries from ``path`` if present."""
+        self.path = Path(path) if path is not None else None
+        self._entries: Dict[str, List[Dict[str, str]]] = {}
+        self._seen: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+        if self.path is not None and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == IMAGE_CHECKS_VERSION:
+                self._entries = data.get("entries", {})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[List[ValidationIssue]]:
+        """Cached issues for a geometry hash, or None."""
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [ValidationIssue(**item) for item in entry]
+
+    def put(self, key: str, issues: Sequence[ValidationIssue]) -> None:
+        """Store issues for a geometry hash."""
+        self._seen.add(key)
+        self._entries[key] = [asdict(issue) for issue in issues]
+
+    def save(self, prune: bool = True) -> None:
+        """Write entries to ``path``; drop entries not used this run if ``prune``."""
+        if self.path is None:
+            return
+        if prune:
+            self._entries = {k: v for k, v in self._entries.items() if k in self._seen}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": IMAGE_CHECKS_VERSION, "entries": self._entries}
+        self.path.write_text(json.dumps(payload), encoding="utf-8")
 
 
 def _segments_intersect(p1: Tuple[float, float], p2: Tuple[float, float], p3: Tuple[float, float], p4: Tuple[float, float]) -> bool:
@@ -80,37 +181,176 @@ def _segments_intersect(p1: Tuple[float, float], p2: Tuple[float, float], p3: Tu
     return (o1 == 0 and o2 == 0 and o3 == 0 and o4 == 0) or (o1 * o2 < 0 and o3 * o4 < 0)
 
 
-def _is_self_intersecting(points) -> bool:
-    """Detect self-intersections in a polygon represented as ndarray (N,2)."""
-    pts = [tuple(p) for p in points]
+def _edge_pairs_intersect(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    i_idx: np.ndarray,
+    j_idx: np.ndarray,
+) -> np.ndarray:
+    """Vectorized intersection test for edge pairs (i_idx[k], j_idx[k]).
+
+    Counts proper crossings and overlapping colinear edges; edges that only
+    touch at an endpoint are not reported.
+    """
+    p1, p2 = starts[i_idx], ends[i_idx]
+    p3, p4 = starts[j_idx], ends[j_idx]
+
+    def orient(a, b, c):
+        return (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+
+    o1 = orient(p1, p2, p3)
+    o2 = orient(p1, p2, p4)
+    o3 = orient(p3, p4, p1)
+    o4 = orient(p3, p4, p2)
+
+    proper = (o1 * o2 < 0) & (o3 * o4 < 0)
+    colinear = (o1 == 0) & (o2 == 0) & (o3 == 0) & (o4 == 0)
+    overlap = np.all(
+        np.maximum(np.minimum(p1, p2), np.minimum(p3, p4))
+        <= np.minimum(np.maximum(p1, p2), np.maximum(p3, p4)),
+        axis=1,
+    )
+    return proper | (colinear & overlap)
+
+
+def _grid_candidate_pairs(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Edge pairs sharing at least one uniform-grid cell, as (m, 2) with i < j.
+
+    The cell size follows the mean edge length (bounded so the longest edge
+    spans at most ~8 cells per axis), so each edge touches O(1) cells and the
+    number of candidate pairs grows linearly for typical contours.
+    """
+    n = len(starts)
+    lo = np.minimum(starts, ends)
+    hi = np.maximum(starts, ends)
+    lengths = np.linalg.norm(ends - starts, axis=1)
+    cell = max(float(lengths.mean()), float(lengths.max()) / 8.0, 1e-9)
+
+    origin = lo.min(axis=0)
+    c_lo = np.floor((lo - origin) / cell).astype(np.int64)
+    c_hi = np.floor((hi - origin) / cell).astype(np.int64)
+    spans = c_hi - c_lo + 1
+    counts = spans[:, 0] * spans[:, 1]
+
+    # Expand every edge into the grid cells covered by its bounding box
+    edge_ids = np.repeat(np.arange(n), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    span_x = spans[edge_ids, 0]
+    cell_x = c_lo[edge_ids, 0] + offsets % span_x
+    cell_y = c_lo[edge_ids, 1] + offsets // span_x
+    keys = cell_x * (int(c_hi[:, 1].max()) + 1) + cell_y
+
+    order = np.argsort(keys, kind="stable")
+    keys, edge_ids = keys[order], edge_ids[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    pairs: List[Tuple[int, int]] = []
+    for group in np.split(edge_ids, bounds):
+        if len(group) > 1:
+            pairs.extend(combinations(group.tolist(), 2))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    arr = np.sort(np.asarray(pairs, dtype=np.int64), axis=1)
+    return np.unique(arr, axis=0)
+
+
+def _find_self_intersections(points, small_n: int = SMALL_POLYGON_EDGES) -> List[Tuple[int, int]]:
+    """Return intersecting non-adjacent edge pairs of a closed polygon.
+
+    Edge ``k`` runs from vertex ``k`` to vertex ``k + 1`` (wrapping around).
+    Polygons with at most ``small_n`` edges test all pairs at once with NumPy;
+    larger ones only test pairs bucketed into a shared grid cell.
+    """
+    pts = np.asarray(points, dtype=float)
     n = len(pts)
     if n < 4:
-        return False
-    edges = [
-        (pts[i], pts[(i + 1) % n])
-        for i in range(n)
-    ]
-    for i, (a1, a2) in enumerate(edges):
-        for j, (b1, b2) in enumerate(edges):
-            if abs(i - j) <= 1 or (i == 0 and j == n - 1) or (i == n - 1 and j == 0):
-                continue
-            if _segments_intersect(a1, a2, b1, b2):
-                return True
-    return False
+        return []
+    starts = pts
+    ends = np.roll(pts, -1, axis=0)
+
+    if n <= small_n:
+        i_idx, j_idx = np.triu_indices(n, k=2)
+    else:
+        pairs = _grid_candidate_pairs(starts, ends)
+        i_idx, j_idx = pairs[:, 0], pairs[:, 1]
+        keep = (j_idx - i_idx) > 1
+        i_idx, j_idx = i_idx[keep], j_idx[keep]
+
+    # First and last edges share vertex 0
+    keep = ~((i_idx == 0) & (j_idx == n - 1))
+    i_idx, j_idx = i_idx[keep], j_idx[keep]
+
+    hits = _edge_pairs_intersect(starts, ends, i_idx, j_idx)
+    return list(zip(i_idx[hits].tolist(), j_idx[hits].tolist()))
+
+
+def _is_self_intersecting(points) -> bool:
+    """Detect self-intersections in a polygon represented as ndarray (N,2)."""
+    return bool(_find_self_intersections(points))
+
+
+def validate_cvat_project(
+    project: CVATProject,
+    n_jobs: Optional[int] = 1,
+    cache: Optional[ValidationCache] = None,
+) -> List[ValidationIssue]:
+    """Run lightweight structural checks on a CVAT project.
 
+    Args:
+        project: Parsed CVAT project.
+        n_jobs: Worker processes for per-image checks (None = one per CPU,
+            1 = in-process).
+        cache: Optional per-image result cache; only images whose geometry
+            hash is not cached are checked.
 
-def validate_cvat_project(project: CVATProject) -> List[ValidationIssue]:
-    """Run lightweight structural checks on a CVAT project."""
+    Returns:
+        Issues in project order: label issues first, then per-image issues.
+    """
 
+    issues = _validate_labels({label.name for label in project.labels})
+
+    # Per-image geometry sanity checks
+    per_image: List[Optional[List[ValidationIssue]]] = [None] * len(project.images)
+    keys: List[Optional[str]] = [None] * len(project.images)
+    if cache is not None:
+        for i, image in enumerate(project.images):
+            keys[i] = image_geometry_hash(image)
+            per_image[i] = cache.get(keys[i])
+
+    todo = [i for i, result in enumerate(per_image) if result is None]
+    todo_images = [project.images[i] for i in todo]
+    if n_jobs == 1 or len(todo) < 2:
+        results = [_check_image(image) for image in todo_images]
+    else:
+        workers = n_jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(todo) // (workers * 4))
+            results = list(executor.map(_check_image, todo_images, chunksize=chunksize))
+
+    for i, result in zip(todo, results):
+        per_image[i] = result
+        if cache is not None:
+            cache.put(keys[i], result)
+
+    for result in per_image:
+        issues.extend(result)
+
+    return issues
+
+
+def _validate_labels(label_names: Set[str]) -> List[ValidationIssue]:
+    """Project-level label checks (required and unknown labels)."""
     issues: List[ValidationIssue] = []
 
-    label_names = {label.name for label in project.labels}
     missing = REQUIRED_LABELS - label_names
     if missing:
         issues.append(
             ValidationIssue(
                 level="error",
                 message=f"Missing required labels: {sorted(missing)}",
+                code="missing_labels",
+                label=",".join(sorted(missing)),
+                value=len(missing),
             )
         )
 
@@ -120,26 +360,47 @@ def validate_cvat_project(project: CVATProject) -> List[ValidationIssue]:
             ValidationIssue(
                 level="warning",
                 message=f"Unknown labels present: {sorted(unknown)}",
+                code="unknown_labels",
+                label=",".join(sorted(unknown)),
+                value=len(unknown),
             )
         )
 
-    # Per-image geometry sanity checks
-    for image in project.images:
-        issues.extend(_validate_image_annotations(image))
-
     return issues
 
 
-def _validate_image_annotations(image: ImageAnnotations) -> Iterable[ValidationIssue]:
+def _check_image(image: ImageAnnotations) -> List[ValidationIssue]:
+    """Materialized per-image checks (module-level so it pickles to workers)."""
+    return list(_validate_image_annotations(image))
+
+
+def _validate_image_annotations(
+    image: ImageAnnotations,
+    include_warnings: bool = True,
+) -> Iterable[ValidationIssue]:
+    """Per-image geometry checks.
+
+    With ``include_warnings=False`` only the cheap error checks (point
+    counts) run; arc lengths, areas and self-intersections are skipped.
+    """
     # Polylines must have at least 2 points
     for polyline in image.polylines:
         if len(polyline.points) < 2:
             yield ValidationIssue(
                 level="error",
                 message=f"Image {image.name}: polyline '{polyline.label}' has fewer than 2 points",
+                code="polyline_too_few_points",
+                image_name=image.name,
+                image_id=image.id,
+                label=polyline.label,
+                value=len(polyline.points),
+                threshold=2,
             )
             continue
 
+        if not include_warnings:
+            continue
+
         length = calculate_arc_length(polyline.to_array())
         if length < MIN_POLYLINE_LENGTH_PX:
             yield ValidationIssue(
@@ -148,6 +409,12 @@ def _validate_image_annotations(image: ImageAnnotations) -> Iterable[ValidationI
                     f"Image {image.name}: polyline '{polyline.label}' length {length:.2f}px "
                     f"below threshold {MIN_POLYLINE_LENGTH_PX}px"
                 ),
+                code="polyline_too_short",
+                image_name=image.name,
+                image_id=image.id,
+                label=polyline.label,
+                value=float(length),
+                threshold=MIN_POLYLINE_LENGTH_PX,
             )
 
     # Polygons must have at least 3 points
@@ -156,9 +423,18 @@ def _validate_image_annotations(image: ImageAnnotations) -> Iterable[ValidationI
             yield ValidationIssue(
                 level="error",
                 message=f"Image {image.name}: polygon '{polygon.label}' has fewer than 3 points",
+                code="polygon_too_few_points",
+                image_name=image.name,
+                image_id=image.id,
+                label=polygon.label,
+                value=len(polygon.points),
+                threshold=3,
             )
             continue
 
+        if not include_warnings:
+            continue
+
         arr = polygon.to_array()
         area = calculate_polygon_area(arr)
         if area < MIN_POLYGON_AREA_PX2:
@@ -168,10 +444,681 @@ def _validate_image_annotations(image: ImageAnnotations) -> Iterable[ValidationI
                     f"Image {image.name}: polygon '{polygon.label}' area {area:.2f}px² "
                     f"below threshold {MIN_POLYGON_AREA_PX2}px²"
                 ),
+                code="polygon_too_small",
+                image_name=image.name,
+                image_id=image.id,
+                label=polygon.label,
+                value=float(area),
+                threshold=MIN_POLYGON_AREA_PX2,
             )
 
-        if _is_self_intersecting(arr):
+        crossings = _find_self_intersections(arr)
+        if crossings:
+            shown = crossings[:MAX_REPORTED_EDGE_PAIRS]
+            more = f" (+{len(crossings) - len(shown)} more)" if len(crossings) > len(shown) else ""
             yield ValidationIssue(
                 level="warning",
-                message=f"Image {image.name}: polygon '{polygon.label}' appears self-intersecting",
+                message=(
+                    f"Image {image.name}: polygon '{polygon.label}' appears self-intersecting "
+                    f"at edge pairs {shown}{more}"
+                ),
+                code="polygon_self_intersection",
+                image_name=image.name,
+                image_id=image.id,
+                label=polygon.label,
+                value=len(crossings),
             )
+
+
+# ============================================================
+# STREAMING VALIDATION
+# ============================================================
+
+class StreamingCVATValidator:
+    """Validate a CVAT export while it is being parsed.
+
+    Labels are checked first (from <meta> only), then each image as the
+    parser yields it, so a bad export can be rejected before the rest of
+    the file is read.
+
+    Attributes:
+        levels: Issue levels to emit; warning-only checks are skipped
+            entirely when "warning" is not included.
+        max_errors: Stop after this many errors (None = no limit).
+        fail_fast: Stop at the first error (same as ``max_errors=1``).
+        aborted: True if the last run stopped early.
+        images_checked: Images validated in the last run.
+        error_count: Errors emitted in the last run.
+
+    Example:
+        >>> validator = StreamingCVATValidator(fail_fast=True)
+        >>> issues = validator.validate("data/annotations/annotations.xml")
+        >>> if validator.aborted:
+        ...     print("Rejected:", issues[-1].message)
+    """
+
+    def __init__(
+        self,
+        levels: Sequence[str] = ("error", "warning"),
+        max_errors: Optional[int] = None,
+        fail_fast: bool = False,
+    ):
+        self.levels = set(levels)
+        self.max_errors = 1 if fail_fast else max_errors
+        self.fail_fast = fail_fast
+        self.aborted = False
+        self.images_checked = 0
+        self.error_count = 0
+
+    def iter_issues(self, source: Union[str, Path, CVATParser]) -> Iterator[ValidationIssue]:
+        """Yield issues as images arrive from the parser.
+
+        Args:
+            source: Path to annotations.xml or an existing ``CVATParser``.
+
+        Yields:
+            ValidationIssue objects whose level is in ``levels``.
+        """
+        parser = source if isinstance(source, CVATParser) else CVATParser(source)
+        self.aborted = False
+        self.images_checked = 0
+        self.error_count = 0
+
+        label_issues = _validate_labels({label.name for label in parser.read_labels()})
+        for issue in label_issues:
+            if self._emit(issue):
+                yield issue
+            if self._should_abort():
+                self.aborted = True
+                return
+
+        include_warnings = "warning" in self.levels
+        for image in parser.iter_images():
+            self.images_checked += 1
+            for issue in _validate_image_annotations(image, include_warnings=include_warnings):
+                if self._emit(issue):
+                    yield issue
+                if self._should_abort():
+                    self.aborted = True
+                    return
+
+    def validate(self, source: Union[str, Path, CVATParser]) -> List[ValidationIssue]:
+        """Collect all emitted issues (stopping early on abort)."""
+        return list(self.iter_issues(source))
+
+    def _emit(self, issue: ValidationIssue) -> bool:
+        if issue.level == "error":
+            self.error_count += 1
+        return issue.level in self.levels
+
+    def _should_abort(self) -> bool:
+        return self.max_errors is not None and self.error_count >= self.max_errors
+
+
+# ============================================================
+# VECTORIZED CLINICAL CHECKS
+# ============================================================
+
+# Columns of the failure-case table (subset of Pandera's failure_cases)
+FAILURE_CASE_COLUMNS = ["column", "check", "index", "failure_case"]
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    """One column's rules, compiled from a Pandera model."""
+    name: str
+    kind: str  # "int", "float" or "str"
+    nullable: bool
+    isin: Optional[Tuple] = None
+    ge: Optional[float] = None
+    le: Optional[float] = None
+    isin_error: str = ""
+    ge_error: str = ""
+    le_error: str = ""
+
+
+def compile_schema(model: type = ClinicalSchema) -> List[ColumnRule]:
+    """Compile a Pandera ``DataFrameModel`` into vectorizable column rules.
+
+    Supports the checks used by ``ClinicalSchema``: dtype coercion,
+    nullability, ``isin``, ``ge`` and ``le``.
+
+    Raises:
+        ValueError: If the model uses a check that cannot be compiled.
+    """
+    rules = []
+    for name, column in model.to_schema().columns.items():
+        dtype = str(column.dtype).lower()
+        kind = "int" if "int" in dtype else "float" if "float" in dtype else "str"
+        column_fields: Dict[str, object] = {}
+        for check in column.checks:
+            stats = check.statistics
+            if check.name == "isin":
+                column_fields["isin"] = tuple(v for v in stats["allowed_values"] if v is not None)
+                column_fields["isin_error"] = check.error
+            elif check.name == "greater_than_or_equal_to":
+                column_fields["ge"] = float(stats["min_value"])
+                column_fields["ge_error"] = check.error
+            elif check.name == "less_than_or_equal_to":
+                column_fields["le"] = float(stats["max_value"])
+                column_fields["le_error"] = check.error
+            else:
+                raise ValueError(f"Unsupported check for vectorized validation: {check.name}")
+        rules.append(ColumnRule(name=name, kind=kind, nullable=column.nullable, **column_fields))
+    return rules
+
+
+class VectorizedClinicalChecker:
+    """NumPy-mask implementation of ``ClinicalSchema`` for large/chunked data.
+
+    Evaluates the same rules as ``ClinicalSchema.validate(df, lazy=True)``
+    without building a coerced copy of the frame. Failure cases are
+    collected as column arrays and assembled into one table at the end.
+
+    Example:
+        >>> checker = VectorizedClinicalChecker()
+        >>> failures = checker.check_chunks(loader.iter_chunks(chunksize=50_000))
+        >>> failures.groupby(["column", "check"]).size()
+    """
+
+    def __init__(self, rules: Optional[Sequence[ColumnRule]] = None):
+        self.rules = list(rules) if rules is not None else compile_schema(ClinicalSchema)
+        self.rows_checked = 0
+
+    def check(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Check one frame (or chunk); index values are reported as-is.
+
+        Returns:
+            Failure cases with ``FAILURE_CASE_COLUMNS`` (empty if valid).
+        """
+        buffers: Dict[str, List[np.ndarray]] = {col: [] for col in FAILURE_CASE_COLUMNS}
+        self._check_into(df, buffers)
+        return self._assemble(buffers)
+
+    def check_chunks(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """Check an iterable of chunks, accumulating failures across them."""
+        buffers: Dict[str, List[np.ndarray]] = {col: [] for col in FAILURE_CASE_COLUMNS}
+        missing: Set[str] = set()
+        for chunk in chunks:
+            self._check_into(chunk, buffers, missing)
+        return self._assemble(buffers)
+
+    def _check_into(
+        self,
+        df: pd.DataFrame,
+        buffers: Dict[str, List[np.ndarray]],
+        missing: Optional[Set[str]] = None,
+    ) -> None:
+        # Columns already reported absent; pandera reports each one once
+        missing = set() if missing is None else missing
+        self.rows_checked += len(df)
+        index = df.index.to_numpy()
+
+        def add(column: str, check: str, mask: np.ndarray, series: pd.Series) -> None:
+            # Failure values are only materialized for failing rows
+            if mask.any():
+                n = int(mask.sum())
+                buffers["column"].append(np.full(n, column, dtype=object))
+                buffers["check"].append(np.full(n, check, dtype=object))
+                buffers["index"].append(index[mask])
+                buffers["failure_case"].append(series[mask].to_numpy(dtype=object, na_value=None))
+
+        for rule in self.rules:
+            if rule.name not in df.columns:
+                if rule.name in missing:
+                    continue
+                missing.add(rule.name)
+                buffers["column"].append(np.array([None], dtype=object))
+                buffers["check"].append(np.array(["column_in_dataframe"], dtype=object))
+                buffers["index"].append(np.array([None], dtype=object))
+                buffers["failure_case"].append(np.array([rule.name], dtype=object))
+                continue
+
+            series = df[rule.name]
+            null = series.isna().to_numpy()
+
+            if not rule.nullable:
+                add(rule.name, "not_nullable", null, series)
+
+            if rule.kind == "str":
+                present = ~null
+                if rule.isin is not None:
+                    allowed = series.astype(str).isin(rule.isin).to_numpy()
+                    add(rule.name, rule.isin_error, present & ~allowed, series)
+                continue
+
+            numeric = pd.to_numeric(series, errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+            bad = ~null & np.isnan(numeric)
+            if rule.kind == "int":
+                bad |= ~null & ~np.isnan(numeric) & (numeric != np.round(numeric))
+            add(rule.name, f"coerce_dtype('{rule.kind}')", bad, series)
+            present = ~null & ~bad
+
+            if rule.isin is not None:
+                add(rule.name, rule.isin_error, present & ~np.isin(numeric, rule.isin), series)
+            if rule.ge is not None:
+                add(rule.name, rule.ge_error, present & ~(numeric >= rule.ge), series)
+            if rule.le is not None:
+                add(rule.name, rule.le_error, present & ~(numeric <= rule.le), series)
+
+    @staticmethod
+    def _assemble(buffers: Dict[str, List[np.ndarray]]) -> pd.DataFrame:
+        return pd.DataFrame({
+            col: np.concatenate(arrays) if arrays else np.empty(0, dtype=object)
+            for col, arrays in buffers.items()
+        })
+
+
+# ============================================================
+# CROSS-SOURCE CONSISTENCY
+# ============================================================
+
+# Issue codes emitted by ClinicalConsistencyChecker
+CONSISTENCY_CODES = {
+    "patient_id_unparsed": "warning",  # no patient ID in the image name
+    "patient_not_found": "error",  # annotated patient missing from clinical data
+    "duplicate_patient_id": "warning",  # clinical ID appears more than once
+    "fs_missing": "warning",  # clinical fs value missing for the image's ear
+    "fs_mismatch": "error",  # annotation and clinical fs value disagree
+}
+
+# ear_side attribute values mapped to clinical columns
+EAR_SIDE_COLUMNS = {"right": "fs_right", "left": "fs_left"}
+
+
+def _ear_side(image: ImageAnnotations) -> Optional[str]:
+    """Ear side from the ``ear_outer_contour`` attribute, if annotated."""
+    for polygon in image.polygons:
+        if polygon.label == "ear_outer_contour":
+            side = polygon.attributes.get("ear_side")
+            if side in EAR_SIDE_COLUMNS:
+                return side
+    return None
+
+
+class ClinicalConsistencyChecker:
+    """Check CVAT annotations against the linked clinical records.
+
+    Clinical rows are indexed once by patient ID (a hash table of row
+    positions plus fs_right/fs_left arrays); each image is then joined with
+    a single dictionary lookup, so cost is linear in images + patients and
+    images can be streamed straight from the parser.
+
+    For images with a known ``ear_side``, ``has_frank_sign`` must equal that
+    side's clinical value. Without a side, an annotated Frank sign needs at
+    least one clinical side set and a clean ear contradicts a bilateral
+    clinical sign. ``use_ear_side=False`` applies the side-agnostic rule to
+    every image (useful while ``ear_side`` is still the CVAT default).
+
+    Attributes:
+        images_checked: Images seen in the last run.
+        images_linked: Images joined to a clinical row in the last run.
+
+    Example:
+        >>> checker = ClinicalConsistencyChecker(clinical_df)
+        >>> issues = checker.validate(CVATParser(xml_path).iter_images())
+        >>> [i for i in issues if i.code == "fs_mismatch"]
+    """
+
+    def __init__(
+        self,
+        clinical_df: pd.DataFrame,
+        id_column: str = "patient_id",
+        use_ear_side: bool = True,
+    ):
+        """Build the patient ID index (first row wins for duplicated IDs)."""
+        self.use_ear_side = use_ear_side
+        ids = clinical_df[id_column].astype(str).where(clinical_df[id_column].notna())
+        self.duplicate_ids = sorted(ids[ids.duplicated() & ids.notna()].unique().tolist())
+
+        def side_values(col: str) -> np.ndarray:
+            if col not in clinical_df.columns:
+                return np.full(len(clinical_df), np.nan)
+            return pd.to_numeric(clinical_df[col], errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+
+        self._fs = {col: side_values(col) for col in EAR_SIDE_COLUMNS.values()}
+        self._index: Dict[str, int] = {}
+        for pos, pid in enumerate(ids.tolist()):
+            if isinstance(pid, str):
+                self._index.setdefault(pid, pos)
+        self.images_checked = 0
+        self.images_linked = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[pd.DataFrame],
+        id_column: str = "patient_id",
+        use_ear_side: bool = True,
+    ) -> "ClinicalConsistencyChecker":
+        """Build the index from ``ClinicalDataLoader.iter_chunks`` output."""
+        columns = [id_column, *EAR_SIDE_COLUMNS.values()]
+        parts = [chunk[[c for c in columns if c in chunk.columns]] for chunk in chunks]
+        frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+        return cls(frame, id_column=id_column, use_ear_side=use_ear_side)
+
+    def iter_issues(self, images: Iterable[ImageAnnotations]) -> Iterator[ValidationIssue]:
+        """Yield consistency issues image by image."""
+        self.images_checked = 0
+        self.images_linked = 0
+
+        for pid in self.duplicate_ids:
+            yield self._issue("duplicate_patient_id", f"Clinical patient_id {pid} appears more than once; first row used")
+
+        for image in images:
+            self.images_checked += 1
+            pid = extract_patient_id_from_image(image.name)
+            if pid is None:
+                yield self._issue("patient_id_unparsed", f"No patient ID in image name {image.name}", image)
+                continue
+            pos = self._index.get(pid)
+            if pos is None:
+                yield self._issue("patient_not_found", f"Patient {pid} from {image.name} not in clinical data", image)
+                continue
+            self.images_linked += 1
+
+            annotated = image.has_frank_sign
+            side = _ear_side(image) if self.use_ear_side else None
+            if side is not None:
+                col = EAR_SIDE_COLUMNS[side]
+                value = self._fs[col][pos]
+                if np.isnan(value):
+                    yield self._issue(
+                        "fs_missing", f"{image.name}: clinical {col} missing for patient {pid}", image, label=col
+                    )
+                elif bool(value) != annotated:
+                    yield self._issue(
+                        "fs_mismatch",
+                        f"{image.name}: annotation has_frank_sign={annotated} but clinical {col}={int(value)}",
+                        image,
+                        label=col,
+                        value=float(value),
+                        threshold=float(annotated),
+                    )
+                continue
+
+            right, left = self._fs["fs_right"][pos], self._fs["fs_left"][pos]
+            if annotated and right == 0 and left == 0:
+                yield self._issue(
+                    "fs_mismatch", f"{image.name}: Frank sign annotated but clinical fs_right=fs_left=0",
+                    image, label="fs_right,fs_left", value=0.0, threshold=1.0,
+                )
+            elif not annotated and right == 1 and left == 1:
+                yield self._issue(
+                    "fs_mismatch", f"{image.name}: no Frank sign annotated but clinical sign is bilateral",
+                    image, label="fs_right,fs_left", value=2.0, threshold=0.0,
+                )
+
+    def validate(self, images: Iterable[ImageAnnotations]) -> List[ValidationIssue]:
+        """Collect all consistency issues."""
+        return list(self.iter_issues(images))
+
+    @staticmethod
+    def _issue(
+        code: str,
+        message: str,
+        image: Optional[ImageAnnotations] = None,
+        **extra: object,
+    ) -> ValidationIssue:
+        if image is not None:
+            extra.update(image_name=image.name, image_id=image.id)
+        return ValidationIssue(level=CONSISTENCY_CODES[code], message=message, code=code, **extra)
+
+
+# ============================================================
+# IMAGE FILE INTEGRITY
+# ============================================================
+
+# Bump when header records change shape so stale caches are ignored
+IMAGE_HEADER_VERSION = "1"
+
+
+class ImageHeaderCache:
+    """Image header records keyed by path, valid while mtime and size match.
+
+    Example:
+        >>> cache = ImageHeaderCache("data/processed/image_headers.json")
+        >>> issues = ImageIntegrityChecker("data/raw", cache=cache).check(project.images)
+        >>> cache.save()
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        """Initialize cache, loading existing entries from ``path`` if present."""
+        self.path = Path(path) if path is not None else None
+        self._entries: Dict[str, Dict[str, object]] = {}
+        self._seen: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+        if self.path is not None and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == IMAGE_HEADER_VERSION:
+                self._entries = data.get("entries", {})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, stat: os.stat_result) -> Optional[Dict[str, object]]:
+        """Cached record for ``key`` if the file's mtime and size are unchanged."""
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, record: Dict[str, object]) -> None:
+        """Store a header record (records for missing files are not cached)."""
+        self._seen.add(key)
+        if record["error"] != "missing":
+            self._entries[key] = record
+
+    def save(self, prune: bool = True) -> None:
+        """Write entries to ``path``; drop entries not used this run if ``prune``."""
+        if self.path is None:
+            return
+        if prune:
+            self._entries = {k: v for k, v in self._entries.items() if k in self._seen}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": IMAGE_HEADER_VERSION, "entries": self._entries}
+        self.path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+class ImageIntegrityChecker:
+    """Check that annotated images exist, open, and match CVAT dimensions.
+
+    Only headers are read (no pixel decoding), on a thread pool since the
+    work is I/O bound. Issue codes: ``image_missing``, ``image_corrupt`` and
+    ``image_size_mismatch`` (EXIF-rotated files are compared with swapped
+    axes, matching how CVAT reports them).
+
+    Attributes:
+        images_dir: Directory that CVAT image names are relative to.
+        n_jobs: Worker threads (None = ThreadPoolExecutor default).
+        cache: Optional ``ImageHeaderCache`` for incremental runs.
+        images_checked: Images checked in the last run.
+
+    Example:
+        >>> checker = ImageIntegrityChecker(config["data"]["images_dir"], n_jobs=32)
+        >>> issues = checker.check(project.images)
+    """
+
+    def __init__(
+        self,
+        images_dir: Union[str, Path],
+        n_jobs: Optional[int] = None,
+        cache: Optional[ImageHeaderCache] = None,
+    ):
+        self.images_dir = Path(images_dir)
+        self.n_jobs = n_jobs
+        self.cache = cache
+        self.images_checked = 0
+
+    def _header(self, name: str) -> Dict[str, object]:
+        path = self.images_dir / name
+        if self.cache is not None:
+            try:
+                cached = self.cache.get(str(path), os.stat(path))
+            except FileNotFoundError:
+                cached = None
+            if cached is not None:
+                return cached
+        return read_image_header(path)
+
+    def check(self, images: Iterable[ImageAnnotations]) -> List[ValidationIssue]:
+        """Check image files for the given annotations, in input order."""
+        images = list(images)
+        names = [image.name for image in images]
+        if self.n_jobs == 1:
+            records = [self._header(name) for name in names]
+        else:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                records = list(executor.map(self._header, names))
+        self.images_checked = len(images)
+
+        issues: List[ValidationIssue] = []
+        for image, record in zip(images, records):
+            if self.cache is not None:
+                self.cache.put(str(self.images_dir / image.name), record)
+            issue = self._issue_for(image, record)
+            if issue is not None:
+                issues.append(issue)
+        return issues
+
+    @staticmethod
+    def _issue_for(image: ImageAnnotations, record: Dict[str, object]) -> Optional[ValidationIssue]:
+        error = record["error"]
+        location = {"image_name": image.name, "image_id": image.id}
+        if error == "missing":
+            return ValidationIssue("error", f"Image file not found: {image.name}", "image_missing", **location)
+        if error is not None:
+            return ValidationIssue("error", f"Unreadable image {image.name} ({error})", "image_corrupt", **location)
+
+        width, height = record["width"], record["height"]
+        if record["transposed"]:
+            width, height = height, width
+        if (width, height) != (image.width, image.height):
+            # value/threshold hold pixel counts; the message has both sizes
+            return ValidationIssue(
+                "error",
+                f"Image {image.name} is {width}x{height}, CVAT expects {image.width}x{image.height}",
+                "image_size_mismatch",
+                value=float(width * height),
+                threshold=float(image.width * image.height),
+                **location,
+            )
+        return None
+
+
+# ============================================================
+# REPORTS
+# ============================================================
+
+# Columns of ValidationReport.to_frame(), in ValidationIssue field order
+ISSUE_COLUMNS = [f.name for f in fields(ValidationIssue)]
+
+# Columns of ValidationReport.timing_frame()
+TIMING_COLUMNS = ["check", "seconds", "items", "issues"]
+
+
+class ValidationReport:
+    """Columnar collection of validation issues plus per-check timings.
+
+    Issues are appended field by field into per-column lists so tens of
+    thousands of them turn into one DataFrame without per-row dicts. The
+    console only needs ``summary()`` (counts per level and code); the full
+    table goes to Parquet via ``save()``.
+
+    Example:
+        >>> report = ValidationReport()
+        >>> with report.timed("geometry", items=len(project.images)) as sink:
+        ...     sink.extend(validate_cvat_project(project))
+        >>> print(report.summary())
+        >>> report.save("data/processed/validation_issues.parquet")
+    """
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, List[object]] = {col: [] for col in ISSUE_COLUMNS}
+        self._timings: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._columns["level"])
+
+    def add(self, issue: ValidationIssue) -> None:
+        """Append one issue."""
+        for col in ISSUE_COLUMNS:
+            self._columns[col].append(getattr(issue, col))
+
+    def extend(self, issues: Iterable[ValidationIssue]) -> int:
+        """Append issues (consuming generators lazily); returns how many."""
+        before = len(self)
+        for issue in issues:
+            self.add(issue)
+        return len(self) - before
+
+    @contextmanager
+    def timed(self, check: str, items: int = 0) -> Iterator["ValidationReport"]:
+        """Time a block and attribute the issues added inside it to ``check``.
+
+        Repeated blocks with the same name accumulate.
+        """
+        start_issues = len(self)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            entry = self._timings.setdefault(check, [0.0, 0, 0])
+            entry[0] += time.perf_counter() - start
+            entry[1] += items
+            entry[2] += len(self) - start_issues
+
+    def set_items(self, check: str, items: int) -> None:
+        """Set the item count of a timed check once it is known (e.g. after streaming)."""
+        self._timings.setdefault(check, [0.0, 0, 0])[1] = items
+
+    @property
+    def error_count(self) -> int:
+        return self._columns["level"].count("error")
+
+    def to_frame(self) -> pd.DataFrame:
+        """All issues as a DataFrame with ``ISSUE_COLUMNS``."""
+        df = pd.DataFrame(self._columns, columns=ISSUE_COLUMNS)
+        for col in ("level", "code", "label"):
+            df[col] = df[col].astype("category")
+        df["image_id"] = df["image_id"].astype("Int64")
+        df["value"] = df["value"].astype("float64")
+        df["threshold"] = df["threshold"].astype("float64")
+        return df
+
+    def summary(self) -> pd.DataFrame:
+        """Issue counts per (level, code), most frequent first."""
+        counts: Dict[Tuple[str, str], int] = {}
+        for key in zip(self._columns["level"], self._columns["code"]):
+            counts[key] = counts.get(key, 0) + 1
+        rows = [(level, code, n) for (level, code), n in counts.items()]
+        df = pd.DataFrame(rows, columns=["level", "code", "count"])
+        return df.sort_values(["count", "level", "code"], ascending=[False, True, True], ignore_index=True)
+
+    def timing_frame(self) -> pd.DataFrame:
+        """Per-check wall time, item count and issues raised."""
+        rows = [(check, *entry) for check, entry in self._timings.items()]
+        return pd.DataFrame(rows, columns=TIMING_COLUMNS)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write all issues to Parquet (or CSV if ``path`` ends in .csv)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df = self.to_frame()
+        if path.suffix.lower() == ".csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_parquet(path, index=False)
+        return path
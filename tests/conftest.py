@@ -0,0 +1,52 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from franksign.data.cvat_parser import (
+    ImageAnnotations,
+    Point,
+    PointAnnotation,
+    PolygonAnnotation,
+    PolylineAnnotation,
+)
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def make_annotations():
+    """Factory for CVAT annotations of an ear with a Frank Sign region and line.
+
+    Shapes are laid out on a 400x200 image and scaled to ``width`` x
+    ``height``: the region spans (100, 50)-(300, 150), the line runs along
+    y=100 from x=120 to x=280 and the optional earlobe tip is at (200, 190).
+    ``presence=None`` leaves out the line.
+    """
+    def make(name="ear-1001.jpeg", width=400, height=200, presence="present", image_id=1, earlobe_tip=False):
+        sx, sy = width / 400, height / 200
+
+        def point(x, y):
+            return Point(x * sx, y * sy)
+
+        img = ImageAnnotations(id=image_id, name=name, width=width, height=height)
+        img.polygons.append(PolygonAnnotation(
+            label="franks_sign_region",
+            points=[point(100, 50), point(300, 50), point(300, 150), point(100, 150)],
+        ))
+        if presence is not None:
+            img.polylines.append(PolylineAnnotation(
+                label="franks_sign_line",
+                points=[point(120, 100), point(280, 100)],
+                attributes={"presence": presence},
+            ))
+        if earlobe_tip:
+            img.points.append(PointAnnotation(label="earlobe_tip", point=point(200, 190)))
+        return img
+
+    return make
@@ -18,6 +18,9 @@ from franksign.data.clinical_loader import (
     extract_patient_id_from_image,
     ClinicalDataLoader,
     PatientRecord,
+    PatientTable,
+    MultiSiteClinicalLoader,
+    compact_dtypes,
 )
 
 
@@ -238,6 +241,211 @@ class TestPatientRecord:
         assert reduced.ef_category == "reduced"
 
 
+# ============================================================
+# PATIENT TABLE TESTS
+# ============================================================
+
+class TestPatientTable:
+    """Test columnar PatientTable view."""
+    
+    @pytest.fixture
+    def table(self):
+        """Table built from a small frame with missing values."""
+        df = pd.DataFrame({
+            'patient_id': ['1', '2', None, '3'],
+            'fs_right': [1, 0, 1, np.nan],
+            'fs_left': [1, 1, 0, np.nan],
+            'age': [45, 58, 70, np.nan],
+            'ef': [55.0, 45.0, 30.0, 30.0],
+            'hypertension': [1, 0, 1, 1],
+            'diabetes': [1, np.nan, 0, 0],
+            'gender': ['M', 'F', 'M', None],
+        })
+        return PatientTable(df)
+    
+    def test_drops_missing_ids(self, table):
+        """Rows without patient_id are dropped."""
+        assert len(table) == 3
+        assert list(table.column('patient_id')) == ['1', '2', '3']
+    
+    def test_parses_text_numeric_columns(self):
+        """Text columns the loader does not parse keep Turkish decimals."""
+        df = pd.DataFrame({
+            'patient_id': ['1', '2', '3'],
+            'gfr': ['0,98', '>90', '-'],
+            'systolic_bp': ['130', None, None],
+            'hypertension': ['1', '0', ''],
+        })
+        table = PatientTable(df)
+        assert table.column('gfr')[:2].tolist() == [0.98, 90.0]
+        assert table[0].systolic_bp == 130
+        assert table[1].systolic_bp is None
+        assert table[2].gfr is None
+        assert table.column('hypertension')[:2].tolist() == [1.0, 0.0]
+    
+    def test_vectorized_properties(self, table):
+        """Vectorized properties match PatientRecord semantics."""
+        assert table.has_frank_sign_any.tolist() == [True, True, False]
+        assert table.has_frank_sign_bilateral.tolist() == [True, False, False]
+        assert table.cv_risk_factor_count.tolist() == [2, 0, 1]
+        assert table.age_group.tolist() == ['young', 'middle', None]
+        assert table.ef_category.tolist() == ['preserved', 'mid_range', 'reduced']
+    
+    def test_row_access(self, table):
+        """Rows expose fields and properties lazily."""
+        row = table[1]
+        assert row.patient_id == '2'
+        assert row.age == 58
+        assert row.diabetes is None
+        assert row.has_frank_sign_any is True
+        assert not hasattr(row, '__dict__')
+    
+    def test_get_by_id(self, table):
+        """Lookup by patient ID."""
+        assert table.get('3').gender is None
+        assert table.get(1).age_group == 'young'
+        assert table.get('missing') is None
+    
+    def test_matches_patient_record(self, table):
+        """Materialized records agree with the row view."""
+        for row, record in zip(table, table.to_records()):
+            assert isinstance(record, PatientRecord)
+            assert record.patient_id == row.patient_id
+            assert record.has_frank_sign_any == row.has_frank_sign_any
+            assert record.cv_risk_factor_count == row.cv_risk_factor_count
+            assert record.age_group == row.age_group
+            assert record.ef_category == row.ef_category
+
+
+# ============================================================
+# MEMORY COMPACTION TESTS
+# ============================================================
+
+class TestCompactDtypes:
+    """Test dtype compaction of cleaned clinical frames."""
+    
+    @pytest.fixture
+    def clean_df(self):
+        """Small cleaned-style frame with float binaries and string columns."""
+        return pd.DataFrame({
+            'patient_id': ['1', '2', '3', '4'],
+            'fs_right': [1.0, 0.0, np.nan, 1.0],
+            'age': [45.0, 60.0, np.nan, 72.0],
+            'hdl': [50.5, 45.0, np.nan, 38.2],
+            'creatinine': [0.93, 1.1, np.nan, 0.8],
+            'gender': ['M', 'F', 'M', 'M'],
+            'systolic_bp': ['120', '120', '130', '120'],
+        })
+    
+    def test_binary_and_age_become_int8(self, clean_df):
+        """Binary flags and age become nullable Int8, keeping missing values."""
+        out, _ = compact_dtypes(clean_df)
+        assert str(out['fs_right'].dtype) == 'Int8'
+        assert str(out['age'].dtype) == 'Int8'
+        assert out['fs_right'].isna().sum() == 1
+        assert out['fs_right'].sum() == 2
+    
+    def test_floats_keep_precision(self, clean_df):
+        """Measurements stay float64 unless the downcast is requested."""
+        out, _ = compact_dtypes(clean_df)
+        assert out['creatinine'].dtype == np.float64
+        assert out['creatinine'].iloc[0] == 0.93
+        
+        out, _ = compact_dtypes(clean_df, downcast_floats=True)
+        assert out['hdl'].dtype == np.float32
+        assert out['hdl'].iloc[0] == pytest.approx(50.5)
+    
+    def test_declared_strings_categorical(self, clean_df):
+        """Only declared categorical columns become categorical."""
+        out, _ = compact_dtypes(clean_df)
+        assert isinstance(out['gender'].dtype, pd.CategoricalDtype)
+        assert not isinstance(out['patient_id'].dtype, pd.CategoricalDtype)
+        assert not isinstance(out['systolic_bp'].dtype, pd.CategoricalDtype)
+    
+    def test_report_memory_saved(self, clean_df):
+        """Report contains before/after sizes and savings."""
+        _, report = compact_dtypes(clean_df)
+        assert report['bytes_saved'] == report['bytes_before'] - report['bytes_after']
+        assert report['bytes_after'] <= report['bytes_before']
+
+
+# ============================================================
+# MULTI-SITE LOADER TESTS
+# ============================================================
+
+class TestMultiSiteClinicalLoader:
+    """Tests for multi-site loading and deduplication."""
+    
+    @pytest.fixture
+    def site_files(self, tmp_path):
+        """Two site CSVs sharing patient 1001 (suffix differs)."""
+        site_a = tmp_path / "site_a.csv"
+        site_a.write_text(
+            "DOSYA NUMARASI,FS-SAĞ,FS - SOL,YAŞ,HDL\n"
+            "1001_1,1,,60,\"45,5\"\n"
+            "1002,0,0,55,50\n",
+            encoding="utf-8",
+        )
+        site_b = tmp_path / "site_b.csv"
+        site_b.write_text(
+            "DOSYA NUMARASI,FS-SAĞ,FS - SOL,YAŞ,HDL\n"
+            "1001_2,,1,61,\n"
+            "1003,1,1,70,40\n",
+            encoding="utf-8",
+        )
+        return [site_a, site_b]
+    
+    def test_missing_file_raises(self, tmp_path):
+        """Missing site files raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            MultiSiteClinicalLoader([tmp_path / "missing.csv"])
+    
+    def test_source_column_and_keep(self, site_files):
+        """All rows are kept and tagged with their source file."""
+        df = MultiSiteClinicalLoader(site_files, n_jobs=1).load(conflict="keep")
+        assert len(df) == 4
+        assert df["source"].tolist() == ["site_a.csv"] * 2 + ["site_b.csv"] * 2
+    
+    def test_latest_wins(self, site_files):
+        """Later sources override earlier ones for duplicate patients."""
+        loader = MultiSiteClinicalLoader(site_files, n_jobs=2)
+        df = loader.load(conflict="latest")
+        row = df[df["patient_id"] == "1001"].iloc[0]
+        assert len(df) == 3
+        assert loader.duplicate_count == 1
+        assert row["source"] == "site_b.csv"
+        assert pd.isna(row["fs_right"])
+    
+    def test_first_wins(self, site_files):
+        """Earlier sources win with the 'first' strategy."""
+        df = MultiSiteClinicalLoader(site_files, n_jobs=1).load(conflict="first")
+        row = df[df["patient_id"] == "1001"].iloc[0]
+        assert row["source"] == "site_a.csv"
+    
+    def test_merge_non_null(self, site_files):
+        """Merge fills gaps from other sources and recomputes derived columns."""
+        df = MultiSiteClinicalLoader(site_files, n_jobs=1).load(conflict="merge")
+        row = df[df["patient_id"] == "1001"].iloc[0]
+        assert len(df) == 3
+        assert row["fs_right"] == 1
+        assert row["fs_left"] == 1
+        assert row["age"] == 61
+        assert row["hdl"] == pytest.approx(45.5)
+        assert row["has_fs_bilateral"] == 1
+    
+    def test_compact_memory_report(self, site_files):
+        """load(compact=True) keeps the memory report."""
+        loader = MultiSiteClinicalLoader(site_files, n_jobs=1)
+        assert loader.memory_report is None
+        loader.load(compact=True)
+        assert loader.memory_report['bytes_after'] <= loader.memory_report['bytes_before']
+    
+    def test_unknown_strategy(self, site_files):
+        """Unknown conflict strategies raise ValueError."""
+        with pytest.raises(ValueError):
+            MultiSiteClinicalLoader(site_files).load(conflict="random")
+
+
 # ============================================================
 # CLINICAL DATA LOADER TESTS (require actual CSV)
 # ============================================================
@@ -284,6 +492,47 @@ class TestClinicalDataLoader:
         assert 'has_fs_any' in df.columns
         assert 'cv_risk_count' in df.columns
     
+    def test_load_compact(self, csv_path):
+        """Compact loading keeps values and reports memory saved."""
+        if not csv_path.exists():
+            pytest.skip(f"Clinical data not found: {csv_path}")
+        
+        loader = ClinicalDataLoader(csv_path)
+        df = loader.load()
+        compact = loader.load(compact=True)
+        
+        assert loader.memory_report['bytes_saved'] > 0
+        assert compact['fs_left'].sum() == df['fs_left'].sum()
+        assert compact['age'].mean() == pytest.approx(df['age'].mean())
+    
+    def test_iter_chunks_matches_load(self, csv_path):
+        """Chunks concatenate to the fully loaded frame."""
+        if not csv_path.exists():
+            pytest.skip(f"Clinical data not found: {csv_path}")
+        
+        loader = ClinicalDataLoader(csv_path)
+        df = loader.load()
+        chunks = list(loader.iter_chunks(chunksize=5))
+        
+        assert len(chunks) == -(-len(df) // 5)
+        combined = pd.concat(chunks)
+        assert combined.index.tolist() == df.index.tolist()
+        assert combined['patient_id'].tolist() == df['patient_id'].tolist()
+        assert combined['age'].sum() == df['age'].sum()
+    
+    def test_patient_table_matches_records(self, csv_path):
+        """Patient table and records cover the same patients."""
+        if not csv_path.exists():
+            pytest.skip(f"Clinical data not found: {csv_path}")
+        
+        loader = ClinicalDataLoader(csv_path)
+        df = loader.load(compact=True)
+        table = loader.to_patient_table(df)
+        records = loader.to_patient_records(df)
+        
+        assert len(table) == len(records)
+        assert table.has_frank_sign_any.sum() == sum(r.has_frank_sign_any for r in records)
+    
     def test_summary_stats(self, csv_path):
         """Loader should generate summary statistics."""
         if not csv_path.exists():
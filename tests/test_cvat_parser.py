@@ -118,6 +118,22 @@ class TestCVATParser:
         assert project is not None
         assert project.num_images > 0
     
+    def test_iter_images_matches_parse(self, annotations_path):
+        """Streaming iteration yields the same images as a full parse."""
+        if not annotations_path.exists():
+            pytest.skip(f"Annotations file not found: {annotations_path}")
+        
+        parser = CVATParser(annotations_path)
+        assert list(parser.iter_images()) == parser.parse().images
+    
+    def test_read_labels_matches_parse(self, annotations_path):
+        """Label-only read returns the project labels."""
+        if not annotations_path.exists():
+            pytest.skip(f"Annotations file not found: {annotations_path}")
+        
+        parser = CVATParser(annotations_path)
+        assert parser.read_labels() == parser.parse().labels
+    
     def test_parser_extracts_labels(self, annotations_path):
         """Parser should extract all label definitions."""
         if not annotations_path.exists():
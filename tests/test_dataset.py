@@ -0,0 +1,386 @@
+"""Tests for dataset module."""
+
+import pickle
+import pytest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+torch = pytest.importorskip("torch")
+
+from franksign.data.augmentation import rasterize_annotations
+from franksign.data.cvat_parser import Point
+from franksign.data.dataset import (
+    FrankSignDataset,
+    FrankSignSegmentationDataset,
+    MaskCache,
+    Sample,
+    mask_cache_key,
+)
+from franksign.data.image_store import build_image_store
+from franksign.data.roi import crop_annotations
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def image_dir(tmp_path):
+    """Directory with images named after patients."""
+    for name in ["Ali Veli-1001.jpeg", "1002 - Ayse Kaya.jpeg", "Unknown Person.jpeg", "Mehmet-9999.jpeg"]:
+        Image.new("RGB", (64, 48), color=(10, 20, 30)).save(tmp_path / name)
+    return tmp_path
+
+
+@pytest.fixture
+def clinical_df():
+    """Clinical rows with a duplicated patient ID."""
+    return pd.DataFrame({
+        "patient_id": ["1001", "1002", "1002", "1003"],
+        "fs_right": [1, 0, 1, 0],
+        "age": [60, 55, 56, 70],
+    })
+
+
+# ============================================================
+# TESTS FOR FrankSignDataset
+# ============================================================
+
+class TestFrankSignDataset:
+    """Tests for FrankSignDataset clinical linking."""
+
+    def test_sample_meta(self, image_dir, clinical_df):
+        """Samples carry the image path, patient ID and clinical record."""
+        paths = sorted(image_dir.glob("*.jpeg"))
+        dataset = FrankSignDataset(paths, clinical_df=clinical_df)
+        by_name = {Path(dataset[i].meta["image_path"]).name: dataset[i] for i in range(len(dataset))}
+
+        sample = by_name["Ali Veli-1001.jpeg"]
+        assert isinstance(sample, Sample)
+        assert sample.image.size == (64, 48)
+        assert sample.meta["patient_id"] == "1001"
+        assert sample.meta["clinical_record"] == {"patient_id": "1001", "fs_right": 1, "age": 60}
+
+        # First row wins for duplicated IDs
+        assert by_name["1002 - Ayse Kaya.jpeg"].meta["clinical_record"]["age"] == 55
+
+        assert "patient_id" not in by_name["Unknown Person.jpeg"].meta
+        assert by_name["Mehmet-9999.jpeg"].meta["patient_id"] == "9999"
+        assert "clinical_record" not in by_name["Mehmet-9999.jpeg"].meta
+
+    def test_only_matched_records_kept(self, image_dir, clinical_df):
+        """Unreferenced clinical rows are not stored."""
+        dataset = FrankSignDataset(sorted(image_dir.glob("*.jpeg")), clinical_df=clinical_df)
+        assert sorted(r["patient_id"] for r in dataset.clinical_records) == ["1001", "1002"]
+        assert dataset.record_index.dtype == np.int32
+        assert (dataset.record_index >= 0).sum() == 2
+
+    def test_record_copies_are_independent(self, image_dir, clinical_df):
+        """Mutating a sample's record does not change the dataset."""
+        dataset = FrankSignDataset([image_dir / "Ali Veli-1001.jpeg"], clinical_df=clinical_df)
+        dataset[0].meta["clinical_record"]["age"] = 0
+        assert dataset.clinical_record(0)["age"] == 60
+
+    def test_pickles_without_dataframe(self, image_dir):
+        """Pickled size depends on matched rows, not the clinical table."""
+        big = pd.DataFrame({
+            "patient_id": [str(i) for i in range(20_000)],
+            "age": np.arange(20_000) % 90,
+        })
+        dataset = FrankSignDataset(sorted(image_dir.glob("*.jpeg")), clinical_df=big)
+        restored = pickle.loads(pickle.dumps(dataset))
+        assert len(pickle.dumps(dataset)) < len(pickle.dumps(big)) / 10
+        assert restored[0].meta == dataset[0].meta
+
+    def test_without_clinical_data(self, image_dir):
+        """Datasets without clinical data still report patient IDs."""
+        dataset = FrankSignDataset([image_dir / "Ali Veli-1001.jpeg"])
+        assert dataset.clinical_record(0) is None
+        assert dataset[0].meta == {
+            "image_path": str(image_dir / "Ali Veli-1001.jpeg"),
+            "patient_id": "1001",
+        }
+
+
+    def test_image_size_resizes_on_decode(self, image_dir):
+        """With image_size, samples are decoded straight to that size."""
+        dataset = FrankSignDataset([image_dir / "Ali Veli-1001.jpeg"], image_size=(24, 32))
+        image = dataset[0].image
+        assert image.size == (32, 24)
+        assert image.mode == "RGB"
+
+    def test_from_config_full_size_by_default(self, image_dir, tmp_path):
+        """from_config decodes at full size unless resize=True."""
+        config = {"data": {"images_dir": str(image_dir), "processed_dir": str(tmp_path), "image_size": [24, 32]}}
+        assert FrankSignDataset.from_config(config).image_size is None
+        resized = FrankSignDataset.from_config(config, resize=True)
+        assert resized.image_size == (24, 32)
+        assert resized.draft is False
+
+
+    def test_from_config_split(self, image_dir, tmp_path):
+        """from_config(split=...) reads image names from the split file."""
+        (tmp_path / "train.txt").write_text("Ali Veli-1001.jpeg\nMehmet-9999.jpeg\n", encoding="utf-8")
+        config = {"data": {"images_dir": str(image_dir), "splits_dir": str(tmp_path),
+                           "processed_dir": str(tmp_path / "processed")}}
+        dataset = FrankSignDataset.from_config(config, split="train")
+        assert [p.name for p in dataset.image_paths] == ["Ali Veli-1001.jpeg", "Mehmet-9999.jpeg"]
+
+
+    def test_from_config_follows_images_dir(self, tmp_path):
+        """Changing images_dir with a fixed manifest_path lists the new directory."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+        Image.new("RGB", (8, 8)).save(tmp_path / "a" / "x1.jpg")
+        Image.new("RGB", (8, 8)).save(tmp_path / "b" / "y1.jpg")
+        config = {"data": {"images_dir": str(tmp_path / "a"), "processed_dir": str(tmp_path / "processed")}}
+        assert FrankSignDataset.from_config(config).image_paths == [tmp_path / "a" / "x1.jpg"]
+
+        config["data"]["images_dir"] = str(tmp_path / "b")
+        dataset = FrankSignDataset.from_config(config)
+        assert dataset.image_paths == [tmp_path / "b" / "y1.jpg"]
+        assert dataset[0].image.size == (8, 8)
+
+    def test_from_config_missing_or_empty_dir(self, tmp_path):
+        """A missing or empty images_dir raises without writing a manifest."""
+        processed = tmp_path / "processed"
+        config = {"data": {"images_dir": str(tmp_path / "missing"), "processed_dir": str(processed)}}
+        with pytest.raises(FileNotFoundError, match="not found"):
+            FrankSignDataset.from_config(config)
+
+        (tmp_path / "empty").mkdir()
+        config["data"]["images_dir"] = str(tmp_path / "empty")
+        with pytest.raises(FileNotFoundError, match="No images"):
+            FrankSignDataset.from_config(config)
+        assert not (processed / "image_manifest.json").exists()
+
+        Image.new("RGB", (8, 8)).save(tmp_path / "empty" / "x1.jpg")
+        assert FrankSignDataset.from_config(config).image_paths == [tmp_path / "empty" / "x1.jpg"]
+
+
+class TestImageStoreMode:
+    """Tests for reading datasets from a memory-mapped image store."""
+
+    def test_from_image_store(self, image_dir, clinical_df, tmp_path):
+        """Images are memmap views; metadata still links clinical records."""
+        paths = sorted(image_dir.glob("*.jpeg"))
+        store = build_image_store(paths, tmp_path / "store" / "split", image_size=(16, 32))
+        dataset = FrankSignDataset.from_image_store(tmp_path / "store" / "split", clinical_df=clinical_df)
+
+        assert len(dataset) == len(paths)
+        sample = dataset[0]
+        assert sample.image.shape == (16, 32, 3)
+        assert not sample.image.flags.writeable
+        assert np.shares_memory(sample.image, dataset.image_store.array)
+        assert sample.meta["image_path"] == str(paths[0])
+        assert sample.meta["clinical_record"]["patient_id"] == "1002"  # "1002 - Ayse Kaya.jpeg"
+        assert len(store) == len(paths)
+
+    def test_failed_images_skipped(self, image_dir, tmp_path):
+        """Images that failed to decode at build time are left out."""
+        bad = image_dir / "Bozuk-1003.jpeg"
+        bad.write_bytes(b"broken")
+        store = build_image_store([image_dir / "Ali Veli-1001.jpeg", bad], tmp_path / "split", image_size=(8, 8))
+        dataset = FrankSignDataset.from_image_store(store)
+        assert [p.name for p in dataset.image_paths] == ["Ali Veli-1001.jpeg"]
+
+
+# ============================================================
+# TESTS FOR FrankSignSegmentationDataset
+# ============================================================
+
+@pytest.fixture
+def seg_dir(tmp_path):
+    """Image directory matching the default ``make_annotations`` image."""
+    Image.new("RGB", (400, 200), color=(200, 150, 120)).save(tmp_path / "ear-1001.jpeg")
+    return tmp_path
+
+
+class TestRasterizeAnnotations:
+    """Tests for rasterize_annotations."""
+
+    def test_scaled_to_target_size(self, make_annotations):
+        """Geometry is scaled from CVAT size to the target size."""
+        mask = rasterize_annotations(make_annotations(), image_size=(100, 200), line_thickness=1)
+        assert mask.shape == (100, 200)
+        assert mask.dtype == np.uint8
+        assert mask[50, 100] == 1  # line at y=100/2, x=200/2
+        assert mask[30, 60] == 2  # inside region
+        assert mask[5, 5] == 0
+
+    def test_absent_line_skipped(self, make_annotations):
+        """Lines marked absent are not drawn."""
+        mask = rasterize_annotations(make_annotations(presence="absent"), image_size=(100, 200))
+        assert set(np.unique(mask)) == {0, 2}
+
+    def test_invalid_size_raises(self, make_annotations):
+        """A zero CVAT size is reported with the image name."""
+        with pytest.raises(ValueError, match="ear-1001.jpeg"):
+            rasterize_annotations(make_annotations(width=0), image_size=(100, 200))
+
+
+class TestFrankSignSegmentationDataset:
+    """Tests for FrankSignSegmentationDataset."""
+
+    def test_sample_tensors(self, seg_dir, make_annotations):
+        """Samples are CHW float images and HW long masks at target size."""
+        dataset = FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(64, 128))
+        sample = dataset[0]
+        assert sample["image"].shape == (3, 64, 128)
+        assert sample["image"].dtype == torch.float32
+        assert float(sample["image"].max()) <= 1.0
+        assert sample["mask"].shape == (64, 128)
+        assert sample["mask"].dtype == torch.long
+        assert set(sample["mask"].unique().tolist()) == {0, 1, 2}
+
+    def test_collates_for_trainer(self, seg_dir, make_annotations):
+        """Default DataLoader collation yields image/mask batches."""
+        from torch.utils.data import DataLoader
+
+        dataset = FrankSignSegmentationDataset(seg_dir, [make_annotations()] * 3, image_size=(32, 32))
+        batch = next(iter(DataLoader(dataset, batch_size=3)))
+        assert batch["image"].shape == (3, 3, 32, 32)
+        assert batch["mask"].shape == (3, 32, 32)
+
+    def test_masks_cached_on_disk(self, seg_dir, tmp_path, monkeypatch, make_annotations):
+        """Masks are rasterized once and reused from the disk cache."""
+        import franksign.data.dataset as dataset_module
+
+        cache_dir = tmp_path / "masks"
+        dataset = FrankSignSegmentationDataset(
+            seg_dir, [make_annotations()], image_size=(32, 64), cache_dir=cache_dir
+        )
+        assert dataset.build_masks() == 1
+        assert dataset.build_masks() == 0
+        assert len(list(cache_dir.glob("*.png"))) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("mask was re-rasterized")
+
+        monkeypatch.setattr(dataset_module, "rasterize_annotations", fail)
+        fresh = FrankSignSegmentationDataset(
+            seg_dir, [make_annotations()], image_size=(32, 64), cache_dir=cache_dir
+        )
+        expected = rasterize_annotations(make_annotations(), (32, 64))
+        assert np.array_equal(fresh[0]["mask"].numpy(), expected)
+
+    def test_mask_stats_cached(self, seg_dir, tmp_path, monkeypatch, make_annotations):
+        """Pixel counts are computed from masks once and then read from the cache."""
+        cache_dir = tmp_path / "masks"
+        annotations = [make_annotations(), make_annotations(presence="absent")]
+        dataset = FrankSignSegmentationDataset(seg_dir, annotations, image_size=(32, 64), cache_dir=cache_dir)
+        stats = dataset.mask_stats()
+        assert stats.shape == (2, 3)
+        assert (stats.sum(axis=1) == 32 * 64).all()
+        assert stats[0, 1] > 0 and stats[1, 1] == 0
+        assert (cache_dir / "mask_stats.json").exists()
+
+        fresh = FrankSignSegmentationDataset(seg_dir, annotations, image_size=(32, 64), cache_dir=cache_dir)
+        monkeypatch.setattr(fresh, "load_mask", lambda idx: pytest.fail("mask was read"))
+        assert np.array_equal(fresh.mask_stats(), stats)
+
+    def test_cache_key_changes(self, make_annotations):
+        """Cache keys depend on geometry, target size and thickness."""
+        base = mask_cache_key(make_annotations(), (32, 32), 3)
+        moved = make_annotations()
+        moved.polylines[0].points[1] = Point(290, 100)
+        assert mask_cache_key(moved, (32, 32), 3) != base
+        assert mask_cache_key(make_annotations(), (64, 64), 3) != base
+        assert mask_cache_key(make_annotations(), (32, 32), 5) != base
+        assert mask_cache_key(make_annotations(), (32, 32), 3) == base
+
+    def test_mask_cache_roundtrip(self, tmp_path):
+        """MaskCache stores uint8 masks losslessly."""
+        cache = MaskCache(tmp_path)
+        mask = np.random.default_rng(0).integers(0, 3, size=(16, 24), dtype=np.uint8)
+        assert cache.get("k") is None
+        cache.put("k", mask)
+        assert np.array_equal(cache.get("k"), mask)
+
+    def test_transform_applied(self, seg_dir, make_annotations):
+        """Albumentations-style transforms receive and return image and mask."""
+        def flip(image, mask):
+            return {"image": image[:, ::-1], "mask": mask[:, ::-1]}
+
+        plain = FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 64))
+        flipped = FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 64), transform=flip)
+        assert torch.equal(flipped[0]["mask"], plain[0]["mask"].flip(1))
+
+    def test_image_store_matches_decoding(self, seg_dir, tmp_path, make_annotations):
+        """Reading from an image store gives the same samples as decoding."""
+        store = build_image_store([seg_dir / "ear-1001.jpeg"], tmp_path / "store", image_size=(32, 64))
+        decoded = FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 64))
+        stored = FrankSignSegmentationDataset(
+            seg_dir, [make_annotations()], image_size=(32, 64), image_store=store
+        )
+        assert torch.equal(stored[0]["image"], decoded[0]["image"])
+        assert torch.equal(stored[0]["mask"], decoded[0]["mask"])
+
+    def test_image_store_size_mismatch(self, seg_dir, tmp_path, make_annotations):
+        """A store built at another size is rejected."""
+        store = build_image_store([seg_dir / "ear-1001.jpeg"], tmp_path / "store", image_size=(16, 16))
+        with pytest.raises(ValueError, match="does not match"):
+            FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 64), image_store=store)
+
+    def test_roi_mode(self, seg_dir, tmp_path, make_annotations):
+        """ROI mode crops image and mask to the same box."""
+        image = make_annotations()
+        dataset = FrankSignSegmentationDataset(seg_dir, [image], image_size=(50, 50), roi_margin=0.0)
+        assert dataset.boxes == [(100, 0, 300, 200)]  # region box, squared
+        expected = rasterize_annotations(crop_annotations(image, dataset.boxes[0]), (50, 50))
+        assert np.array_equal(dataset.load_mask(0), expected)
+        assert dataset.load_image(0).shape == (50, 50, 3)
+
+        full = FrankSignSegmentationDataset(seg_dir, [image], image_size=(50, 50))
+        assert (dataset.load_mask(0) > 0).sum() > 1.5 * (full.load_mask(0) > 0).sum()
+
+    def test_roi_store_must_match(self, seg_dir, tmp_path, make_annotations):
+        """Stores built with other crops are rejected; matching ones are used."""
+        plain = build_image_store([seg_dir / "ear-1001.jpeg"], tmp_path / "plain", image_size=(32, 32))
+        with pytest.raises(ValueError, match="ROI box"):
+            FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 32),
+                                         image_store=plain, roi_margin=0.1)
+
+        decoded = FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 32), roi_margin=0.1)
+        store = build_image_store([seg_dir / "ear-1001.jpeg"], tmp_path / "roi", image_size=(32, 32),
+                                  boxes=decoded.boxes)
+        stored = FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 32),
+                                              image_store=store, roi_margin=0.1)
+        assert torch.equal(stored[0]["image"], decoded[0]["image"])
+
+    def test_letterbox_store_rejected(self, seg_dir, tmp_path, make_annotations):
+        store = build_image_store([seg_dir / "ear-1001.jpeg"], tmp_path / "store", image_size=(32, 32))
+        store.letterbox = True
+        with pytest.raises(ValueError, match="Letterboxed"):
+            FrankSignSegmentationDataset(seg_dir, [make_annotations()], image_size=(32, 32), image_store=store)
+
+    def test_from_config_filters_split(self, seg_dir, tmp_path, make_annotations):
+        """from_config uses config paths/sizes and restricts to split files."""
+        config = {"data": {"images_dir": str(seg_dir), "image_size": [16, 16],
+                           "processed_dir": str(tmp_path / "processed")}}
+        annotations = [make_annotations(), make_annotations(name="other.jpeg")]
+        dataset = FrankSignSegmentationDataset.from_config(config, annotations, split_files=["ear-1001.jpeg"])
+        assert len(dataset) == 1
+        assert dataset[0]["mask"].shape == (16, 16)
+        assert (tmp_path / "processed" / "masks").is_dir()
+
+    def test_from_config_reads_split_file(self, seg_dir, tmp_path, make_annotations):
+        """from_config(split=...) loads names from data.splits_dir."""
+        splits_dir = tmp_path / "splits"
+        splits_dir.mkdir()
+        (splits_dir / "val.txt").write_text("ear-1001.jpeg\n", encoding="utf-8")
+        config = {"data": {"images_dir": str(seg_dir), "image_size": [16, 16],
+                           "processed_dir": str(tmp_path / "processed"), "splits_dir": str(splits_dir)}}
+        annotations = [make_annotations(), make_annotations(name="other.jpeg")]
+        dataset = FrankSignSegmentationDataset.from_config(config, annotations, split="val")
+        assert [a.name for a in dataset.annotations] == ["ear-1001.jpeg"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
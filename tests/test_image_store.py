@@ -0,0 +1,197 @@
+"""Tests for image_store module."""
+
+import json
+import pickle
+import pytest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from franksign.data.image_store import (
+    IMAGE_STORE_VERSION,
+    ImageStore,
+    ImageStoreWriter,
+    build_image_store,
+    decode_resized,
+    store_paths,
+)
+from franksign.data.preprocess import load_resized
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def image_paths(tmp_path):
+    """Three solid-colour images of different sizes plus one corrupt file."""
+    src = tmp_path / "src"
+    src.mkdir()
+    paths = []
+    for i, size in enumerate([(120, 80), (64, 64), (30, 90)]):
+        path = src / f"img{i}.png"
+        Image.new("RGB", size, color=(40 * i, 10, 200)).save(path)
+        paths.append(path)
+    bad = src / "bad.jpg"
+    bad.write_bytes(b"broken")
+    return paths, bad
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+class TestStorePaths:
+    """Tests for store_paths."""
+
+    @pytest.mark.parametrize("given", ["out/train", "out/train.npy", "out/train.index.json"])
+    def test_base_or_file_paths(self, given):
+        """Base path and either file resolve to the same pair."""
+        assert store_paths(given) == (Path("out/train.npy"), Path("out/train.index.json"))
+
+
+class TestBuildImageStore:
+    """Tests for build_image_store and ImageStore."""
+
+    @pytest.mark.parametrize("n_jobs", [1, 2])
+    def test_rows_match_decoded_images(self, image_paths, tmp_path, n_jobs):
+        """Each row equals the resized decode of its source image."""
+        paths, _ = image_paths
+        store = build_image_store(paths, tmp_path / "store", image_size=(32, 48), n_jobs=n_jobs)
+
+        assert store.array.shape == (3, 32, 48, 3)
+        assert store.array.dtype == np.uint8
+        assert store.names == ["img0.png", "img1.png", "img2.png"]
+        for i, path in enumerate(paths):
+            assert np.array_equal(store[i], decode_resized(path, (32, 48)))
+        assert np.array_equal(store.get("img1.png"), store[1])
+
+    def test_resample_recorded(self, tmp_path):
+        """Rows use the load_resized filter by default; the filter is recorded."""
+        path = tmp_path / "noise.png"
+        Image.fromarray(np.random.default_rng(0).integers(0, 256, (90, 70, 3), dtype=np.uint8)).save(path)
+
+        store = build_image_store([path], tmp_path / "default", image_size=(32, 24))
+        assert store.resample == "bicubic"
+        assert np.array_equal(store[0], np.asarray(load_resized(path, (32, 24))))
+
+        store = build_image_store(
+            [path], tmp_path / "bilinear", image_size=(32, 24), resample=Image.Resampling.BILINEAR
+        )
+        assert ImageStore(tmp_path / "bilinear").resample == "bilinear"
+        assert np.array_equal(store[0], decode_resized(path, (32, 24), resample=Image.Resampling.BILINEAR))
+
+    def test_reads_are_memmap_views(self, image_paths, tmp_path):
+        """Rows are read-only views of the memory map, not copies."""
+        paths, _ = image_paths
+        store = build_image_store(paths, tmp_path / "store", image_size=(16, 16))
+        row = store[0]
+        assert isinstance(store.array, np.memmap)
+        assert not row.flags.writeable
+        assert np.shares_memory(row, store.array)
+
+    def test_index_file(self, image_paths, tmp_path):
+        """Index records version, size, names and sources."""
+        paths, _ = image_paths
+        build_image_store(paths, tmp_path / "store", image_size=(16, 24))
+        index = json.loads((tmp_path / "store.index.json").read_text(encoding="utf-8"))
+        assert index["version"] == IMAGE_STORE_VERSION
+        assert index["image_size"] == [16, 24]
+        assert index["sources"] == [str(p) for p in paths]
+        assert not (tmp_path / "store.tmp.npy").exists()
+
+    def test_decode_errors_recorded(self, image_paths, tmp_path):
+        """Undecodable images are zero-filled and listed in errors."""
+        paths, bad = image_paths
+        store = build_image_store([paths[0], bad], tmp_path / "store", image_size=(8, 8))
+        assert list(store.errors) == ["bad.jpg"]
+        assert not store[1].any()
+
+    def test_duplicate_names_rejected(self, image_paths, tmp_path):
+        """File names must be unique so lookups by name are unambiguous."""
+        paths, _ = image_paths
+        other = tmp_path / "other"
+        other.mkdir()
+        Image.new("RGB", (8, 8)).save(other / "img0.png")
+        with pytest.raises(ValueError, match="unique"):
+            build_image_store([paths[0], other / "img0.png"], tmp_path / "store")
+
+    def test_pickle_drops_memmap(self, image_paths, tmp_path):
+        """Pickling sends only the index; the copy maps the file itself."""
+        paths, _ = image_paths
+        store = build_image_store(paths, tmp_path / "store", image_size=(64, 64))
+        _ = store.array
+        payload = pickle.dumps(store)
+        assert len(payload) < store.array.nbytes / 10
+        restored = pickle.loads(payload)
+        assert np.array_equal(restored[2], store[2])
+
+    def test_reopen_and_version_check(self, image_paths, tmp_path):
+        """Stores reopen from disk; unknown versions are rejected."""
+        paths, _ = image_paths
+        build_image_store(paths, tmp_path / "store", image_size=(8, 8))
+        assert len(ImageStore(tmp_path / "store")) == 3
+
+        index_path = tmp_path / "store.index.json"
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        index["version"] = "0"
+        index_path.write_text(json.dumps(index), encoding="utf-8")
+        with pytest.raises(ValueError, match="version"):
+            ImageStore(tmp_path / "store")
+
+    def test_crop_boxes(self, image_paths, tmp_path):
+        """Rows hold the resized crop; boxes are kept in the index."""
+        paths, _ = image_paths
+        boxes = [(10, 20, 60, 70), None, None]
+        store = build_image_store(paths, tmp_path / "store", image_size=(16, 16), boxes=boxes)
+        assert store.boxes == boxes
+        assert np.array_equal(store[0], decode_resized(paths[0], (16, 16), box=boxes[0]))
+        assert np.array_equal(store[1], decode_resized(paths[1], (16, 16)))
+        assert ImageStore(tmp_path / "store").boxes == boxes
+        with pytest.raises(ValueError, match="one entry"):
+            build_image_store(paths, tmp_path / "bad", boxes=boxes[:1])
+
+    def test_empty_store(self, tmp_path):
+        """An empty image list produces an empty store."""
+        store = build_image_store([], tmp_path / "empty", image_size=(8, 8))
+        assert len(store) == 0
+        assert store.array.shape == (0, 8, 8, 3)
+
+
+class TestImageStoreWriter:
+    """Tests for ImageStoreWriter layout and masks."""
+
+    def test_data_offset_locates_rows(self, image_paths, tmp_path):
+        """Rows can be read from the raw file using the indexed offset and shape."""
+        paths, _ = image_paths
+        store = build_image_store(paths, tmp_path / "store", image_size=(8, 12))
+        index = json.loads(store.index_path.read_text(encoding="utf-8"))
+        assert index["shape"] == [3, 8, 12, 3]
+        raw = np.fromfile(store.array_path, dtype=np.uint8, offset=index["data_offset"]).reshape(index["shape"])
+        assert np.array_equal(raw, store.array)
+
+    def test_masks(self, tmp_path):
+        writer = ImageStoreWriter(tmp_path / "store", ["a.jpg", "b.jpg"], ["a.jpg", "b.jpg"], (4, 6), masks=True)
+        writer.write(0, np.full((4, 6, 3), 7, dtype=np.uint8))
+        writer.write_mask(1, np.ones((4, 6), dtype=np.uint8))
+        store = writer.close()
+        assert store.annotated == [False, True]
+        assert store.get_mask("a.jpg") is None
+        assert store.get_mask("b.jpg").sum() == 24
+        assert "b.jpg" in store and "c.jpg" not in store
+        assert not pickle.loads(pickle.dumps(store))._masks
+
+    def test_no_masks(self, tmp_path):
+        writer = ImageStoreWriter(tmp_path / "store", ["a.jpg"], ["a.jpg"], (4, 6))
+        with pytest.raises(ValueError):
+            writer.write_mask(0, np.zeros((4, 6), dtype=np.uint8))
+        store = writer.close()
+        assert store.masks is None and store.get_mask("a.jpg") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,248 @@
+"""Tests for letterbox module."""
+
+import os
+import pytest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from franksign.data.augmentation import rasterize_annotations
+from franksign.data.cvat_parser import ImageAnnotations, Point
+from franksign.data.letterbox import (
+    GEOMETRY_FILE,
+    PackedGeometry,
+    letterbox_matrices,
+    transform_annotations,
+)
+from franksign.data.image_store import ImageStore
+from franksign.data.preprocess import (
+    PACKED_STORE,
+    PREPROCESS_MANIFEST,
+    PreprocessConfig,
+    PreprocessManifest,
+    load_resized,
+    preprocess_images,
+    preprocess_packed,
+)
+
+LETTERBOX = PreprocessConfig(letterbox=True)
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def wide_annotations(make_annotations):
+    """``make_annotations`` for ``wide_image`` by default, with an earlobe tip."""
+    return lambda name="wide.png", **kwargs: make_annotations(name, earlobe_tip=True, **kwargs)
+
+
+@pytest.fixture
+def wide_image(tmp_path):
+    """400x200 grey PNG with a white rectangle where the region is annotated."""
+    pixels = np.full((200, 400, 3), 90, dtype=np.uint8)
+    pixels[50:150, 100:300] = 255
+    input_dir = tmp_path / "raw"
+    input_dir.mkdir()
+    Image.fromarray(pixels).save(input_dir / "wide.png")
+    return input_dir
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+class TestLetterboxMatrices:
+    """Tests for letterbox_matrices."""
+
+    def test_fit_and_centre(self):
+        """A 2:1 image in a square keeps its ratio and is centred vertically."""
+        matrices, content = letterbox_matrices([(400, 200), (100, 300)], (128, 128))
+        assert content.tolist() == [[0, 32, 128, 96], [42, 0, 85, 128]]
+        assert np.allclose(matrices[0], [[0.32, 0, 0], [0, 0.32, 32]])
+
+    def test_stretch(self):
+        matrices, content = letterbox_matrices([(400, 200)], (64, 128), letterbox=False)
+        assert content.tolist() == [[0, 0, 128, 64]]
+        assert np.allclose(matrices[0], [[0.32, 0, 0], [0, 0.32, 0]])
+
+    def test_box(self):
+        """Crop boxes are shifted to the origin before scaling."""
+        matrices, content = letterbox_matrices([(400, 200)], (50, 50), boxes=[(100, 50, 300, 150)])
+        assert content.tolist() == [[0, 12, 50, 37]]
+        assert np.allclose(matrices[0] @ [100, 50, 1], [0, 12])
+        assert np.allclose(matrices[0] @ [300, 150, 1], [50, 37])
+
+
+class TestPackedGeometry:
+    """Tests for PackedGeometry."""
+
+    def test_roundtrip(self, wide_annotations):
+        empty = ImageAnnotations(id=8, name="empty.jpg", width=10, height=10)
+        images = [wide_annotations(), empty, wide_annotations("b.jpg")]
+        packed = PackedGeometry.from_annotations(images)
+        assert packed.coords.shape == (14, 2)
+        assert packed.offsets.tolist() == [0, 1, 3, 7, 8, 10, 14]
+        assert packed.image_index.tolist() == [0, 0, 0, 2, 2, 2]
+        assert packed.to_annotations() == images
+
+    def test_transform_matches_pointwise(self, wide_annotations):
+        """The vectorized transform equals applying each matrix point by point."""
+        images = [wide_annotations(), wide_annotations("tall.jpg", width=150, height=600)]
+        packed = PackedGeometry.from_annotations(images)
+        matrices, _ = letterbox_matrices(packed.sizes, (64, 96))
+        moved = packed.transform(matrices, (64, 96))
+
+        expected = [
+            matrices[i] @ [x, y, 1]
+            for i, (x, y) in zip(packed.point_image_index(), packed.coords)
+        ]
+        assert np.allclose(moved.coords, expected)
+        assert moved.sizes.tolist() == [[96, 64], [96, 64]]
+        out = moved.to_annotations()
+        assert (out[0].width, out[0].height) == (96, 64)
+        assert out[0].polylines[0].attributes == {"presence": "present"}
+
+    def test_transform_shape_checked(self, wide_annotations):
+        packed = PackedGeometry.from_annotations([wide_annotations()])
+        with pytest.raises(ValueError):
+            packed.transform(np.zeros((2, 2, 3)), (32, 32))
+
+    def test_save_load(self, tmp_path, wide_annotations):
+        packed = transform_annotations([wide_annotations(), wide_annotations("b.jpg")], (32, 32))
+        loaded = PackedGeometry.load(packed.save(tmp_path / "geometry.npz"))
+        assert loaded.to_annotations() == packed.to_annotations()
+
+
+class TestLetterboxResize:
+    """Tests for letterboxed images and geometry together."""
+
+    def test_load_resized_letterbox(self, wide_image):
+        image = np.asarray(load_resized(wide_image / "wide.png", (128, 128), letterbox=True))
+        assert image.shape == (128, 128, 3)
+        assert (image[:32] == 0).all() and (image[96:] == 0).all()
+        assert (image[40, 5] == 90).all()
+
+    def test_mask_aligns_with_pixels(self, wide_image, wide_annotations):
+        """A mask rasterized from transformed geometry covers the white rectangle."""
+        image = np.asarray(load_resized(wide_image / "wide.png", (128, 128), letterbox=True))
+        annotations = transform_annotations([wide_annotations()], (128, 128)).to_annotations()[0]
+        mask = rasterize_annotations(annotations, line_thickness=1)
+
+        white = image[..., 0] > 200
+        inside = mask > 0
+        assert inside.sum() > 0
+        assert (white == inside).mean() > 0.99
+
+    def test_box_letterbox(self, wide_image):
+        box = (100, 50, 300, 150)
+        image = np.asarray(load_resized(wide_image / "wide.png", (50, 50), box=box, letterbox=True))
+        assert (image[12:37, 1:49, 0] > 200).all()
+        assert (image[:12] == 0).all()
+
+
+class TestPreprocessGeometry:
+    """Tests for preprocess_images with letterbox and annotations."""
+
+    def test_writes_geometry(self, wide_image, tmp_path, wide_annotations):
+        output_dir = tmp_path / "out"
+        preprocess_images(
+            wide_image, output_dir, image_size=(64, 64), config=LETTERBOX, annotations=[wide_annotations()]
+        )
+        assert Image.open(output_dir / "wide.png").size == (64, 64)
+        geometry = PackedGeometry.load(output_dir / GEOMETRY_FILE).to_annotations()[0]
+        assert geometry.polygons[0].points[0] == Point(16.0, 24.0)
+
+    def test_letterbox_in_settings(self, wide_image, tmp_path):
+        """Switching to letterbox reprocesses incremental outputs."""
+        output_dir = tmp_path / "out"
+        assert preprocess_images(wide_image, output_dir, config=PreprocessConfig(incremental=True)) == (1, 0)
+        config = PreprocessConfig(incremental=True, letterbox=True)
+        assert preprocess_images(wide_image, output_dir, config=config) == (1, 0)
+        entry = PreprocessManifest.load(output_dir / PREPROCESS_MANIFEST).entries["wide.png"]
+        assert entry[3].endswith("/letterbox")
+
+
+class TestPackedOutput:
+    """Tests for preprocess_packed."""
+
+    def test_store_with_masks(self, wide_image, tmp_path, wide_annotations):
+        """Images and masks land in one store whose masks match the pixels."""
+        Image.new("RGB", (50, 80), color=(10, 20, 30)).save(wide_image / "other.png")
+        output_dir = tmp_path / "out"
+        result = preprocess_packed(
+            wide_image, output_dir, image_size=(64, 64), config=LETTERBOX, annotations=[wide_annotations()],
+            line_thickness=1,
+        )
+        assert result == (2, 0)
+        assert not (output_dir / "wide.png").exists()
+
+        store = ImageStore(output_dir / PACKED_STORE)
+        assert store.names == ["other.png", "wide.png"]
+        assert store.letterbox and store.annotated == [False, True]
+        assert np.array_equal(store.get("wide.png"), np.asarray(load_resized(wide_image / "wide.png", (64, 64), letterbox=True)))
+        white = store.get("wide.png")[..., 0] > 200
+        assert (white == (store.get_mask("wide.png") > 0)).mean() > 0.98
+
+    def test_masks_matched_by_file_name(self, wide_image, tmp_path, caplog, wide_annotations):
+        """Images in subdirectories get their masks; unmatched annotations are logged."""
+        (wide_image / "site_a").mkdir()
+        (wide_image / "wide.png").rename(wide_image / "site_a" / "wide.png")
+        output_dir = tmp_path / "out"
+        with caplog.at_level("WARNING", logger="franksign.data.preprocess"):
+            preprocess_packed(
+                wide_image, output_dir, image_size=(32, 32),
+                annotations=[wide_annotations(), wide_annotations("missing.png")],
+            )
+        store = ImageStore(output_dir / PACKED_STORE)
+        assert store.names == ["wide.png"] and store.annotated == [True]
+        assert "missing.png" in caplog.text and "1 annotated images" in caplog.text
+
+    def test_incremental_reuses_rows(self, wide_image, tmp_path, monkeypatch):
+        """Unchanged rows are copied from the previous store without decoding."""
+        import franksign.data.preprocess as preprocess_module
+
+        Image.new("RGB", (50, 80), color=(10, 20, 30)).save(wide_image / "other.png")
+        output_dir = tmp_path / "out"
+        kwargs = dict(image_size=(32, 32), config=PreprocessConfig(incremental=True))
+        assert preprocess_packed(wide_image, output_dir, **kwargs) == (2, 0)
+        first = np.array(ImageStore(output_dir / PACKED_STORE).array)
+
+        Image.new("RGB", (50, 80), color=(200, 20, 30)).save(wide_image / "other.png")
+        stat = (wide_image / "other.png").stat()
+        os.utime(wide_image / "other.png", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**10))
+        decoded = []
+        original = preprocess_module.load_resized
+        monkeypatch.setattr(
+            preprocess_module, "load_resized", lambda path, *a, **k: decoded.append(path.name) or original(path, *a, **k)
+        )
+        assert preprocess_packed(wide_image, output_dir, **kwargs) == (1, 1)
+        assert decoded == ["other.png"]
+        store = ImageStore(output_dir / PACKED_STORE)
+        assert np.array_equal(store.get("wide.png"), first[1])
+        assert store.get("other.png")[0, 0, 0] > 150
+
+        (wide_image / "other.png").unlink()
+        removed = []
+        assert preprocess_packed(wide_image, output_dir, removed=removed, **kwargs) == (0, 1)
+        assert removed == [Path("other.png")]
+        assert ImageStore(output_dir / PACKED_STORE).names == ["wide.png"]
+
+    def test_failed_rows_zero_filled(self, wide_image, tmp_path):
+        (wide_image / "broken.jpg").write_bytes(b"not a jpeg")
+        errors = []
+        output_dir = tmp_path / "out"
+        assert preprocess_packed(wide_image, output_dir, image_size=(16, 16), errors=errors) == (1, 0)
+        store = ImageStore(output_dir / PACKED_STORE)
+        assert list(store.errors) == ["broken.jpg"]
+        assert not store.get("broken.jpg").any()
+        assert [p.name for p, _ in errors] == ["broken.jpg"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,205 @@
+"""Tests for manifest module."""
+
+import json
+import os
+import pytest
+from pathlib import Path
+
+from PIL import Image
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import franksign.data.manifest as manifest_module
+from franksign.data.manifest import MANIFEST_VERSION, ImageManifest, manifest_paths
+from franksign.data.preprocess import preprocess_images
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def tree(tmp_path):
+    """Nested image tree with a non-image file."""
+    root = tmp_path / "raw"
+    (root / "site_a" / "2024").mkdir(parents=True)
+    (root / "site_b").mkdir()
+    Image.new("RGB", (40, 30)).save(root / "Ali Veli-1001.jpeg")
+    Image.new("RGB", (20, 10)).save(root / "site_a" / "2024" / "1002 - Ayse Kaya.png")
+    Image.new("RGB", (8, 8)).save(root / "site_b" / "Unknown.JPG")
+    (root / "site_b" / "notes.txt").write_text("not an image")
+    return root
+
+
+def _touch_later(path: Path) -> None:
+    """Advance a path's mtime so the change is visible on coarse clocks."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+class TestImageManifest:
+    """Tests for ImageManifest."""
+
+    def test_build_records(self, tree):
+        """Images are listed recursively with size, dimensions and patient_id."""
+        manifest = ImageManifest(tree)
+        stats = manifest.refresh(n_jobs=2)
+
+        assert stats == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+        assert manifest.relative_paths() == [
+            "Ali Veli-1001.jpeg", "site_a/2024/1002 - Ayse Kaya.png", "site_b/Unknown.JPG",
+        ]
+        record = manifest.get("site_a/2024/1002 - Ayse Kaya.png")
+        assert (record["width"], record["height"], record["patient_id"]) == (20, 10, "1002")
+        assert record["size"] == (tree / "site_a" / "2024" / "1002 - Ayse Kaya.png").stat().st_size
+        assert manifest.get("site_b/Unknown.JPG")["patient_id"] is None
+        assert set(manifest.dirs) == {"", "site_a", "site_a/2024", "site_b"}
+
+    def test_save_load_round_trip(self, tree, tmp_path):
+        """The columnar JSON file reloads to the same entries."""
+        manifest = ImageManifest(tree, tmp_path / "manifest.json")
+        manifest.refresh()
+        manifest.save()
+
+        data = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+        assert data["version"] == MANIFEST_VERSION
+        assert len(data["columns"]["path"]) == 3
+        loaded = ImageManifest.load(tmp_path / "manifest.json")
+        assert loaded.entries == manifest.entries
+        assert loaded.paths() == manifest.paths()
+        assert list(loaded.to_frame()["width"]) == [40, 20, 8]
+
+    def test_incremental_refresh(self, tree, monkeypatch):
+        """Only new or changed files have their headers re-read."""
+        manifest = ImageManifest(tree)
+        manifest.refresh()
+
+        Image.new("RGB", (16, 12)).save(tree / "site_b" / "Yeni-1003.jpeg")
+        Image.new("RGB", (50, 30)).save(tree / "Ali Veli-1001.jpeg")
+        _touch_later(tree / "Ali Veli-1001.jpeg")
+        (tree / "site_b" / "Unknown.JPG").unlink()
+
+        read = []
+        original = manifest_module.read_image_header
+        monkeypatch.setattr(manifest_module, "read_image_header", lambda p: read.append(Path(p).name) or original(p))
+
+        stats = manifest.refresh()
+        assert stats == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1}
+        assert sorted(read) == ["Ali Veli-1001.jpeg", "Yeni-1003.jpeg"]
+        assert manifest.get("Ali Veli-1001.jpeg")["width"] == 50
+        assert "site_b/Unknown.JPG" not in manifest
+
+    def test_quick_refresh_skips_unchanged_dirs(self, tree, monkeypatch):
+        """Quick refresh re-lists only directories whose mtime changed."""
+        manifest = ImageManifest(tree)
+        manifest.refresh()
+        Image.new("RGB", (16, 12)).save(tree / "site_b" / "Yeni-1003.jpeg")
+        _touch_later(tree / "site_b")
+
+        scanned = []
+        original = manifest_module._scan_dir
+        monkeypatch.setattr(manifest_module, "_scan_dir", lambda root, rel: scanned.append(rel) or original(root, rel))
+
+        stats = manifest.refresh(quick=True)
+        assert scanned == ["site_b"]
+        assert stats["added"] == 1
+        assert stats["unchanged"] == 3
+        assert "site_a/2024/1002 - Ayse Kaya.png" in manifest
+
+    def test_unreadable_header_recorded(self, tree):
+        """Files with broken headers stay listed with an error."""
+        (tree / "broken.jpg").write_bytes(b"nope")
+        manifest = ImageManifest(tree)
+        manifest.refresh()
+        record = manifest.get("broken.jpg")
+        assert record["width"] is None
+        assert record["error"]
+
+    def test_open_builds_then_loads(self, tree, tmp_path, monkeypatch):
+        """open() builds and saves once, then loads without walking."""
+        path = tmp_path / "manifest.json"
+        built = ImageManifest.open(tree, path)
+        assert path.exists()
+
+        monkeypatch.setattr(manifest_module, "_scan_dir", lambda *a: pytest.fail("tree was walked"))
+        loaded = ImageManifest.open(tree, path)
+        assert loaded.entries == built.entries
+
+    def test_open_picks_up_new_images(self, tree, tmp_path):
+        """open() quick-refreshes by default; refresh=False trusts the file."""
+        path = tmp_path / "manifest.json"
+        ImageManifest.open(tree, path)
+        Image.new("RGB", (8, 8)).save(tree / "Yeni-1003.jpeg")
+        _touch_later(tree)
+
+        assert "Yeni-1003.jpeg" not in ImageManifest.open(tree, path, refresh=False)
+        assert "Yeni-1003.jpeg" in ImageManifest.open(tree, path)
+        assert "Yeni-1003.jpeg" in ImageManifest.load(path)
+
+    def test_open_rebuilds_for_other_root(self, tree, tmp_path):
+        """A manifest built for another root is rebuilt, not re-rooted."""
+        path = tmp_path / "manifest.json"
+        ImageManifest.open(tree, path)
+        other = tmp_path / "other"
+        other.mkdir()
+        Image.new("RGB", (8, 8)).save(other / "x1.jpg")
+
+        with pytest.raises(ValueError, match="built for"):
+            ImageManifest.load(path, other)
+        manifest = ImageManifest.open(other, path)
+        assert manifest.paths() == [other / "x1.jpg"]
+        assert ImageManifest.load(path, other).relative_paths() == ["x1.jpg"]
+
+    def test_open_never_keeps_empty_manifest(self, tmp_path):
+        """Missing roots raise; empty listings are not saved and are rebuilt."""
+        path = tmp_path / "manifest.json"
+        with pytest.raises(FileNotFoundError):
+            ImageManifest.open(tmp_path / "missing", path)
+
+        root = tmp_path / "raw"
+        root.mkdir()
+        assert len(ImageManifest.open(root, path)) == 0
+        assert not path.exists()
+
+        Image.new("RGB", (8, 8)).save(root / "x1.jpg")
+        assert ImageManifest.open(root, path, refresh=False).relative_paths() == ["x1.jpg"]
+        (root / "x1.jpg").unlink()
+        _touch_later(root)
+        assert len(ImageManifest.open(root, path)) == 0
+        assert not path.exists()
+
+    def test_manifest_paths_filters_missing(self, tree):
+        manifest = ImageManifest(tree)
+        manifest.refresh()
+        assert manifest_paths(manifest, ["Ali Veli-1001.jpeg", "missing.jpeg"]) == [tree / "Ali Veli-1001.jpeg"]
+
+    def test_version_check(self, tree, tmp_path):
+        path = ImageManifest(tree).save(tmp_path / "manifest.json")
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["version"] = "0"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        with pytest.raises(ValueError, match="version"):
+            ImageManifest.load(path)
+
+
+class TestManifestConsumers:
+    """Tests for preprocessing from a manifest."""
+
+    def test_preprocess_uses_manifest(self, tree, tmp_path, monkeypatch):
+        """preprocess_images processes manifest entries without rglob."""
+        manifest = ImageManifest(tree)
+        manifest.refresh()
+        monkeypatch.setattr(Path, "rglob", lambda *a: pytest.fail("tree was walked"))
+
+        processed, skipped = preprocess_images(tree, tmp_path / "out", image_size=(8, 8), manifest=manifest)
+        assert (processed, skipped) == (3, 0)
+        assert (tmp_path / "out" / "site_a" / "2024" / "1002 - Ayse Kaya.png").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -3,13 +3,26 @@
 import pytest
 from pathlib import Path
 from PIL import Image
+import os
 import tempfile
 import shutil
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from franksign.data.preprocess import preprocess_images, _iter_images
+import numpy as np
+
+from franksign.data.preprocess import (
+    PREPROCESS_MANIFEST,
+    PreprocessConfig,
+    PreprocessManifest,
+    _iter_images,
+    file_hash,
+    load_resized,
+    preprocess_images,
+)
+
+INCREMENTAL = PreprocessConfig(incremental=True)
 
 
 # ============================================================
@@ -137,10 +150,252 @@ class TestPreprocessImages:
         input_dir, output_dir = temp_dirs
         
         processed, skipped = preprocess_images(input_dir, output_dir)
-        
+
         assert processed == 0
         assert skipped == 0
 
+    def test_process_pool_matches_serial(self, sample_images, tmp_path):
+        """Worker processes produce the same files as the in-process path."""
+        input_dir, output_dir = sample_images
+        assert preprocess_images(input_dir, output_dir, config=PreprocessConfig(n_jobs=1)) == (4, 0)
+        assert preprocess_images(input_dir, tmp_path / "pool", config=PreprocessConfig(n_jobs=2)) == (4, 0)
+        for path in output_dir.rglob("*.*"):
+            pooled = tmp_path / "pool" / path.relative_to(output_dir)
+            assert np.array_equal(np.asarray(Image.open(path)), np.asarray(Image.open(pooled)))
+
+    def test_progress_in_input_order(self, sample_images):
+        """Progress is reported once per processed image, in order."""
+        input_dir, output_dir = sample_images
+        Image.new("RGB", (8, 8)).save(output_dir / "test1.jpg")
+        calls = []
+        preprocess_images(
+            input_dir, output_dir, config=PreprocessConfig(n_jobs=2), progress=lambda *args: calls.append(args)
+        )
+        assert [c[0] for c in calls] == [1, 2, 3]
+        assert all(c[1] == 3 for c in calls)
+        assert [c[2] for c in calls] == [p for p in _iter_images(input_dir) if p.name != "test1.jpg"]
+
+    @pytest.mark.parametrize("n_jobs", [1, 2])
+    def test_corrupt_file_captured(self, sample_images, n_jobs):
+        """A corrupt file is reported without aborting or leaving output."""
+        input_dir, output_dir = sample_images
+        (input_dir / "broken.jpg").write_bytes(b"not a jpeg")
+        errors = []
+        processed, skipped = preprocess_images(
+            input_dir, output_dir, config=PreprocessConfig(n_jobs=n_jobs), errors=errors
+        )
+        assert (processed, skipped) == (4, 0)
+        assert [path.name for path, _ in errors] == ["broken.jpg"]
+        assert "UnidentifiedImageError" in errors[0][1]
+        assert not (output_dir / "broken.jpg").exists()
+        assert not list(output_dir.glob(".*.tmp"))
+
+
+# ============================================================
+# TESTS FOR incremental preprocessing
+# ============================================================
+
+def _touch(path, seconds=10):
+    """Move a file's mtime forward without changing its content."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+class TestIncrementalPreprocess:
+    """Tests for preprocess_images with PreprocessConfig(incremental=True)."""
+
+    def test_unchanged_skipped(self, sample_images):
+        input_dir, output_dir = sample_images
+        assert preprocess_images(input_dir, output_dir, config=INCREMENTAL) == (4, 0)
+        assert len(PreprocessManifest.load(output_dir / PREPROCESS_MANIFEST)) == 4
+        assert preprocess_images(input_dir, output_dir, config=INCREMENTAL) == (0, 4)
+
+    def test_changed_source_reprocessed(self, sample_images):
+        """A source edited in place is redone; a plain existence check would skip it."""
+        input_dir, output_dir = sample_images
+        preprocess_images(input_dir, output_dir, config=INCREMENTAL)
+        Image.new("RGB", (100, 100), color=(255, 0, 0)).save(input_dir / "test1.jpg")
+        _touch(input_dir / "test1.jpg")
+
+        assert preprocess_images(input_dir, output_dir) == (0, 4)
+        calls = []
+        result = preprocess_images(
+            input_dir, output_dir, config=INCREMENTAL, progress=lambda *args: calls.append(args)
+        )
+        assert result == (1, 3)
+        assert [c[2].name for c in calls] == ["test1.jpg"]
+        assert Image.open(output_dir / "test1.jpg").getpixel((50, 50))[0] > 200
+
+    def test_settings_change_reprocesses(self, sample_images):
+        input_dir, output_dir = sample_images
+        preprocess_images(input_dir, output_dir, config=INCREMENTAL)
+        assert preprocess_images(input_dir, output_dir, image_size=(32, 32), config=INCREMENTAL) == (4, 0)
+        assert preprocess_images(
+            input_dir, output_dir, image_size=(32, 32),
+            config=PreprocessConfig(resample=Image.Resampling.BILINEAR, incremental=True),
+        ) == (4, 0)
+        assert Image.open(output_dir / "test1.jpg").size == (32, 32)
+
+    def test_deleted_source_pruned(self, sample_images):
+        """Outputs of deleted sources are removed; unrelated files are kept."""
+        input_dir, output_dir = sample_images
+        preprocess_images(input_dir, output_dir, config=INCREMENTAL)
+        (output_dir / "notes.txt").write_text("keep")
+        (input_dir / "subdir" / "nested.jpg").unlink()
+
+        removed = []
+        assert preprocess_images(input_dir, output_dir, config=INCREMENTAL, removed=removed) == (0, 3)
+        assert removed == [output_dir / "subdir" / "nested.jpg"]
+        assert not removed[0].exists()
+        assert (output_dir / "notes.txt").exists()
+        assert "subdir/nested.jpg" not in PreprocessManifest.load(output_dir / PREPROCESS_MANIFEST).entries
+
+    def test_missing_output_regenerated(self, sample_images):
+        input_dir, output_dir = sample_images
+        preprocess_images(input_dir, output_dir, config=INCREMENTAL)
+        (output_dir / "test2.png").unlink()
+        assert preprocess_images(input_dir, output_dir, config=INCREMENTAL) == (1, 3)
+
+    def test_hash_ignores_touch(self, sample_images):
+        """With content hashes, an mtime-only change is not reprocessed."""
+        input_dir, output_dir = sample_images
+        hashed = PreprocessConfig(incremental=True, hash_sources=True)
+        preprocess_images(input_dir, output_dir, config=hashed)
+        _touch(input_dir / "test1.jpg")
+        assert preprocess_images(input_dir, output_dir, config=hashed) == (0, 4)
+        entry = PreprocessManifest.load(output_dir / PREPROCESS_MANIFEST).entries["test1.jpg"]
+        assert entry[1] == (input_dir / "test1.jpg").stat().st_mtime_ns
+        assert entry[2] == file_hash(input_dir / "test1.jpg")
+
+    def test_failed_file_retried(self, sample_images):
+        input_dir, output_dir = sample_images
+        (input_dir / "broken.jpg").write_bytes(b"not a jpeg")
+        assert preprocess_images(input_dir, output_dir, config=INCREMENTAL) == (4, 0)
+        assert preprocess_images(input_dir, output_dir, config=INCREMENTAL) == (0, 4)
+        Image.new("RGB", (10, 10)).save(input_dir / "broken.jpg")
+        assert preprocess_images(input_dir, output_dir, config=INCREMENTAL) == (1, 4)
+
+    def test_stale_output_removed_on_failure(self, sample_images):
+        """A changed source that fails no longer leaves its old output behind."""
+        input_dir, output_dir = sample_images
+        preprocess_images(input_dir, output_dir, config=INCREMENTAL)
+        (input_dir / "test1.jpg").write_bytes(b"corrupted")
+        _touch(input_dir / "test1.jpg")
+
+        removed, errors = [], []
+        result = preprocess_images(input_dir, output_dir, config=INCREMENTAL, errors=errors, removed=removed)
+        assert result == (0, 3)
+        assert [p.name for p, _ in errors] == ["test1.jpg"]
+        assert removed == [output_dir / "test1.jpg"]
+        assert not (output_dir / "test1.jpg").exists()
+        assert "test1.jpg" not in PreprocessManifest.load(output_dir / PREPROCESS_MANIFEST).entries
+
+    def test_missing_input_dir(self, temp_dirs):
+        input_dir, output_dir = temp_dirs
+        with pytest.raises(FileNotFoundError):
+            preprocess_images(input_dir / "missing", output_dir, config=INCREMENTAL)
+
+    def test_uses_image_manifest_stats(self, sample_images):
+        """With an image manifest, sources are compared using its size/mtime."""
+        from franksign.data.manifest import ImageManifest
+
+        input_dir, output_dir = sample_images
+        image_manifest = ImageManifest(input_dir)
+        image_manifest.refresh()
+        assert preprocess_images(input_dir, output_dir, manifest=image_manifest, config=INCREMENTAL) == (4, 0)
+        assert preprocess_images(input_dir, output_dir, manifest=image_manifest, config=INCREMENTAL) == (0, 4)
+        _touch(input_dir / "test1.jpg")
+        assert preprocess_images(input_dir, output_dir, manifest=image_manifest, config=INCREMENTAL) == (0, 4)
+        image_manifest.refresh()
+        assert preprocess_images(input_dir, output_dir, manifest=image_manifest, config=INCREMENTAL) == (1, 3)
+
+
+# ============================================================
+# TESTS FOR load_resized
+# ============================================================
+
+@pytest.fixture
+def large_jpeg(temp_dirs):
+    """1600x1200 gradient JPEG."""
+    input_dir, _ = temp_dirs
+    x = np.linspace(0, 255, 1600, dtype=np.float32)
+    y = np.linspace(0, 255, 1200, dtype=np.float32)[:, None]
+    pixels = np.stack([np.broadcast_to(x, (1200, 1600)), np.broadcast_to(y, (1200, 1600)),
+                       np.full((1200, 1600), 128.0)], axis=-1).astype(np.uint8)
+    path = input_dir / "large.jpg"
+    Image.fromarray(pixels).save(path, quality=95)
+    return path
+
+
+class TestLoadResized:
+    """Tests for load_resized."""
+
+    def test_draft_decodes_smallest_covering_scale(self, large_jpeg, monkeypatch):
+        """A 1600x1200 JPEG is decoded at 1/4 scale for a 256x300 target."""
+        decoded_sizes = []
+        original_resize = Image.Image.resize
+
+        def spy(self, size, *args, **kwargs):
+            decoded_sizes.append(self.size)
+            return original_resize(self, size, *args, **kwargs)
+
+        monkeypatch.setattr(Image.Image, "resize", spy)
+        image = load_resized(large_jpeg, (256, 300), draft=True)
+        assert image.size == (300, 256)
+        assert image.mode == "RGB"
+        assert decoded_sizes == [(400, 300)]
+
+        load_resized(large_jpeg, (256, 300))
+        assert decoded_sizes[-1] == (1600, 1200)
+
+    def test_draft_close_to_full_decode(self, large_jpeg):
+        """Draft decoding changes pixels only marginally."""
+        fast = np.asarray(load_resized(large_jpeg, (128, 128), draft=True), dtype=np.int16)
+        full = np.asarray(load_resized(large_jpeg, (128, 128), draft=False), dtype=np.int16)
+        assert np.abs(fast - full).mean() < 2.0
+
+    def test_box_crop(self, large_jpeg, monkeypatch):
+        """Crops are drafted relative to the box and match crop-then-resize."""
+        decoded_sizes = []
+        original_resize = Image.Image.resize
+
+        def spy(self, size, *args, **kwargs):
+            decoded_sizes.append(self.size)
+            return original_resize(self, size, *args, **kwargs)
+
+        box = (400, 300, 800, 700)
+        monkeypatch.setattr(Image.Image, "resize", spy)
+        fast = np.asarray(load_resized(large_jpeg, (100, 100), box=box, draft=True), dtype=np.int16)
+        assert decoded_sizes == [(400, 300)]  # 1/4 scale: the crop is still 100x100
+
+        with Image.open(large_jpeg) as im:
+            expected = np.asarray(im.crop(box).resize((100, 100), Image.Resampling.BICUBIC), dtype=np.int16)
+        assert fast.shape == (100, 100, 3)
+        assert np.abs(fast - expected).mean() < 2.0
+
+    def test_default_matches_full_decode(self, large_jpeg, tmp_path):
+        """Without draft, outputs are exactly a full decode plus bicubic resize."""
+        with Image.open(large_jpeg) as im:
+            expected = np.asarray(im.convert("RGB").resize((96, 64), Image.Resampling.BICUBIC))
+        assert np.array_equal(np.asarray(load_resized(large_jpeg, (64, 96))), expected)
+
+        output_dir = tmp_path / "out"
+        preprocess_images(large_jpeg.parent, output_dir, image_size=(64, 96))
+        with Image.open(large_jpeg) as im:
+            reference = im.convert("RGB").resize((96, 64), Image.Resampling.BICUBIC)
+        reference.save(tmp_path / "reference.jpg")
+        assert np.array_equal(
+            np.asarray(Image.open(output_dir / "large.jpg")), np.asarray(Image.open(tmp_path / "reference.jpg"))
+        )
+
+    def test_non_jpeg_unaffected(self, temp_dirs):
+        """Formats without draft support decode normally."""
+        input_dir, _ = temp_dirs
+        Image.new("RGBA", (90, 60), color=(255, 0, 0, 128)).save(input_dir / "x.png")
+        image = load_resized(input_dir / "x.png", (30, 45))
+        assert image.size == (45, 30)
+        assert image.mode == "RGB"
+
 
 # ============================================================
 # TESTS FOR _iter_images
@@ -0,0 +1,116 @@
+"""Tests for fuzzy record linkage module."""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from franksign.data.record_linkage import (
+    CANDIDATE_COLUMNS,
+    FuzzyLinker,
+    id_similarity,
+    name_similarity,
+    normalize_name,
+    parse_image_name,
+)
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def clinical_df():
+    """Small clinical frame with Turkish names."""
+    return pd.DataFrame({
+        "patient_id": ["1763794", "1692185", "911218", "1877674", None],
+        "patient_name": [
+            "BEKİR AKSOY",
+            "AHMET MURAT GÜMRÜKÇÜOĞLU",
+            "ALİ KEMAL KARATAŞ",
+            "BAHRİ TOSUN",
+            "DOĞUKAN ÖZKAN",
+        ],
+    })
+
+
+# ============================================================
+# NORMALIZATION TESTS
+# ============================================================
+
+class TestNormalization:
+    """Tests for name/ID normalization helpers."""
+
+    def test_turkish_characters(self):
+        """Turkish letters map to ASCII lowercase."""
+        assert normalize_name("ALİ KEMAL KARATAŞ") == ["ali", "kemal", "karatas"]
+        assert normalize_name("Bekir bıyıklı") == ["bekir", "biyikli"]
+
+    def test_missing_name(self):
+        """Missing names give no tokens."""
+        assert normalize_name(None) == []
+        assert normalize_name(float("nan")) == []
+
+    def test_parse_image_name(self):
+        """Image names split into name tokens and IDs."""
+        assert parse_image_name("Bahri Tosun 1877674.jpeg") == (["bahri", "tosun"], ["1877674"])
+        assert parse_image_name("Birgül yıldırım-1150549_2.jpeg") == (["birgul", "yildirim"], ["1150549"])
+        assert parse_image_name("Doğukan Özkan.jpeg") == (["dogukan", "ozkan"], [])
+
+    def test_similarities(self):
+        """Similarities are order-insensitive and bounded."""
+        assert name_similarity(["tosun", "bahri"], ["bahri", "tosun"]) == pytest.approx(1.0)
+        assert name_similarity([], ["bahri"]) == 0.0
+        assert id_similarity(["1877674"], "1877674") == pytest.approx(1.0)
+        assert 0.0 < id_similarity(["1877764"], "1877674") < 1.0
+
+
+# ============================================================
+# LINKER TESTS
+# ============================================================
+
+class TestFuzzyLinker:
+    """Tests for FuzzyLinker blocking and scoring."""
+
+    def test_blocking_limits_candidates(self, clinical_df):
+        """Only records sharing a name token or ID prefix are candidates."""
+        linker = FuzzyLinker(clinical_df)
+        assert linker.candidates("Bahri Tosun 1877674.jpeg") == {3}
+        assert linker.candidates("Unknown Person.jpeg") == set()
+
+    def test_id_typo_matched(self, clinical_df):
+        """Mistyped ID with matching name ranks the right patient first."""
+        df = FuzzyLinker(clinical_df).match(["Bahri Tosun-1877764.jpeg"])
+        assert list(df.columns) == CANDIDATE_COLUMNS
+        assert df.iloc[0]["patient_id"] == "1877674"
+        assert df.iloc[0]["rank"] == 1
+
+    def test_name_only_match(self, clinical_df):
+        """Names without IDs are matched on name similarity alone."""
+        df = FuzzyLinker(clinical_df).match(["Doğukan Özkan.jpeg"])
+        assert df.iloc[0]["patient_name"] == "DOĞUKAN ÖZKAN"
+        assert df.iloc[0]["score"] == pytest.approx(1.0)
+
+    def test_oversized_blocks_skipped(self, clinical_df):
+        """Blocking keys shared by too many records are ignored."""
+        linker = FuzzyLinker(clinical_df, max_block_size=0)
+        assert linker.candidates("Bahri Tosun 1877674.jpeg") == set()
+
+    def test_parallel_matches_sequential(self, clinical_df):
+        """Process-pool matching returns the same rows in input order."""
+        names = [
+            "Bahri Tosun-1877764.jpeg",
+            "Doğukan Özkan.jpeg",
+            "Unknown Person.jpeg",
+            "Ali Kemal Karatas.jpeg",
+        ]
+        linker = FuzzyLinker(clinical_df)
+        sequential = linker.match(names, min_score=0.5, n_jobs=1)
+        parallel = linker.match(names, min_score=0.5, n_jobs=2)
+        pd.testing.assert_frame_equal(sequential, parallel)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
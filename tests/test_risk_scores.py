@@ -0,0 +1,101 @@
+"""Tests for vectorized risk score engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from franksign.data.risk_scores import (
+    RiskInputs,
+    ascvd_risk,
+    framingham_risk,
+    recompute_risk_scores,
+)
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def reference_df():
+    """Published reference patients (D'Agostino 2008, Goff 2013)."""
+    return pd.DataFrame({
+        "age": [61, 53, 55, 55],
+        "gender": ["F", "M", "F", "M"],
+        "total_cholesterol": [180.0, 161.0, 213.0, 213.0],
+        "hdl": [47.0, 55.0, 50.0, 50.0],
+        "systolic_bp": ["124", "125", "120", "120"],
+        "smoking": [1, 0, 0, 0],
+        "diabetes": [0, 1, 0, 0],
+        "hypertension": [0, 1, 0, 0],
+    })
+
+
+# ============================================================
+# EQUATION TESTS
+# ============================================================
+
+class TestRiskEquations:
+    """Tests against published worked examples."""
+
+    def test_framingham_reference(self, reference_df):
+        """Framingham general CVD examples: 10.48% (F) and 15.62% (M)."""
+        risk = framingham_risk(RiskInputs.from_dataframe(reference_df))
+        assert risk[0] == pytest.approx(10.48, abs=0.01)
+        assert risk[1] == pytest.approx(15.62, abs=0.01)
+
+    def test_ascvd_reference(self, reference_df):
+        """Pooled Cohort Equations examples: 2.1% (F) and 5.3% (M)."""
+        risk = ascvd_risk(RiskInputs.from_dataframe(reference_df))
+        assert risk[2] == pytest.approx(2.1, abs=0.1)
+        assert risk[3] == pytest.approx(5.3, abs=0.1)
+
+    def test_missing_inputs_give_nan(self, reference_df):
+        """Rows with missing or invalid inputs get NaN."""
+        df = reference_df.copy()
+        df.loc[0, "hdl"] = np.nan
+        df.loc[1, "gender"] = None
+        df.loc[2, "systolic_bp"] = "-"
+        inputs = RiskInputs.from_dataframe(df)
+        assert inputs.valid.tolist() == [False, False, False, True]
+        assert np.isnan(framingham_risk(inputs)[:3]).all()
+        assert not np.isnan(ascvd_risk(inputs)[3])
+
+    def test_age_range(self, reference_df):
+        """Ages outside the validated range give NaN unless disabled."""
+        df = reference_df.copy()
+        df.loc[2, "age"] = 85
+        inputs = RiskInputs.from_dataframe(df)
+        assert np.isnan(ascvd_risk(inputs)[2])
+        assert not np.isnan(ascvd_risk(inputs, enforce_age_range=False)[2])
+
+
+# ============================================================
+# DATAFRAME API TESTS
+# ============================================================
+
+class TestRecomputeRiskScores:
+    """Tests for recompute_risk_scores."""
+
+    def test_overwrites_columns(self, reference_df):
+        """Stale spreadsheet values are replaced."""
+        df = reference_df.assign(framingham=[1.0, np.nan, 3.0, 4.0])
+        out = recompute_risk_scores(df)
+        assert out["framingham"].iloc[0] == pytest.approx(10.48, abs=0.01)
+        assert "ascvd" in out.columns
+        assert "ascvd" not in df.columns
+
+    def test_fill_only(self, reference_df):
+        """fill_only keeps existing values and fills gaps."""
+        df = reference_df.assign(framingham=[1.0, np.nan, 3.0, 4.0])
+        out = recompute_risk_scores(df, fill_only=True)
+        assert out["framingham"].iloc[0] == 1.0
+        assert out["framingham"].iloc[1] == pytest.approx(15.62, abs=0.01)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
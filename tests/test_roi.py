@@ -0,0 +1,122 @@
+"""Tests for roi module."""
+
+import pytest
+from pathlib import Path
+
+import numpy as np
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from franksign.data.augmentation import rasterize_annotations
+from franksign.data.cvat_parser import (
+    ImageAnnotations,
+    Point,
+    PointAnnotation,
+    PolygonAnnotation,
+    PolylineAnnotation,
+)
+from franksign.data.roi import crop_annotations, earlobe_box
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+def _ear(with_landmarks=True, with_region=True):
+    """1000x2000 ear: contour from y=200 to 1800, lobe below y=1400."""
+    img = ImageAnnotations(id=1, name="ear-1001.jpeg", width=1000, height=2000)
+    img.polygons.append(PolygonAnnotation(
+        label="ear_outer_contour",
+        points=[Point(400, 200), Point(700, 300), Point(750, 1400), Point(650, 1800),
+                Point(450, 1750), Point(380, 1400), Point(300, 800)],
+    ))
+    if with_landmarks:
+        img.points += [
+            PointAnnotation(label="ear_top", point=Point(560, 200)),
+            PointAnnotation(label="earlobe_attachment_point", point=Point(900, 1400)),  # on the cheek
+            PointAnnotation(label="earlobe_tip", point=Point(560, 1800)),
+        ]
+    if with_region:
+        img.polygons.append(PolygonAnnotation(
+            label="franks_sign_region",
+            points=[Point(450, 1500), Point(650, 1500), Point(650, 1700), Point(450, 1700)],
+        ))
+        img.polylines.append(PolylineAnnotation(
+            label="franks_sign_line", points=[Point(470, 1550), Point(630, 1650)],
+        ))
+    return img
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+class TestEarlobeBox:
+    """Tests for earlobe_box."""
+
+    def test_landmark_box_covers_lobe_only(self):
+        """The box spans the contour below the attachment level, not the ear."""
+        x0, y0, x1, y1 = earlobe_box(_ear(), margin=0.0, square=False)
+        assert (x0, y0, x1, y1) == (380, 1400, 750, 1800)
+
+    def test_margin_and_square(self):
+        """Margin pads the longer side; square boxes share the centre."""
+        x0, y0, x1, y1 = earlobe_box(_ear(), margin=0.1)
+        assert x1 - x0 == y1 - y0 == 480
+        assert ((x0 + x1) / 2, (y0 + y1) / 2) == (565, 1600)
+
+    def test_region_fallback(self):
+        """Without lobe landmarks the Frank Sign region box is used."""
+        box = earlobe_box(_ear(with_landmarks=False), margin=0.0, square=False)
+        assert box == (450, 1500, 650, 1700)
+        assert earlobe_box(_ear(with_landmarks=False), source="landmarks") is None
+
+    def test_frank_sign_always_inside(self):
+        """Frank Sign geometry outside the lobe landmarks widens the box."""
+        image = _ear()
+        image.polylines[0].points.append(Point(900, 1900))
+        x0, y0, x1, y1 = earlobe_box(image, margin=0.0, square=False)
+        assert x1 >= 900 and y1 >= 1900
+
+    def test_clipped_to_image(self):
+        """Boxes near the border shift inside, then clip."""
+        image = _ear()
+        image.height = 1850
+        x0, y0, x1, y1 = earlobe_box(image, margin=0.3)
+        assert y1 == 1850 and y0 >= 0 and x0 >= 0 and x1 <= 1000
+        assert x1 - x0 == y1 - y0
+
+    def test_no_annotations(self):
+        image = ImageAnnotations(id=2, name="x.jpeg", width=10, height=10)
+        assert earlobe_box(image) is None
+
+    def test_unknown_source(self):
+        with pytest.raises(ValueError):
+            earlobe_box(_ear(), source="ear")
+
+
+class TestCropAnnotations:
+    """Tests for crop_annotations."""
+
+    def test_masks_stay_aligned(self):
+        """Rasterizing cropped geometry equals cropping the full mask."""
+        image = _ear()
+        box = earlobe_box(image, margin=0.1)
+        x0, y0, x1, y1 = box
+        full = rasterize_annotations(image, line_thickness=3)
+        cropped = rasterize_annotations(crop_annotations(image, box), line_thickness=3)
+        assert cropped.shape == (y1 - y0, x1 - x0)
+        assert np.array_equal(cropped, full[y0:y1, x0:x1])
+
+    def test_original_untouched(self):
+        image = _ear()
+        cropped = crop_annotations(image, (100, 200, 300, 400))
+        assert (cropped.width, cropped.height) == (200, 200)
+        assert cropped.points[2].point == Point(460, 1600)
+        assert image.points[2].point == Point(560, 1800)
+        assert crop_annotations(image, None) is image
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,159 @@
+"""Tests for samplers module."""
+
+import pytest
+from pathlib import Path
+
+import numpy as np
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+torch = pytest.importorskip("torch")
+
+from franksign.data.samplers import (
+    SAMPLE_GROUPS,
+    BalancedBatchSampler,
+    group_shares,
+    sample_groups,
+    sample_weights,
+    sampler_from_config,
+    weighted_sampler,
+)
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def groups():
+    """Imbalanced groups: 4 Frank Sign, 30 without, 6 background."""
+    return np.array([0] * 4 + [1] * 30 + [2] * 6, dtype=np.int8)
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+class TestSampleGroups:
+    """Tests for sample_groups."""
+
+    def test_from_annotations_and_stats(self, make_annotations):
+        """Labels come from has_frank_sign, line pixels and empty masks."""
+        annotations = [make_annotations(presence=p) for p in ("present", "absent", "absent", None)]
+        stats = np.array([
+            [90, 10, 0],   # Frank Sign
+            [80, 0, 20],   # region only
+            [95, 5, 0],    # line pixels without a present flag
+            [100, 0, 0],   # empty mask
+        ])
+        assert sample_groups(annotations, stats).tolist() == [0, 1, 0, 2]
+
+    def test_without_stats(self, make_annotations):
+        assert sample_groups([True, False, make_annotations(presence="present")]).tolist() == [0, 1, 0]
+
+    def test_stats_shape_checked(self):
+        with pytest.raises(ValueError):
+            sample_groups([True, False], np.zeros((3, 3)))
+
+
+class TestSampleWeights:
+    """Tests for group_shares and sample_weights."""
+
+    def test_group_share_matches_config(self, groups):
+        """Summed per-sample weights equal each group's configured share."""
+        weights = sample_weights(groups, {"frank_sign": 0.5, "no_frank_sign": 0.3, "background": 0.2})
+        sums = np.bincount(groups, weights=weights)
+        assert np.allclose(sums, [0.5, 0.3, 0.2])
+
+    def test_empty_groups_dropped(self):
+        """Shares of groups without samples are redistributed."""
+        shares = group_shares(np.array([0, 1, 1]), [0.5, 0.3, 0.2])
+        assert np.allclose(shares, [0.625, 0.375, 0.0])
+
+    def test_invalid_weights(self, groups):
+        with pytest.raises(ValueError):
+            group_shares(groups, {"positive": 1.0})
+        with pytest.raises(ValueError):
+            group_shares(groups, [1.0, -1.0, 0.0])
+        with pytest.raises(ValueError):
+            group_shares(np.array([1, 1]), {"frank_sign": 1.0})
+
+    def test_weighted_sampler_rebalances(self, groups):
+        sampler = weighted_sampler(groups, {"frank_sign": 0.5, "no_frank_sign": 0.5}, num_samples=4000, seed=0)
+        drawn = groups[list(sampler)]
+        assert len(drawn) == 4000
+        assert abs((drawn == 0).mean() - 0.5) < 0.05
+        assert not (drawn == 2).any()
+
+
+class TestBalancedBatchSampler:
+    """Tests for BalancedBatchSampler."""
+
+    def test_batch_composition(self, groups):
+        """Every batch holds the floor of each group's share."""
+        sampler = BalancedBatchSampler(groups, batch_size=8, group_weights=[0.5, 0.375, 0.125], seed=1)
+        batches = list(sampler)
+        assert len(batches) == len(sampler) == 5
+        for batch in batches:
+            assert len(batch) == 8
+            assert np.bincount(groups[batch], minlength=3).tolist() == [4, 3, 1]
+
+    def test_members_cycle_before_repeating(self, groups):
+        """Minority samples are all used before any is repeated."""
+        sampler = BalancedBatchSampler(groups, batch_size=8, group_weights=[0.5, 0.375, 0.125])
+        first = [i for batch in sampler for i in batch if groups[i] == 0]
+        assert sorted(first[:4]) == [0, 1, 2, 3]
+        assert sorted(first[4:8]) == [0, 1, 2, 3]
+
+    def test_fractional_shares(self, groups):
+        """Leftover slots follow the fractional shares on average."""
+        sampler = BalancedBatchSampler(groups, batch_size=3, num_batches=2000, seed=0)
+        drawn = groups[[i for batch in sampler for i in batch]]
+        expected = group_shares(groups)
+        assert np.allclose(np.bincount(drawn, minlength=3) / len(drawn), expected, atol=0.02)
+
+    def test_epochs_differ(self, groups):
+        sampler = BalancedBatchSampler(groups, batch_size=8, seed=3)
+        first = list(sampler)
+        assert list(sampler) == first
+        sampler.set_epoch(1)
+        assert list(sampler) != first
+
+    def test_dataloader(self, groups):
+        from torch.utils.data import DataLoader
+
+        sampler = BalancedBatchSampler(groups, batch_size=4, num_batches=3)
+        batches = list(DataLoader(np.arange(len(groups)), batch_sampler=sampler))
+        assert [len(b) for b in batches] == [4, 4, 4]
+
+
+class TestSamplerFromConfig:
+    """Tests for sampler_from_config."""
+
+    def test_types(self, make_annotations):
+        annotations = [make_annotations(presence=p) for p in ("present", "absent", None)]
+        config = {"training": {"batch_size": 2, "sampler": {"type": "none"}}}
+        assert sampler_from_config(config, annotations) is None
+
+        config["training"]["sampler"] = {"type": "balanced", "group_weights": {"frank_sign": 1, "no_frank_sign": 1}}
+        sampler = sampler_from_config(config, annotations)
+        assert isinstance(sampler, BalancedBatchSampler)
+        assert sampler.batch_size == 2 and len(sampler) == 2
+
+        config["training"]["sampler"]["type"] = "weighted"
+        assert isinstance(sampler_from_config(config, annotations), torch.utils.data.WeightedRandomSampler)
+
+        config["training"]["sampler"]["type"] = "oversample"
+        with pytest.raises(ValueError):
+            sampler_from_config(config, annotations)
+
+    def test_default_config(self):
+        import yaml
+
+        config = yaml.safe_load((Path(__file__).parent.parent / "configs" / "default.yaml").read_text())
+        assert set(config["training"]["sampler"]["group_weights"]) == set(SAMPLE_GROUPS)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
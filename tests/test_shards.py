@@ -0,0 +1,193 @@
+"""Tests for shards module."""
+
+import io
+import json
+import tarfile
+import pytest
+from pathlib import Path
+
+import pandas as pd
+from PIL import Image
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+torch = pytest.importorskip("torch")
+
+from franksign.data.shards import (
+    SHARD_FORMAT_VERSION,
+    ShardedSegmentationDataset,
+    iter_shard_samples,
+    pack_shards,
+    shuffle_buffer,
+)
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def samples(tmp_path, make_annotations):
+    """Seven annotated images named after patients."""
+    images_dir = tmp_path / "raw"
+    images_dir.mkdir()
+    annotations = []
+    for i in range(7):
+        name = f"Patient {i}-{1000 + i}.jpeg"
+        Image.new("RGB", (80, 40), color=(30 * i, 100, 50)).save(images_dir / name)
+        presence = "present" if i % 2 else "absent"
+        annotations.append(make_annotations(name, width=80, height=40, presence=presence, image_id=i))
+    return images_dir, annotations
+
+
+@pytest.fixture
+def clinical_df():
+    return pd.DataFrame({
+        "patient_id": ["1001", "1002"],
+        "age": [61.0, float("nan")],
+        "fs_right": [1, 0],
+    })
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+class TestPackShards:
+    """Tests for pack_shards."""
+
+    def test_shards_and_index(self, samples, tmp_path):
+        """Samples are split into fixed-size shards listed in the index."""
+        images_dir, annotations = samples
+        index = pack_shards(images_dir, annotations, tmp_path / "shards", samples_per_shard=3)
+
+        assert index["version"] == SHARD_FORMAT_VERSION
+        assert index["samples"] == 7
+        assert [s["samples"] for s in index["shards"]] == [3, 3, 1]
+        on_disk = json.loads((tmp_path / "shards" / "index.json").read_text(encoding="utf-8"))
+        assert on_disk == index
+        with tarfile.open(tmp_path / "shards" / "shard-00000.tar") as tar:
+            assert tar.getnames()[:3] == ["00000000.jpeg", "00000000.mask.png", "00000000.json"]
+
+    def test_metadata(self, samples, clinical_df, tmp_path):
+        """Metadata carries patient ID, labels and the linked clinical record."""
+        images_dir, annotations = samples
+        pack_shards(images_dir, annotations, tmp_path / "shards", clinical_df=clinical_df)
+        metas = [json.loads(raw["json"]) for raw in iter_shard_samples(tmp_path / "shards" / "shard-00000.tar")]
+
+        assert [m["patient_id"] for m in metas] == [str(1000 + i) for i in range(7)]
+        assert metas[1]["has_frank_sign"] is True
+        assert metas[0]["has_frank_sign"] is False
+        assert metas[1]["labels"] == ["franks_sign_line", "franks_sign_region"]
+        assert metas[1]["clinical_record"] == {"patient_id": "1001", "age": 61.0, "fs_right": 1}
+        assert metas[2]["clinical_record"]["age"] is None
+        assert metas[3]["clinical_record"] is None
+
+    def test_resized(self, samples, tmp_path):
+        """With image_size, images and masks are stored at that size."""
+        images_dir, annotations = samples
+        pack_shards(images_dir, annotations, tmp_path / "shards", image_size=(20, 40))
+        raw = next(iter_shard_samples(tmp_path / "shards" / "shard-00000.tar"))
+        assert set(raw) == {"__key__", "jpg", "mask.png", "json"}
+        assert Image.open(io.BytesIO(raw["jpg"])).size == (40, 20)
+        assert Image.open(io.BytesIO(raw["mask.png"])).size == (40, 20)
+
+    def test_unreadable_image_skipped(self, samples, tmp_path):
+        """A corrupt image is recorded in the index; the others are packed."""
+        images_dir, annotations = samples
+        (images_dir / annotations[1].name).write_bytes(b"not an image")
+        (images_dir / annotations[4].name).unlink()
+        index = pack_shards(images_dir, annotations, tmp_path / "shards", samples_per_shard=3, image_size=(20, 40))
+
+        assert index["samples"] == 5
+        assert index["shards"][0]["keys"] == ["00000000", "00000002"]
+        assert set(index["errors"]) == {annotations[1].name, annotations[4].name}
+        assert sorted(p.name for p in (tmp_path / "shards").iterdir()) == [
+            "index.json", "shard-00000.tar", "shard-00001.tar", "shard-00002.tar",
+        ]
+        dataset = ShardedSegmentationDataset(tmp_path / "shards")
+        assert [s["index"] for s in dataset] == [0, 2, 3, 5, 6]
+
+    def test_invalid_shard_size(self, samples, tmp_path):
+        images_dir, annotations = samples
+        with pytest.raises(ValueError):
+            pack_shards(images_dir, annotations, tmp_path / "shards", samples_per_shard=0)
+
+
+class TestShuffleBuffer:
+    """Tests for shuffle_buffer."""
+
+    def test_permutation(self):
+        """All items come out exactly once, in a different order."""
+        import random
+
+        out = list(shuffle_buffer(iter(range(100)), 10, random.Random(0)))
+        assert sorted(out) == list(range(100))
+        assert out != list(range(100))
+
+    def test_disabled(self):
+        import random
+
+        assert list(shuffle_buffer(iter(range(5)), 0, random.Random(0))) == [0, 1, 2, 3, 4]
+
+
+class TestShardedSegmentationDataset:
+    """Tests for ShardedSegmentationDataset."""
+
+    def test_sequential_samples(self, samples, tmp_path):
+        """Unshuffled iteration yields every sample in packing order."""
+        images_dir, annotations = samples
+        pack_shards(images_dir, annotations, tmp_path / "shards", samples_per_shard=3)
+        dataset = ShardedSegmentationDataset(tmp_path / "shards")
+
+        out = list(dataset)
+        assert len(dataset) == 7
+        assert [s["index"] for s in out] == list(range(7))
+        assert out[0]["image"].shape == (3, 40, 80)
+        assert out[0]["image"].dtype == torch.float32
+        assert out[1]["mask"].dtype == torch.long
+        assert set(out[1]["mask"].unique().tolist()) == {0, 1, 2}
+
+    def test_shuffle_changes_with_epoch(self, samples, tmp_path):
+        """Shuffled epochs cover every sample; order depends on the epoch."""
+        images_dir, annotations = samples
+        pack_shards(images_dir, annotations, tmp_path / "shards", samples_per_shard=2)
+        dataset = ShardedSegmentationDataset(tmp_path / "shards", shuffle_buffer=4, seed=3)
+
+        first = [s["index"] for s in dataset]
+        assert [s["index"] for s in dataset] == first
+        dataset.set_epoch(1)
+        second = [s["index"] for s in dataset]
+        assert sorted(first) == sorted(second) == list(range(7))
+        assert first != second
+
+    def test_workers_get_disjoint_shards(self, samples, tmp_path):
+        """Shards are partitioned across workers without overlap."""
+        images_dir, annotations = samples
+        pack_shards(images_dir, annotations, tmp_path / "shards", samples_per_shard=2)
+        dataset = ShardedSegmentationDataset(tmp_path / "shards", shuffle_buffer=4)
+
+        parts = [dataset.worker_shards(w, 3) for w in range(3)]
+        flat = [p for part in parts for p in part]
+        assert len(flat) == len(set(flat)) == 4
+
+    def test_dataloader_workers(self, samples, tmp_path):
+        """Two DataLoader workers together yield each sample exactly once."""
+        from torch.utils.data import DataLoader
+
+        images_dir, annotations = samples
+        pack_shards(images_dir, annotations, tmp_path / "shards", samples_per_shard=2, image_size=(16, 16))
+        dataset = ShardedSegmentationDataset(tmp_path / "shards", shuffle_buffer=2)
+        indices = [i for batch in DataLoader(dataset, batch_size=2, num_workers=2) for i in batch["index"].tolist()]
+        assert sorted(indices) == list(range(7))
+
+    def test_include_meta(self, samples, tmp_path):
+        images_dir, annotations = samples
+        pack_shards(images_dir, annotations, tmp_path / "shards")
+        sample = next(iter(ShardedSegmentationDataset(tmp_path / "shards", include_meta=True)))
+        assert sample["meta"]["patient_id"] == "1000"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,112 @@
+"""Tests for splits module."""
+
+import json
+import pytest
+from pathlib import Path
+
+import numpy as np
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from franksign.data.splits import (
+    SPLIT_MANIFEST,
+    SPLIT_NAMES,
+    assign_patient_splits,
+    load_split,
+    patient_groups,
+    write_splits,
+)
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def images():
+    """600 patients with 1-3 images each; a third have Frank Sign."""
+    rng = np.random.default_rng(1)
+    names, labels = [], []
+    for patient in range(600):
+        positive = patient % 3 == 0
+        for view in range(int(rng.integers(1, 4))):
+            names.append(f"Patient {patient}-{1_000_000 + patient}_{view}.jpeg")
+            labels.append(positive)
+    return names, np.array(labels)
+
+
+# ============================================================
+# TESTS
+# ============================================================
+
+class TestAssignPatientSplits:
+    """Tests for assign_patient_splits."""
+
+    def test_patients_do_not_leak(self, images):
+        """Every patient's images share a split."""
+        names, labels = images
+        codes = assign_patient_splits(names, labels)
+        groups = patient_groups(names)
+        for group in np.unique(groups):
+            assert len(set(codes[groups == group].tolist())) == 1
+
+    def test_ratios_and_stratification(self, images):
+        """Image ratios and Frank Sign prevalence match per split."""
+        names, labels = images
+        codes = assign_patient_splits(names, labels, ratios=(0.7, 0.15, 0.15))
+        shares = np.bincount(codes, minlength=3) / len(codes)
+        assert np.allclose(shares, [0.7, 0.15, 0.15], atol=0.02)
+        for code in range(3):
+            assert labels[codes == code].mean() == pytest.approx(labels.mean(), abs=0.05)
+
+    def test_reproducible_and_order_independent(self, images):
+        """Same seed → same splits, regardless of input order."""
+        names, labels = images
+        codes = assign_patient_splits(names, labels, seed=7)
+        assert np.array_equal(codes, assign_patient_splits(names, labels, seed=7))
+        reversed_codes = assign_patient_splits(names[::-1], labels[::-1], seed=7)
+        assert np.array_equal(reversed_codes[::-1], codes)
+        assert not np.array_equal(codes, assign_patient_splits(names, labels, seed=8))
+
+    def test_unparseable_names_are_own_group(self):
+        """Images without a patient ID are grouped individually."""
+        groups = patient_groups(["Unknown Person.jpeg", "Other Person.jpeg", "A-1001.jpeg", "1001 - A.jpeg"])
+        assert len(set(groups.tolist())) == 3
+
+    @pytest.mark.parametrize("ratios", [(0.7, 0.3), (-0.1, 0.6, 0.5), (0, 0, 0)])
+    def test_invalid_ratios(self, images, ratios):
+        names, labels = images
+        with pytest.raises(ValueError):
+            assign_patient_splits(names, labels, ratios=ratios)
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            assign_patient_splits(["a.jpeg"], [True, False])
+
+
+class TestWriteSplits:
+    """Tests for write_splits and load_split."""
+
+    def test_round_trip(self, images, tmp_path):
+        """Split files list every image once; summary counts match."""
+        names, labels = images
+        codes = assign_patient_splits(names, labels, seed=3)
+        summary = write_splits(tmp_path, names, codes, labels, seed=3, ratios=(0.7, 0.15, 0.15))
+
+        loaded = {split: load_split(tmp_path, split) for split in SPLIT_NAMES}
+        assert sorted(n for split in loaded.values() for n in split) == sorted(names)
+        assert loaded["val"] == sorted(np.asarray(names, dtype=object)[codes == 1].tolist())
+        on_disk = json.loads((tmp_path / SPLIT_MANIFEST).read_text(encoding="utf-8"))
+        assert on_disk == summary
+        assert summary["seed"] == 3
+        assert summary["splits"]["train"]["images"] == len(loaded["train"])
+        assert sum(s["frank_sign"] for s in summary["splits"].values()) == int(labels.sum())
+
+    def test_missing_split(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="make_splits"):
+            load_split(tmp_path, "train")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
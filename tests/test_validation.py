@@ -1,5 +1,6 @@
 """Tests for validation module."""
 
+import os
 import pytest
 from pathlib import Path
 
@@ -15,12 +16,23 @@ from franksign.data.cvat_parser import (
     LabelDefinition,
 )
 from franksign.data.validation import (
+    ClinicalConsistencyChecker,
     ClinicalSchema,
+    ImageHeaderCache,
+    ImageIntegrityChecker,
     ValidationIssue,
+    ValidationCache,
+    ValidationReport,
+    StreamingCVATValidator,
+    VectorizedClinicalChecker,
+    compile_schema,
+    image_geometry_hash,
+    read_image_header,
     validate_cvat_project,
     _validate_image_annotations,
     _segments_intersect,
     _is_self_intersecting,
+    _find_self_intersections,
     EXPECTED_LABELS,
     REQUIRED_LABELS,
     MIN_POLYLINE_LENGTH_PX,
@@ -112,6 +124,45 @@ class TestIsSelfIntersecting:
         import numpy as np
         triangle = np.array([[0, 0], [10, 0], [5, 10]])
         assert _is_self_intersecting(triangle) == False
+    
+    def test_returns_offending_edge_pairs(self):
+        """Bowtie reports the crossing edge pair."""
+        import numpy as np
+        bowtie = np.array([[0, 0], [10, 10], [10, 0], [0, 10]])
+        assert _find_self_intersections(bowtie) == [(0, 2)]
+    
+    def test_colinear_disjoint_edges_not_reported(self):
+        """Colinear edges that don't overlap are not intersections."""
+        import numpy as np
+        # Edges 0 and 2 lie on y=0 but are disjoint
+        shape = np.array([[0, 0], [1, 0], [1, 5], [2, 0], [3, 0], [3, 10], [0, 10]])
+        assert _find_self_intersections(shape) == []
+    
+    def test_grid_matches_brute_force(self):
+        """Grid-bucketed and all-pairs paths agree with the scalar check."""
+        import numpy as np
+        rng = np.random.default_rng(0)
+        for n in [10, 120]:
+            angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+            radius = 100 + rng.normal(0, 15, n)
+            pts = np.c_[radius * np.cos(angles), radius * np.sin(angles)]
+            
+            expected = [
+                (i, j)
+                for i in range(n)
+                for j in range(i + 2, n)
+                if not (i == 0 and j == n - 1)
+                and _segments_intersect(pts[i], pts[(i + 1) % n], pts[j], pts[(j + 1) % n])
+            ]
+            assert _find_self_intersections(pts, small_n=0) == expected
+            assert _find_self_intersections(pts, small_n=10_000) == expected
+    
+    def test_large_smooth_contour_not_intersecting(self):
+        """A 300-vertex ellipse has no self-intersections."""
+        import numpy as np
+        angles = np.linspace(0, 2 * np.pi, 300, endpoint=False)
+        ellipse = np.c_[100 * np.cos(angles), 160 * np.sin(angles)]
+        assert _find_self_intersections(ellipse) == []
 
 
 # ============================================================
@@ -155,6 +206,68 @@ class TestValidateCVATProject:
         assert any("Unknown labels" in i.message for i in warnings)
 
 
+class TestParallelAndCachedValidation:
+    """Tests for process-pool execution and the per-image cache."""
+    
+    @pytest.fixture
+    def project_with_images(self, valid_project, valid_image):
+        """Project with one valid and one self-intersecting image."""
+        bad = ImageAnnotations(id=2, name="bowtie.jpg", width=100, height=100)
+        bad.polygons.append(PolygonAnnotation(
+            label="ear_outer_contour",
+            points=[Point(0, 0), Point(100, 100), Point(100, 0), Point(0, 100)]
+        ))
+        valid_project.images.extend([valid_image, bad])
+        return valid_project
+    
+    def test_parallel_matches_serial(self, project_with_images):
+        """Process-pool validation returns the same issues in order."""
+        serial = validate_cvat_project(project_with_images)
+        parallel = validate_cvat_project(project_with_images, n_jobs=2)
+        assert parallel == serial
+    
+    def test_hash_changes_with_geometry(self, valid_image):
+        """Geometry hash is stable and changes when points move."""
+        before = image_geometry_hash(valid_image)
+        assert image_geometry_hash(valid_image) == before
+        valid_image.polylines[0].points[0] = Point(21, 50)
+        assert image_geometry_hash(valid_image) != before
+    
+    def test_hash_changes_with_image_id(self, valid_image):
+        """Renumbered images are rechecked so issues carry the new ID."""
+        before = image_geometry_hash(valid_image)
+        valid_image.id += 1
+        assert image_geometry_hash(valid_image) != before
+    
+    def test_cache_reuses_unchanged_images(self, project_with_images, tmp_path):
+        """Second run only rechecks images whose geometry changed."""
+        path = tmp_path / "cache.json"
+        cache = ValidationCache(path)
+        first = validate_cvat_project(project_with_images, cache=cache)
+        cache.save()
+        assert cache.misses == 2
+        
+        project_with_images.images[0].polylines[0].points[1] = Point(90, 50)
+        cache = ValidationCache(path)
+        second = validate_cvat_project(project_with_images, cache=cache)
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert second == first
+    
+    def test_cache_prunes_unused_entries(self, project_with_images, tmp_path):
+        """Saving drops entries for images no longer in the export."""
+        path = tmp_path / "cache.json"
+        cache = ValidationCache(path)
+        validate_cvat_project(project_with_images, cache=cache)
+        cache.save()
+        
+        project_with_images.images.pop()
+        cache = ValidationCache(path)
+        validate_cvat_project(project_with_images, cache=cache)
+        cache.save()
+        assert len(ValidationCache(path)) == 1
+
+
 # ============================================================
 # IMAGE ANNOTATION VALIDATION TESTS
 # ============================================================
@@ -235,6 +348,112 @@ class TestValidateImageAnnotations:
         issues = list(_validate_image_annotations(img))
         warnings = [i for i in issues if i.level == "warning"]
         assert any("self-intersecting" in i.message for i in warnings)
+        assert any("(0, 2)" in i.message for i in warnings)
+
+    def test_structured_fields(self):
+        """Geometry issues carry code, image, label, value and threshold."""
+        img = ImageAnnotations(id=7, name="short.jpg", width=100, height=100)
+        img.polylines.append(PolylineAnnotation(
+            label="franks_sign_line",
+            points=[Point(50, 50), Point(51, 50)],
+        ))
+        
+        (issue,) = _validate_image_annotations(img)
+        assert issue.code == "polyline_too_short"
+        assert (issue.image_name, issue.image_id) == ("short.jpg", 7)
+        assert issue.label == "franks_sign_line"
+        assert issue.value == pytest.approx(1.0)
+        assert issue.threshold == MIN_POLYLINE_LENGTH_PX
+
+
+# ============================================================
+# STREAMING VALIDATION TESTS
+# ============================================================
+
+def _write_cvat_xml(path, labels, images):
+    """Write a minimal CVAT 1.1 XML file.
+
+    ``images`` is a list of (name, [(tag, label, points_str), ...]).
+    """
+    label_xml = "".join(
+        f"<label><name>{name}</name><type>polygon</type></label>" for name in labels
+    )
+    image_xml = ""
+    for i, (name, shapes) in enumerate(images):
+        shape_xml = "".join(
+            f'<{tag} label="{label}" points="{points}" z_order="0"/>'
+            for tag, label, points in shapes
+        )
+        image_xml += f'<image id="{i}" name="{name}" width="100" height="100">{shape_xml}</image>'
+    path.write_text(
+        "<annotations><version>1.1</version><meta><project><id>1</id><name>t</name>"
+        f"<labels>{label_xml}</labels></project></meta>{image_xml}</annotations>",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestStreamingCVATValidator:
+    """Tests for validate-while-parsing."""
+    
+    GOOD = ("polygon", "ear_outer_contour", "10,10;100,10;100,100;10,100")
+    BAD = ("polyline", "franks_sign_line", "50,50")
+    BOWTIE = ("polygon", "ear_outer_contour", "0,0;100,100;100,0;0,100")
+    
+    @pytest.fixture
+    def xml_path(self, tmp_path):
+        """Export with errors in images 1 and 2 and a warning in image 3."""
+        return _write_cvat_xml(
+            tmp_path / "annotations.xml",
+            sorted(REQUIRED_LABELS),
+            [
+                ("a.jpg", [self.GOOD]),
+                ("b.jpg", [self.BAD]),
+                ("c.jpg", [self.BAD]),
+                ("d.jpg", [self.BOWTIE]),
+            ],
+        )
+    
+    def test_matches_full_validation(self, xml_path):
+        """Without limits, streaming yields the same issues as the full pass."""
+        from franksign.data.cvat_parser import load_annotations
+        expected = validate_cvat_project(load_annotations(xml_path))
+        validator = StreamingCVATValidator()
+        assert validator.validate(xml_path) == expected
+        assert validator.images_checked == 4
+        assert not validator.aborted
+    
+    def test_fail_fast_stops_at_first_error(self, xml_path):
+        """fail_fast aborts right after the first error."""
+        validator = StreamingCVATValidator(fail_fast=True)
+        issues = validator.validate(xml_path)
+        assert validator.aborted
+        assert validator.images_checked == 2
+        assert [i.level for i in issues] == ["error"]
+        assert "b.jpg" in issues[0].message
+    
+    def test_max_errors(self, xml_path):
+        """max_errors stops after N errors."""
+        validator = StreamingCVATValidator(max_errors=2)
+        validator.validate(xml_path)
+        assert validator.aborted
+        assert validator.error_count == 2
+        assert validator.images_checked == 3
+    
+    def test_errors_only_skips_warnings(self, xml_path):
+        """Filtering to errors drops warning-level checks."""
+        issues = StreamingCVATValidator(levels=("error",)).validate(xml_path)
+        assert len(issues) == 2
+        assert all(i.level == "error" for i in issues)
+    
+    def test_missing_labels_rejected_before_images(self, tmp_path):
+        """Missing required labels abort before any image is parsed."""
+        path = _write_cvat_xml(tmp_path / "a.xml", [], [("a.jpg", [self.GOOD])])
+        validator = StreamingCVATValidator(fail_fast=True)
+        issues = validator.validate(path)
+        assert validator.aborted
+        assert validator.images_checked == 0
+        assert "Missing required labels" in issues[0].message
 
 
 # ============================================================
@@ -331,6 +550,352 @@ class TestClinicalSchema:
         assert len(validated) == 1
 
 
+# ============================================================
+# VECTORIZED CLINICAL CHECKER TESTS
+# ============================================================
+
+class TestVectorizedClinicalChecker:
+    """Tests for the NumPy implementation of ClinicalSchema."""
+
+    @staticmethod
+    def _frame():
+        import pandas as pd
+
+        return pd.DataFrame({
+            "patient_id": ["P001", None, "P003", "P004"],
+            "fs_right": [1, 2, 0, None],
+            "fs_left": [0, 1, 1, 0],
+            "gender": ["M", "F", "X", None],
+            "age": [45, 60, 130, 50],
+            "hdl": [50.0, -1.0, 45.0, None],
+            "ldl": [120.0, 140.0, None, 100.0],
+            "total_cholesterol": [200.0, 220.0, 210.0, 190.0],
+            "triglycerides": [150.0, 180.0, 170.0, 160.0],
+            "ef": [55.0, 50.0, 101.0, 60.0],
+            "syntax_score": [10.0, 15.0, 0.0, None],
+        })
+
+    def test_compile_schema_rules(self):
+        """Pandera checks compile to column rules."""
+        rules = {rule.name: rule for rule in compile_schema()}
+        assert rules["patient_id"].kind == "str"
+        assert not rules["patient_id"].nullable
+        assert rules["fs_right"].kind == "int"
+        assert set(rules["fs_right"].isin) == {0, 1}
+        assert rules["age"].ge == 0 and rules["age"].le == 120
+        assert rules["ef"].kind == "float"
+
+    def test_valid_data_has_no_failures(self):
+        """A frame that passes ClinicalSchema has no failure cases."""
+        df = self._frame().iloc[[0]]
+        ClinicalSchema.validate(df)
+        assert VectorizedClinicalChecker().check(df).empty
+
+    def test_matches_pandera(self):
+        """Failing (column, index) pairs match Pandera's lazy validation."""
+        import pandera as pa
+
+        df = self._frame()
+        with pytest.raises(pa.errors.SchemaErrors) as exc_info:
+            ClinicalSchema.validate(df, lazy=True)
+        expected = exc_info.value.failure_cases
+        expected = set(zip(expected["column"], expected["index"]))
+
+        failures = VectorizedClinicalChecker().check(df)
+        assert set(zip(failures["column"], failures["index"])) == expected
+
+    def test_failure_values_reported(self):
+        """Failure cases carry the offending raw value."""
+        failures = VectorizedClinicalChecker().check(self._frame())
+        age = failures[failures["column"] == "age"]
+        assert age["index"].tolist() == [2]
+        assert age["failure_case"].tolist() == [130]
+
+    def test_missing_column(self):
+        """A missing column is reported once."""
+        df = self._frame().drop(columns=["ef"])
+        failures = VectorizedClinicalChecker().check(df)
+        missing = failures[failures["check"] == "column_in_dataframe"]
+        assert missing["failure_case"].tolist() == ["ef"]
+
+    def test_missing_column_once_across_chunks(self):
+        df = self._frame().drop(columns=["ef"])
+        failures = VectorizedClinicalChecker().check_chunks([df.iloc[:2], df.iloc[2:]])
+        missing = failures[failures["check"] == "column_in_dataframe"]
+        assert missing["failure_case"].tolist() == ["ef"]
+
+    def test_uncoercible_int(self):
+        """Non-integer values in int columns fail dtype coercion."""
+        df = self._frame().iloc[[0]].copy()
+        df["age"] = [45.5]
+        failures = VectorizedClinicalChecker().check(df)
+        assert failures["check"].tolist() == ["coerce_dtype('int')"]
+
+    def test_check_chunks_matches_check(self):
+        """Chunked checking equals checking the concatenated frame."""
+        df = self._frame()
+        chunks = [df.iloc[:2], df.iloc[2:]]
+        checker = VectorizedClinicalChecker()
+        chunked = checker.check_chunks(chunks)
+        whole = VectorizedClinicalChecker().check(df)
+        assert checker.rows_checked == len(df)
+        assert chunked.sort_values(["column", "index"]).reset_index(drop=True).equals(
+            whole.sort_values(["column", "index"]).reset_index(drop=True)
+        )
+
+    def test_sample_csv_chunks(self):
+        """Chunked sample CSV yields the same failures as a full load."""
+        from franksign.data.clinical_loader import ClinicalDataLoader
+
+        csv_path = Path(__file__).parent.parent / "FS - AI - Sayfa1.csv"
+        if not csv_path.exists():
+            pytest.skip("Sample CSV not found")
+
+        loader = ClinicalDataLoader(csv_path)
+        whole = VectorizedClinicalChecker().check(loader.load())
+        chunked = VectorizedClinicalChecker().check_chunks(loader.iter_chunks(chunksize=7))
+        assert len(chunked) == len(whole)
+
+
+# ============================================================
+# CLINICAL CONSISTENCY TESTS
+# ============================================================
+
+class TestClinicalConsistencyChecker:
+    """Tests for CVAT vs clinical cross-source checks."""
+
+    @staticmethod
+    def _image(name, frank_sign, ear_side="right"):
+        img = ImageAnnotations(id=1, name=name, width=200, height=200)
+        attributes = {"ear_side": ear_side} if ear_side else {}
+        img.polygons.append(PolygonAnnotation(
+            label="ear_outer_contour",
+            points=[Point(10, 10), Point(100, 10), Point(100, 100), Point(10, 100)],
+            attributes=attributes,
+        ))
+        if frank_sign is not None:
+            img.polylines.append(PolylineAnnotation(
+                label="franks_sign_line",
+                points=[Point(20, 50), Point(80, 50)],
+                attributes={"presence": "present" if frank_sign else "absent"},
+            ))
+        return img
+
+    @pytest.fixture
+    def clinical_df(self):
+        import pandas as pd
+
+        return pd.DataFrame({
+            "patient_id": ["1001", "1002", "1003", "1003", "1004"],
+            "fs_right": [1, 0, 1, 0, None],
+            "fs_left": [0, 0, 1, 0, 1],
+        })
+
+    def _codes(self, checker, images):
+        return [(issue.code, issue.image_name) for issue in checker.validate(images)]
+
+    def test_consistent_images_pass(self, clinical_df):
+        """Matching annotations produce only the duplicate-ID warning."""
+        checker = ClinicalConsistencyChecker(clinical_df)
+        images = [self._image("A-1001.jpeg", True), self._image("B-1002.jpeg", False)]
+        assert self._codes(checker, images) == [("duplicate_patient_id", "")]
+        assert checker.duplicate_ids == ["1003"]
+        assert checker.images_checked == 2
+        assert checker.images_linked == 2
+
+    def test_side_mismatch(self, clinical_df):
+        """has_frank_sign is compared with the annotated ear's column."""
+        checker = ClinicalConsistencyChecker(clinical_df)
+        images = [
+            self._image("A-1001.jpeg", False, "right"),
+            self._image("A2-1001.jpeg", False, "left"),
+            self._image("B-1002.jpeg", True, "left"),
+        ]
+        issues = [i for i in checker.validate(images) if i.code == "fs_mismatch"]
+        assert [i.image_name for i in issues] == ["A-1001.jpeg", "B-1002.jpeg"]
+        assert all(i.level == "error" for i in issues)
+
+    def test_missing_side_value(self, clinical_df):
+        """A missing clinical value for the annotated ear is a warning."""
+        checker = ClinicalConsistencyChecker(clinical_df)
+        issues = checker.validate([self._image("D-1004.jpeg", True, "right")])
+        assert [(i.code, i.level) for i in issues][-1] == ("fs_missing", "warning")
+
+    def test_side_agnostic_rule(self, clinical_df):
+        """Without ear_side, only contradictions with both sides are flagged."""
+        checker = ClinicalConsistencyChecker(clinical_df, use_ear_side=False)
+        images = [
+            self._image("A-1001.jpeg", False),  # one clinical side: not flagged
+            self._image("B-1002.jpeg", True),  # no clinical side: flagged
+            self._image("C-1003.jpeg", False),  # bilateral (first row): flagged
+        ]
+        mismatched = [name for code, name in self._codes(checker, images) if code == "fs_mismatch"]
+        assert mismatched == ["B-1002.jpeg", "C-1003.jpeg"]
+
+    def test_unlinked_images(self, clinical_df):
+        """Unparseable names and unknown patients are reported."""
+        checker = ClinicalConsistencyChecker(clinical_df)
+        images = [self._image("Doğukan Özkan.jpeg", True), self._image("E-9999.jpeg", True)]
+        codes = self._codes(checker, images)[1:]
+        assert codes == [
+            ("patient_id_unparsed", "Doğukan Özkan.jpeg"),
+            ("patient_not_found", "E-9999.jpeg"),
+        ]
+        assert checker.images_linked == 0
+
+    def test_from_chunks(self, clinical_df):
+        """Index built from chunks matches the full-frame index."""
+        chunked = ClinicalConsistencyChecker.from_chunks([clinical_df.iloc[:2], clinical_df.iloc[2:]])
+        whole = ClinicalConsistencyChecker(clinical_df)
+        images = [self._image("A-1001.jpeg", False), self._image("C-1003.jpeg", True)]
+        assert len(chunked) == len(whole) == 4
+        assert self._codes(chunked, images) == self._codes(whole, images)
+
+
+# ============================================================
+# IMAGE INTEGRITY TESTS
+# ============================================================
+
+class TestImageIntegrityChecker:
+    """Tests for header-only image file checks."""
+
+    @pytest.fixture
+    def images_dir(self, tmp_path):
+        from PIL import Image
+
+        Image.new("RGB", (120, 80)).save(tmp_path / "ok.jpg")
+        Image.new("RGB", (100, 100)).save(tmp_path / "wrong_size.jpg")
+        (tmp_path / "corrupt.jpg").write_bytes(b"not an image")
+
+        # Stored 80x120 but EXIF orientation 6 (rotated 90 degrees)
+        rotated = Image.new("RGB", (80, 120))
+        exif = rotated.getexif()
+        exif[0x0112] = 6
+        rotated.save(tmp_path / "rotated.jpg", exif=exif)
+        return tmp_path
+
+    @staticmethod
+    def _images(*names):
+        return [ImageAnnotations(id=i, name=name, width=120, height=80) for i, name in enumerate(names)]
+
+    def test_read_image_header(self, images_dir):
+        """Header record holds size, format and stat fields."""
+        record = read_image_header(images_dir / "ok.jpg")
+        assert (record["width"], record["height"]) == (120, 80)
+        assert record["format"] == "JPEG"
+        assert record["error"] is None
+        assert record["size"] == (images_dir / "ok.jpg").stat().st_size
+        assert read_image_header(images_dir / "nope.jpg")["error"] == "missing"
+
+    @pytest.mark.parametrize("n_jobs", [1, 4])
+    def test_issue_codes(self, images_dir, n_jobs):
+        """Missing, corrupt and mismatched files are flagged in input order."""
+        images = self._images("ok.jpg", "missing.jpg", "corrupt.jpg", "wrong_size.jpg", "rotated.jpg")
+        checker = ImageIntegrityChecker(images_dir, n_jobs=n_jobs)
+        issues = checker.check(images)
+        assert [(i.code, i.image_name) for i in issues] == [
+            ("image_missing", "missing.jpg"),
+            ("image_corrupt", "corrupt.jpg"),
+            ("image_size_mismatch", "wrong_size.jpg"),
+        ]
+        assert all(i.level == "error" for i in issues)
+        assert checker.images_checked == 5
+
+    def test_cache_reuses_unchanged_files(self, images_dir):
+        """Cached headers are reused until mtime or size changes."""
+        from PIL import Image
+
+        images = self._images("ok.jpg", "wrong_size.jpg", "missing.jpg")
+        cache_path = images_dir / "headers.json"
+        cache = ImageHeaderCache(cache_path)
+        ImageIntegrityChecker(images_dir, cache=cache).check(images)
+        cache.save()
+        assert len(cache) == 2
+
+        Image.new("RGB", (120, 80)).save(images_dir / "wrong_size.jpg")
+        os.utime(images_dir / "wrong_size.jpg", ns=(0, 10**9))
+
+        cache = ImageHeaderCache(cache_path)
+        issues = ImageIntegrityChecker(images_dir, cache=cache).check(images)
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert [i.code for i in issues] == ["image_missing"]
+
+
+# ============================================================
+# VALIDATION REPORT TESTS
+# ============================================================
+
+class TestValidationReport:
+    """Tests for columnar issue collection and timings."""
+
+    @staticmethod
+    def _issues():
+        return [
+            ValidationIssue("error", "a", code="fs_mismatch", image_name="a.jpg", image_id=1,
+                            label="fs_right", value=0.0, threshold=1.0),
+            ValidationIssue("warning", "b", code="polyline_too_short", image_name="b.jpg", image_id=2,
+                            label="franks_sign_line", value=1.5, threshold=MIN_POLYLINE_LENGTH_PX),
+            ValidationIssue("error", "c", code="fs_mismatch", image_name="c.jpg", image_id=3),
+        ]
+
+    def test_to_frame(self):
+        """Issues become one typed DataFrame with every field."""
+        report = ValidationReport()
+        assert report.extend(self._issues()) == 3
+        df = report.to_frame()
+        assert list(df.columns) == ["level", "message", "code", "image_name", "image_id",
+                                    "label", "value", "threshold"]
+        assert df["image_id"].tolist() == [1, 2, 3]
+        assert df["value"].isna().tolist() == [False, False, True]
+        assert report.error_count == 2
+
+    def test_summary_counts(self):
+        """Summary aggregates by level and code, most frequent first."""
+        report = ValidationReport()
+        report.extend(self._issues())
+        summary = report.summary()
+        assert summary.to_dict("records") == [
+            {"level": "error", "code": "fs_mismatch", "count": 2},
+            {"level": "warning", "code": "polyline_too_short", "count": 1},
+        ]
+
+    def test_timed_attributes_issues(self):
+        """Timed blocks record elapsed time, items and issue counts per check."""
+        report = ValidationReport()
+        with report.timed("geometry", items=10) as sink:
+            sink.extend(self._issues()[:2])
+        with report.timed("geometry", items=5) as sink:
+            sink.add(self._issues()[2])
+        with report.timed("files"):
+            pass
+        report.set_items("files", 4)
+
+        timings = report.timing_frame().set_index("check")
+        assert timings.loc["geometry", "items"] == 15
+        assert timings.loc["geometry", "issues"] == 3
+        assert timings.loc["files", "items"] == 4
+        assert (timings["seconds"] >= 0).all()
+
+    def test_save_roundtrip(self, tmp_path):
+        """Full detail is written to Parquet."""
+        import pandas as pd
+
+        report = ValidationReport()
+        report.extend(self._issues())
+        path = report.save(tmp_path / "out" / "issues.parquet")
+        loaded = pd.read_parquet(path)
+        assert loaded["code"].astype(str).tolist() == ["fs_mismatch", "polyline_too_short", "fs_mismatch"]
+        assert loaded["threshold"].iloc[1] == MIN_POLYLINE_LENGTH_PX
+
+    def test_empty_report(self):
+        """An empty report still has the expected columns."""
+        report = ValidationReport()
+        assert len(report) == 0
+        assert report.to_frame().empty
+        assert report.summary().empty
+
+
 # ============================================================
 # CONSTANTS TESTS
 # ============================================================